@@ -0,0 +1,51 @@
+"""Сравнение скорости кодеков хранилища на увеличенной копии data/vacancies.json
+
+Запуск: python -m benchmarks.bench_codecs [число копий]
+"""
+
+import json
+import os
+import sys
+import time
+
+from src.json_codec import available_codecs, get_codec
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vacancies.json")
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with open(DATA_PATH, encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    document = {
+        "vacancies": [
+            dict(item, alternate_url=f"{item['alternate_url']}?{i}") for i in range(copies) for item in items
+        ]
+    }
+
+    print(f"Вакансий: {len(document['vacancies'])}")
+    print(f"{'кодек':16s} {'размер, МБ':>10s} {'запись, МБ/с':>13s} {'чтение, МБ/с':>13s} {'в Vacancy, МБ/с':>16s}")
+    for name in available_codecs():
+        codec = get_codec(name)
+        data = codec.dumps(document)
+        megabytes = len(data) / 2**20
+        encode = best_of(lambda: codec.dumps(document))
+        decode = best_of(lambda: codec.loads(data))
+        decode_vacancies = best_of(lambda: codec.decode_vacancies(data))
+        print(
+            f"{name:16s} {megabytes:10.1f} {megabytes / encode:13.1f} "
+            f"{megabytes / decode:13.1f} {megabytes / decode_vacancies:16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
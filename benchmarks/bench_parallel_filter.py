@@ -0,0 +1,42 @@
+"""Замер ускорения ParallelFilter в зависимости от числа процессов
+
+Запуск: python -m benchmarks.bench_parallel_filter [число копий data/vacancies.json]
+"""
+
+import json
+import os
+import sys
+import time
+
+from src.filter import ParallelFilter
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vacancies.json")
+FILTER_WORDS = ["python", "sql", "java", "spring", "docker", "kubernetes", "git", "linux"]
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with open(DATA_PATH, encoding="utf-8") as f:
+        items = json.load(f)["items"] * copies
+
+    print(f"Вакансий: {len(items)}")
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ParallelFilter(FILTER_WORDS, workers=workers, threshold=0) as parallel:
+            # Прогрев по пакету на каждый процесс: пул запускает процессы по мере поступления задач,
+            # а запуск процессов не должен входить в замер
+            parallel.filter(items[: parallel.chunk_size * workers])
+            start = time.perf_counter()
+            matched = parallel.filter(items)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"процессов: {workers:3d}  время: {elapsed:7.3f} с  "
+            f"ускорение: {baseline / elapsed:5.2f}x  найдено: {len(matched)}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Замер памяти на одну вакансию (tracemalloc): объект с __dict__ против __slots__ и общего пула строк
+
+Запуск: python -m benchmarks.bench_vacancy_memory [число вакансий]
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+
+from src.hh_class import Vacancy
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vacancies.json")
+
+
+class DictVacancy:
+    """Вакансия с __dict__, как hh_class.Vacancy до перехода на __slots__"""
+
+    def __init__(self, name, alternate_url, salary_from, salary_to, requirement):
+        self.name = name
+        self.alternate_url = alternate_url
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.requirement = requirement
+
+
+def items_copy(items: list, count: int):
+    """Копии вакансий с новыми строками, как после json.load большого файла"""
+    for i in range(count):
+        item = items[i % len(items)]
+        yield {
+            "name": "".join(item["name"]),
+            "alternate_url": f"{item['alternate_url']}?copy={i}",
+            "salary_from": item["salary_from"],
+            "salary_to": item["salary_to"],
+            "snippet": {"requirement": "".join(item["snippet"]["requirement"] or "")},
+        }
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with open(DATA_PATH, encoding="utf-8") as f:
+        items = json.load(f)["items"]
+
+    def build_dict():
+        return [
+            DictVacancy(
+                item["name"],
+                item["alternate_url"],
+                item["salary_from"],
+                item["salary_to"],
+                item["snippet"]["requirement"],
+            )
+            for item in items_copy(items, count)
+        ]
+
+    def build_slots():
+        return [Vacancy.from_api_item(item) for item in items_copy(items, count)]
+
+    def build_pooled():
+        pool = {}
+        return [Vacancy.from_api_item(item, pool) for item in items_copy(items, count)]
+
+    print(f"Вакансий: {count}")
+    for title, build in (("__dict__", build_dict), ("__slots__", build_slots), ("__slots__ + пул", build_pooled)):
+        print(f"{title:16s} {measure(build) / count:8.1f} байт на вакансию")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_data
+
+# Размеры наборов данных: HH_BENCH_SIZES=10000,100000,1000000
+SIZES = [int(size) for size in os.environ.get("HH_BENCH_SIZES", "10000").split(",")]
+
+_datasets = {}
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"n={size}")
+def dataset(request):
+    """Синтетический набор вакансий; один экземпляр на размер за запуск"""
+    size = request.param
+    if size not in _datasets:
+        _datasets[size] = generate_data(size)
+    return _datasets[size]
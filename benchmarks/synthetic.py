@@ -0,0 +1,65 @@
+"""Детерминированный генератор синтетических вакансий в формате data/vacancies.json
+
+Названия, фрагменты требований (с разметкой <highlighttext>) и пары зарплат берутся из реальных данных,
+поэтому доля нулевых зарплат и длина текстов совпадают с исходной выборкой.
+
+Запуск: python -m benchmarks.synthetic 100000 out.json
+"""
+
+import json
+import os
+import random
+import re
+import sys
+from typing import Iterator
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vacancies.json")
+
+
+def _load_templates() -> tuple:
+    with open(DATA_PATH, encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    names = [item["name"] for item in items]
+    salaries = [(item["salary_from"], item["salary_to"]) for item in items]
+    sentences = []
+    for item in items:
+        requirement = item["snippet"]["requirement"]
+        if requirement:
+            sentences.extend(part.strip() for part in re.split(r"(?<=[.!?])\s+", requirement) if part.strip())
+    none_share = sum(item["snippet"]["requirement"] is None for item in items) / len(items)
+    return names, salaries, sentences, none_share
+
+
+def generate(count: int, seed: int = 42) -> Iterator[dict]:
+    """Отдает count вакансий; одинаковые seed и count дают одинаковый результат"""
+    names, salaries, sentences, none_share = _load_templates()
+    generator = random.Random(seed)
+    for index in range(count):
+        salary_from, salary_to = generator.choice(salaries)
+        if generator.random() < none_share:
+            requirement = None
+        else:
+            requirement = " ".join(generator.choice(sentences) for _ in range(generator.randint(1, 3)))
+        yield {
+            "name": generator.choice(names),
+            "alternate_url": f"https://hh.ru/vacancy/{200000000 + index}",
+            "salary_from": salary_from,
+            "salary_to": salary_to,
+            "snippet": {"requirement": requirement},
+        }
+
+
+def generate_data(count: int, seed: int = 42) -> dict:
+    """Документ {"items": [...]} из count синтетических вакансий"""
+    return {"items": list(generate(count, seed))}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    out = sys.argv[2] if len(sys.argv) > 2 else f"vacancies_{count}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(generate_data(count), f, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
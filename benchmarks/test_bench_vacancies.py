@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.filter import filter_vacancies
+from src.hh_class import Vacancy
+from src.saver_class import JSONSaver
+from src.search import SearchIndex
+
+pytest.importorskip("pytest_benchmark")
+
+SKILLS = ["python", "sql", "java", "spring", "docker", "git", "linux", "kafka"]
+
+
+def test_filter_regex(benchmark, dataset):
+    benchmark(filter_vacancies, dataset, SKILLS)
+
+
+def test_filter_aho_corasick_large_word_list(benchmark, dataset):
+    words = SKILLS + [f"skill{i}" for i in range(200)]
+    benchmark(filter_vacancies, dataset, words, engine="aho_corasick")
+
+
+def test_saver_save_to_file(benchmark, dataset, tmp_path):
+    path = tmp_path / "store.json"
+
+    def setup():
+        if path.exists():
+            path.unlink()
+        return (JSONSaver(dataset, str(path)),), {}
+
+    benchmark.pedantic(lambda saver: saver.save_to_file(), setup=setup, rounds=3)
+
+
+def test_saver_add_vacancy(benchmark, dataset, tmp_path):
+    path = tmp_path / "store.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"vacancies": dataset["items"]}, f, ensure_ascii=False)
+    saver = JSONSaver({"items": []}, str(path))
+    counter = iter(range(10**9))
+
+    def add():
+        saver.add_vacancy(Vacancy("Bench", f"bench-{next(counter)}", 1, 2, "Python").main_data())
+
+    benchmark.pedantic(add, rounds=3)
+
+
+def test_saver_read_file(benchmark, dataset, tmp_path):
+    path = tmp_path / "store.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"vacancies": dataset["items"]}, f, ensure_ascii=False, indent=2)
+    saver = JSONSaver({"items": []}, str(path))
+    result = benchmark(saver.read_file)
+    assert len(result["vacancies"]) == len(dataset["items"])
+
+
+def test_vacancy_construction(benchmark, dataset):
+    items = dataset["items"]
+
+    def build():
+        return [
+            Vacancy(
+                item["name"],
+                item["alternate_url"],
+                item["salary_from"],
+                item["salary_to"],
+                item["snippet"]["requirement"],
+            )
+            for item in items
+        ]
+
+    benchmark(build)
+
+
+def test_vacancy_from_api_item(benchmark, dataset):
+    benchmark(lambda: [Vacancy.from_api_item(item) for item in dataset["items"]])
+
+
+def test_vacancy_sorting(benchmark, dataset):
+    vacancies = [Vacancy.from_api_item(item) for item in dataset["items"]]
+    benchmark(sorted, vacancies, reverse=True)
+
+
+def test_search_top_k(benchmark, dataset):
+    index = SearchIndex.from_vacancies(dataset["items"])
+    index.search(["python", "sql"])
+    benchmark(index.search, ["python", "sql"], 20)
@@ -1,6 +1,8 @@
 from src.external_api import Vacancy as ExternalVacancy
 from src.hh_class import Vacancy as HHVacancy
 from src.filter import filter_vacancies
+from src.metrics import profiling
+from src.metrics import registry as metrics
 from src.saver_class import JSONSaver
 
 
@@ -55,67 +57,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
-Ключевые изменения:
-
-Импорт Vacancy из external_api и hh_class с алиасами для избежания конфликта имен.
-
-Использование filter_vacancies вместо несуществующей filter_word.
-
-Удаление несуществующего импорта HH_API.
-
-Добавление примеров использования всех основных классов и функций.
-
-Эта версия main.py теперь полностью соответствует коду в модулях и может использоваться как точка входа в приложение.
-
-Есть ошибки flake8 (неиспользуемые импорты)
-исправь пожалуйста
-Вот исправленная версия main.py с удалением неиспользуемых импортов и соответствием flake8:
-
-python
-from src.filter import filter_vacancies
-from src.saver_class import JSONSaver
-
-
-def main():
-    # Пример использования классов и функций
-    vacancy_data = {
-        "items": [
-            {
-                "name": "Python Developer",
-                "alternate_url": "https://example.com/python",
-                "salary_from": 100000,
-                "salary_to": 150000,
-                "snippet": {"requirement": "Experience with Python and Django"},
-            },
-            {
-                "name": "Java Developer",
-                "alternate_url": "https://example.com/java",
-                "salary_from": 90000,
-                "salary_to": 120000,
-                "snippet": {"requirement": "Experience with Java and Spring"},
-            },
-        ]
-    }
-
-    # Фильтрация вакансий
-    filtered = filter_vacancies(vacancy_data, ["Python", "Django"])
-    print("Отфильтрованные вакансии:", filtered)
-
-    # Сохранение в JSON
-    saver = JSONSaver(vacancy_data)
-    saver.save_to_file()
-
-    # Добавление отдельной вакансии (пример с использованием данных напрямую)
-    example_vacancy = {
-        "name": "Python Developer",
-        "alternate_url": "https://example.com/python",
-        "salary_from": 100000,
-        "salary_to": 150000,
-        "snippet": {"requirement": "Experience with Python and Django"},
-    }
-    saver.add_vacancy(example_vacancy)
-
-
-if __name__ == "__main__":
-    main()
+    with profiling():
+        main()
+    metrics.dump()
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.hh_class import Vacancy
+from src.http_cache import ResponseCache
+from src.metrics import registry as metrics
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов по алгоритму token bucket
+
+    Общий для всех задач клиента, в том числе из разных циклов событий и потоков: токен резервируется
+    под threading.Lock, а ожидание своей очереди идет уже вне блокировки.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self.__tokens = float(self.capacity)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    async def acquire(self):
+        """Забирает токен; если корзина пуста, ждет, пока до него дойдет очередь"""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+            self.__updated = now
+            # Отрицательный остаток - токены, уже обещанные ожидающим задачам
+            self.__tokens -= 1
+            wait = -self.__tokens / self.rate if self.__tokens < 0 else 0
+        if wait:
+            await asyncio.sleep(wait)
+
+
+def item_to_vacancy(item: dict) -> Vacancy:
+    """Создает Vacancy из элемента ответа API (поддерживает и salary, и salary_from/salary_to)"""
+    return Vacancy.from_api_item(item)
+
+
+class HHApiClient:
+    """Асинхронный клиент API hh.ru с общим пулом соединений, параллельной загрузкой страниц и ограничением частоты"""
+
+    def __init__(
+        self,
+        base_url: str = "https://api.hh.ru/vacancies",
+        concurrency: int = 4,
+        rate: float = 10.0,
+        per_page: int = 100,
+        max_pages: int = 20,
+        timeout: float = 10.0,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.cache = cache
+        # Один лимит на клиент: параллельные поиски делят его, а не получают каждый полную частоту
+        self.__bucket = TokenBucket(rate)
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__session.headers["User-Agent"] = "HH-User-Agent"
+        self.__executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self) -> "HHApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.__executor.shutdown(wait=False)
+        self.__session.close()
+
+    def __request(self, params: dict, headers: Optional[dict] = None) -> requests.Response:
+        return self.__session.get(self.base_url, params=params, headers=headers, timeout=self.timeout)
+
+    def __get(self, params: dict) -> dict:
+        if self.cache is not None:
+            return self.cache.get_or_fetch(self.base_url, params, lambda headers: self.__request(params, headers))
+        response = self.__request(params)
+        response.raise_for_status()
+        metrics.inc("api.bytes_read", len(response.content))
+        return response.json()
+
+    async def fetch_page(self, params: dict, page: int, semaphore: asyncio.Semaphore) -> dict:
+        """Загружает одну страницу результатов поиска"""
+        if self.cache is not None:
+            # Свежий ответ из кэша не расходует лимит запросов
+            cached = self.cache.get_fresh(self.base_url, {**params, "page": page})
+            if cached is not None:
+                return cached
+        async with semaphore:
+            await self.__bucket.acquire()
+            loop = asyncio.get_running_loop()
+            with metrics.timer("api.fetch_page"):
+                page_data = await loop.run_in_executor(self.__executor, self.__get, {**params, "page": page})
+            metrics.inc("api.pages")
+            return page_data
+
+    async def iter_pages(self, search_query: str, **params) -> AsyncIterator[dict]:
+        """Отдает страницы поиска по мере загрузки: первую сразу, остальные параллельно"""
+        params = {"text": search_query, "per_page": self.per_page, **params}
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        first = await self.fetch_page(params, 0, semaphore)
+        yield first
+
+        pages = min(int(first.get("pages") or 1), self.max_pages)
+        tasks = [asyncio.ensure_future(self.fetch_page(params, page, semaphore)) for page in range(1, pages)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_vacancies(self, search_query: str, **params) -> AsyncIterator[Vacancy]:
+        """Отдает объекты Vacancy по мере загрузки страниц"""
+        async for page in self.iter_pages(search_query, **params):
+            for item in page.get("items", []):
+                yield item_to_vacancy(item)
+
+    async def get_vacancies(self, search_query: str, **params) -> dict:
+        """Загружает все страницы и возвращает {"items": [...], "found": N} в формате main_data
+
+        found - число вакансий по запросу по данным API; items может быть короче из-за max_pages
+        и ограничения hh.ru на глубину выдачи.
+        """
+        items = []
+        found = None
+        async for page in self.iter_pages(search_query, **params):
+            if found is None:
+                found = page.get("found")
+            items.extend(item_to_vacancy(item).main_data() for item in page.get("items", []))
+        data = {"items": items}
+        if found is not None:
+            data["found"] = found
+        return data
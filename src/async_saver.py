@@ -0,0 +1,138 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+from src.saver_class import BaseSaver
+
+
+class AsyncBaseSaver(ABC):
+    """Асинхронный интерфейс хранилища вакансий для сервисов на asyncio"""
+
+    @abstractmethod
+    async def save_to_file(self):
+        pass
+
+    @abstractmethod
+    async def read_file(self):
+        pass
+
+    @abstractmethod
+    async def clear_file(self):
+        pass
+
+    @abstractmethod
+    async def add_vacancy(self, vacancy_data):
+        pass
+
+    @abstractmethod
+    async def flush(self):
+        pass
+
+
+class AsyncSaver(AsyncBaseSaver):
+    """Обертка над BaseSaver: дисковые операции в отдельном потоке, add_vacancy копится и пишется пакетами"""
+
+    def __init__(self, saver: BaseSaver, flush_interval: float = 0.05, batch_size: int = 500):
+        self.saver = saver
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        # Один поток сохраняет порядок операций с файлом
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="saver")
+        self.__pending = []
+        self.__flush_task: Optional[asyncio.Task] = None
+        self.__flush_lock = asyncio.Lock()
+        self.__error: Optional[BaseException] = None
+
+    async def __aenter__(self) -> "AsyncSaver":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __run(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, partial(func, *args))
+
+    def __write_batch(self, batch: list):
+        if hasattr(self.saver, "add_vacancies"):
+            self.saver.add_vacancies(batch)
+        else:
+            for vacancy_data in batch:
+                self.saver.add_vacancy(vacancy_data)
+
+    async def __delayed_flush(self):
+        try:
+            await asyncio.sleep(self.flush_interval)
+            self.__flush_task = None
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            # Пакет остался в очереди; ошибка хранится, пока следующий flush() не запишет его
+            self.__error = error
+
+    async def add_vacancy(self, vacancy_data: dict):
+        """Ставит вакансию в очередь записи; запись выполняется пакетом по таймеру или при заполнении пакета"""
+        self.__pending.append(vacancy_data)
+        if len(self.__pending) >= self.batch_size:
+            await self.flush()
+        elif self.__flush_task is None:
+            self.__flush_task = asyncio.create_task(self.__delayed_flush())
+
+    @property
+    def pending(self) -> int:
+        """Число вакансий, еще не записанных на диск"""
+        return len(self.__pending)
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Ошибка фоновой записи, если ее пакет еще не записан"""
+        return self.__error
+
+    async def flush(self):
+        """Записывает все накопленные вакансии одной операцией хранилища
+
+        При ошибке записи пакет возвращается в начало очереди и будет записан следующим flush().
+        """
+        async with self.__flush_lock:
+            batch, self.__pending = self.__pending, []
+            if batch:
+                try:
+                    await self.__run(self.__write_batch, batch)
+                except BaseException:
+                    self.__pending[:0] = batch
+                    raise
+            self.__error = None
+
+    async def save_to_file(self):
+        await self.flush()
+        await self.__run(self.saver.save_to_file)
+
+    async def read_file(self) -> dict:
+        await self.flush()
+        return await self.__run(self.saver.read_file)
+
+    async def clear_file(self):
+        await self.flush()
+        await self.__run(self.saver.clear_file)
+
+    async def count(self) -> int:
+        await self.flush()
+        return await self.__run(self.saver.count)
+
+    async def read_page(self, offset: int = 0, limit: Optional[int] = None, predicate: Optional[Callable] = None):
+        """Страница вакансий (список Vacancy), прочитанная в потоке хранилища"""
+        await self.flush()
+        return await self.__run(lambda: list(self.saver.iter_vacancies(offset, limit, predicate)))
+
+    async def close(self):
+        """Дописывает очередь и останавливает поток хранилища"""
+        if self.__flush_task is not None:
+            self.__flush_task.cancel()
+            self.__flush_task = None
+        try:
+            await self.flush()
+        finally:
+            self.__executor.shutdown(wait=True)
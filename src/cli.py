@@ -0,0 +1,144 @@
+"""Командная строка: hh-course search|filter|save|stats
+
+Модули хранилища, поиска и API импортируются внутри команд, поэтому --help и разбор аргументов
+не загружают requests, sqlite3 и остальные тяжелые зависимости.
+"""
+
+import argparse
+import json
+import sys
+from typing import Iterator, Optional
+
+# Хранилище по умолчанию совпадает с JSONSaver(filename="vacancies"); data/vacancies.json - пример ответа API
+DEFAULT_FILE = "vacancies.json"
+
+
+def _write(record: dict):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _vacancy_record(vacancy) -> dict:
+    return {
+        "name": vacancy.name,
+        "alternate_url": vacancy.alternate_url,
+        "salary_from": vacancy.salary_from,
+        "salary_to": vacancy.salary_to,
+    }
+
+
+def _queries(args) -> Iterator[list]:
+    """Слова запроса из аргументов или, в пакетном режиме, по одному запросу на строку stdin"""
+    if not args.batch:
+        yield args.words
+        return
+    for line in sys.stdin:
+        words = line.split()
+        if words:
+            yield words
+
+
+def _saver(filename: str):
+    from src.saver_class import JSONSaver
+
+    return JSONSaver({"items": []}, filename)
+
+
+def command_search(args):
+    """Ранжированный поиск по сохраненным вакансиям"""
+    from src.search import search_vacancies
+
+    saver = _saver(args.file)
+    for words in _queries(args):
+        results = search_vacancies(saver, words, args.top, args.salary_boost)
+        _write(
+            {
+                "query": " ".join(words),
+                "results": [{**_vacancy_record(vacancy), "score": round(score, 4)} for vacancy, score in results],
+            }
+        )
+
+
+def command_filter(args):
+    """Отбор сохраненных вакансий по ключевым словам в требованиях"""
+    from src.filter import get_matcher
+    from src.hh_class import Vacancy
+
+    vacancies = _saver(args.file).read_file().get("vacancies", [])
+    for words in _queries(args):
+        matched = get_matcher(words, args.engine).match_many(vacancies)
+        _write(
+            {
+                "query": " ".join(words),
+                "count": len(matched),
+                "results": [_vacancy_record(Vacancy.from_api_item(item)) for item in matched[: args.top]],
+            }
+        )
+
+
+def command_save(args):
+    """Загружает вакансии из API hh.ru и добавляет их в хранилище"""
+    import asyncio
+
+    from src.api_client import HHApiClient
+    from src.saver_class import JSONSaver
+
+    async def fetch_all(queries: list) -> list:
+        async with HHApiClient(max_pages=args.pages) as client:
+            return [(query, await client.get_vacancies(query)) for query in queries]
+
+    queries = [" ".join(words) for words in _queries(args)]
+    for query, vacancies_data in asyncio.run(fetch_all(queries)):
+        saver = JSONSaver(vacancies_data, args.file)
+        before = saver.count()
+        saver.save_to_file()
+        _write({"query": query, "fetched": len(vacancies_data["items"]), "saved": saver.count() - before})
+
+
+def command_stats(args):
+    """Сводка по хранилищу: число вакансий, доля без зарплаты, медианы зарплат, ключевые слова и работодатели"""
+    from src.stats import VacancyStats
+
+    stats = VacancyStats.from_saver(_saver(args.file), keywords=args.keywords)
+    _write(stats.summary())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hh-course", description="Поиск и хранение вакансий hh.ru")
+    parser.add_argument("--file", default=DEFAULT_FILE, help="файл хранилища (по умолчанию %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_query_command(name: str, handler, help_text: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("words", nargs="*", help="слова запроса")
+        command.add_argument("--batch", action="store_true", help="читать запросы из stdin, по одному на строку")
+        command.set_defaults(handler=handler)
+        return command
+
+    search = add_query_command("search", command_search, "ранжированный поиск по хранилищу")
+    search.add_argument("--top", type=int, default=20, help="число результатов")
+    search.add_argument("--salary-boost", type=float, default=0.0, help="надбавка к оценке за зарплату")
+
+    filter_command = add_query_command("filter", command_filter, "отбор по ключевым словам в требованиях")
+    filter_command.add_argument("--top", type=int, default=20, help="сколько вакансий вывести")
+    filter_command.add_argument("--engine", default="regex", choices=("regex", "aho_corasick"))
+
+    save = add_query_command("save", command_save, "загрузить вакансии из API hh.ru в хранилище")
+    save.add_argument("--pages", type=int, default=20, help="максимум страниц на запрос")
+
+    stats = commands.add_parser("stats", help="сводка по хранилищу")
+    stats.add_argument("keywords", nargs="*", help="ключевые слова, для которых посчитать число вакансий")
+    stats.set_defaults(handler=command_stats)
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "words", None) == [] and not args.batch:
+        parser.error(f"{args.command}: укажите слова запроса или --batch")
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import hashlib
+import random
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.requirement_index import tokenize
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(vacancy: dict, size: int = 3) -> set:
+    """Словесные шинглы по названию и требованиям вакансии (без разметки hh.ru)"""
+    try:
+        requirement = vacancy["snippet"]["requirement"]
+    except (KeyError, TypeError):
+        requirement = None
+    tokens = tokenize(vacancy.get("name")) + tokenize(requirement)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _integrate(function, low: float, high: float, steps: int = 64) -> float:
+    """Интеграл по формуле средних прямоугольников"""
+    width = (high - low) / steps
+    return sum(function(low + (step + 0.5) * width) for step in range(steps)) * width
+
+
+@lru_cache(maxsize=None)
+def _choose_bands(
+    num_perm: int, threshold: float, false_positive_weight: float = 0.5, false_negative_weight: float = 0.5
+) -> tuple:
+    """Подбирает число полос b и строк r (b * r <= num_perm) с наименьшей взвешенной ошибкой LSH
+
+    Вероятность попасть в кандидаты при сходстве s равна 1 - (1 - s^r)^b. Ложноположительная ошибка -
+    площадь под этой кривой на [0, threshold], ложноотрицательная - площадь над ней на [threshold, 1],
+    как в MinHashLSH из datasketch.
+    """
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _integrate(lambda s: 1 - (1 - s**rows) ** bands, 0.0, threshold)
+            false_negative = _integrate(lambda s: (1 - s**rows) ** bands, threshold, 1.0)
+            error = false_positive * false_positive_weight + false_negative * false_negative_weight
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateDetector:
+    """Поиск почти одинаковых вакансий: подписи MinHash и разбиение на полосы LSH"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("Порог сходства должен быть в диапазоне (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+        generator = random.Random(seed)
+        self.__permutations = [
+            (generator.randrange(1, _PRIME), generator.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        self.__buckets = [{} for _ in range(self.bands)]
+        self.__signatures = {}
+
+    def __len__(self) -> int:
+        return len(self.__signatures)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__signatures
+
+    def signature(self, vacancy: dict) -> Optional[tuple]:
+        """Подпись MinHash вакансии; None, если в ней нет ни одного слова"""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            for shingle in shingles(vacancy, self.shingle_size)
+        ]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in self.__permutations)
+
+    def __band_keys(self, signature: tuple):
+        rows = self.rows
+        return [signature[band * rows : (band + 1) * rows] for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(left: tuple, right: tuple) -> float:
+        """Оценка коэффициента Жаккара по двум подписям"""
+        return sum(a == b for a, b in zip(left, right)) / len(left)
+
+    def __query(self, signature: tuple):
+        seen = set()
+        for bucket, band_key in zip(self.__buckets, self.__band_keys(signature)):
+            for key in bucket.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                if self.similarity(signature, self.__signatures[key]) >= self.threshold:
+                    return key
+        return None
+
+    def __insert(self, key, signature: tuple):
+        self.__signatures[key] = signature
+        for bucket, band_key in zip(self.__buckets, self.__band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+    def query(self, vacancy: dict):
+        """Ключ ранее добавленной почти одинаковой вакансии или None"""
+        signature = self.signature(vacancy)
+        return self.__query(signature) if signature is not None else None
+
+    def find(self, signature: tuple):
+        """Ключ ранее добавленной вакансии с похожей подписью или None"""
+        return self.__query(signature)
+
+    def add(self, key, signature: tuple):
+        """Добавляет готовую подпись под ключом key"""
+        self.__insert(key, signature)
+
+    def staging(self) -> "NearDuplicateDetector":
+        """Пустой детектор с теми же параметрами: подписи копятся в нем, пока вызывающий не выполнит commit()"""
+        return NearDuplicateDetector(self.threshold, self.num_perm, self.shingle_size, self.seed)
+
+    def commit(self, staged: "NearDuplicateDetector"):
+        """Переносит подписи из детектора, полученного через staging()"""
+        for key, signature in staged.__signatures.items():
+            if key not in self.__signatures:
+                self.__insert(key, signature)
+
+    def check_and_add(self, key, vacancy: dict):
+        """Возвращает ключ найденного дубликата, иначе добавляет вакансию под ключом key и возвращает None"""
+        signature = self.signature(vacancy)
+        if signature is None:
+            return None
+        duplicate = self.__query(signature)
+        if duplicate is None:
+            self.__insert(key, signature)
+        return duplicate
+
+    def vacancy_added(self, position: int, vacancy: dict):
+        """Добавляет вакансию, записанную в хранилище (событие BaseSaver)"""
+        if position not in self.__signatures:
+            signature = self.signature(vacancy)
+            if signature is not None:
+                self.__insert(position, signature)
+
+    def store_cleared(self):
+        """Сбрасывает подписи при очистке хранилища (событие BaseSaver)"""
+        self.__buckets = [{} for _ in range(self.bands)]
+        self.__signatures = {}
+
+
+def find_near_duplicates(vacancies: Iterable[dict], threshold: float = 0.8, **options) -> list:
+    """Пары (номер дубликата, номер оригинала) для списка вакансий"""
+    detector = NearDuplicateDetector(threshold, **options)
+    pairs = []
+    for index, vacancy in enumerate(vacancies):
+        original = detector.check_and_add(index, vacancy)
+        if original is not None:
+            pairs.append((index, original))
+    return pairs
+
+
+def drop_near_duplicates(vacancies: Iterable[dict], threshold: float = 0.8, **options):
+    """Этап конвейера: пропускает только первую из почти одинаковых вакансий"""
+    detector = NearDuplicateDetector(threshold, **options)
+    for index, vacancy in enumerate(vacancies):
+        if detector.check_and_add(index, vacancy) is None:
+            yield vacancy
@@ -1,25 +1,336 @@
-from typing import Union
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+import os
 import re
 
+from src.metrics import registry as metrics
 
-def filter_vacancies(vacancies_data: dict, filter_words: list) -> Union[list, dict]:
-    """Фильтрует вакансии по ключевым словам в описании"""
-    filtered_vacancies = []
+try:
+    # Таблица, по которой re.IGNORECASE дополнительно считает равными символы вроде ς/σ, ı/i и ſ/s
+    from re._casefix import _EXTRA_CASES
+except ImportError:
+    _EXTRA_CASES = {}
 
-    if not filter_words:
-        return vacancies_data["items"]
 
-    for vacancy in vacancies_data["items"]:
+class KeywordMatcher:
+    """Скомпилированный поиск целых слов без учета регистра"""
+
+    __slots__ = ("keywords", "texts", "_pattern")
+
+    def __init__(self, keywords: tuple, texts: Optional[tuple] = None):
+        self.keywords = keywords
+        # Шаблон строится из исходного текста слов: регистр сравнивает сам re, как в исходном filter_vacancies
+        self.texts = keywords if texts is None else texts
+        self._pattern = re.compile(r"\b(?:{})\b".format("|".join(map(re.escape, self.texts))), flags=re.IGNORECASE)
+
+    @classmethod
+    def for_words(cls, filter_words: Iterable) -> "KeywordMatcher":
+        """Возвращает закэшированный матчер для набора ключевых слов"""
+        return _cached_matcher(_Keywords(filter_words))
+
+    def match(self, text) -> bool:
+        """Проверяет, встречается ли в тексте хотя бы одно ключевое слово"""
+        if not text:
+            return False
+        return self._pattern.search(text) is not None
+
+    def match_vacancy(self, vacancy) -> bool:
+        """Проверяет требования вакансии"""
         try:
-            requirements = vacancy["snippet"]["requirement"]
-            if not requirements:  # Если requirements None или пустая строка
+            return self.match(vacancy["snippet"]["requirement"])
+        except (KeyError, TypeError):
+            return False
+
+    def match_many(self, items: Iterable) -> list:
+        """Отбирает вакансии, в требованиях которых есть ключевые слова"""
+        search = self._pattern.search
+        matched = []
+        for vacancy in items:
+            try:
+                requirements = vacancy["snippet"]["requirement"]
+                if requirements and search(requirements):
+                    matched.append(vacancy)
+            except (KeyError, TypeError):
                 continue
+        return matched
+
+
+class _FoldTable(dict):
+    """Таблица str.translate: символ -> представитель класса символов, равных для re.IGNORECASE
+
+    re сравнивает символы по простому (односимвольному) нижнему регистру и таблице _EXTRA_CASES, поэтому
+    свертка посимвольная: str.lower для текста не подходит ("İ".lower() - два символа, "Σ" в конце слова
+    становится "ς"). Строки заполняются при первой встрече символа.
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        lowered = char.lower()
+        if len(lowered) != 1:
+            # Полное отображение многосимвольное только у "İ"; простое отображение - "i"
+            lowered = "i" if char == "\u0130" else char
+        equivalents = _EXTRA_CASES.get(ord(lowered))
+        if equivalents:
+            # Представитель класса - нижний регистр заглавной формы (σ для σ/ς), иначе наименьший символ
+            canonical = lowered.upper().lower()
+            if len(canonical) != 1 or (ord(canonical) not in equivalents and canonical != lowered):
+                canonical = min(lowered, *map(chr, equivalents))
+            lowered = canonical
+        self[code] = lowered
+        return lowered
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def _fold(text: str) -> str:
+    """Приводит текст к форме, в которой символы равны тогда же, когда их считает равными re.IGNORECASE
+
+    Длина и позиции символов сохраняются."""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD_TABLE)
+
+
+def normalize_keywords(filter_words: Iterable) -> tuple:
+    """Приводит ключевые слова к ключу кэша: регистр свернут как в re.IGNORECASE, без повторов, отсортированы"""
+    return tuple(sorted({_fold(str(word)) for word in filter_words}))
+
+
+class _Keywords(tuple):
+    """Ключ кэша матчеров: нормализованные слова; исходный текст слов хранится в texts"""
+
+    def __new__(cls, filter_words: Iterable):
+        texts = tuple(dict.fromkeys(map(str, filter_words)))
+        keywords = super().__new__(cls, normalize_keywords(texts))
+        keywords.texts = texts
+        return keywords
+
+
+def _is_word_char(char: str) -> bool:
+    """Аналог \\w из re для строк"""
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasickMatcher:
+    """Автомат Ахо-Корасик для больших списков ключевых слов с той же семантикой, что у KeywordMatcher"""
+
+    __slots__ = ("keywords", "texts", "_goto", "_fail", "_out", "_any_boundary")
+
+    def __init__(self, keywords: tuple, texts: Optional[tuple] = None):
+        self.keywords = keywords
+        self.texts = keywords if texts is None else texts
+        self._goto = [{}]
+        self._out = [[]]
+        # Пустое слово в регулярном выражении совпадает на любой границе слова
+        self._any_boundary = "" in keywords
+
+        for index, keyword in enumerate(keywords):
+            if not keyword:
+                continue
+            state = 0
+            for char in _fold(keyword):
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(index)
+
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    @classmethod
+    def for_words(cls, filter_words: Iterable) -> "AhoCorasickMatcher":
+        """Возвращает закэшированный автомат для набора ключевых слов"""
+        return _cached_aho_corasick(_Keywords(filter_words))
+
+    def _iter_matches(self, text: str):
+        """Перебирает (индекс слова) для вхождений, ограниченных границами слов как в \\b"""
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        folded = _fold(text)
+        length = len(text)
+        state = 0
+        for end, char in enumerate(folded, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                start = end - len(keywords[index])
+                before = start > 0 and _is_word_char(text[start - 1])
+                after = end < length and _is_word_char(text[end])
+                if before != _is_word_char(text[start]) and after != _is_word_char(text[end - 1]):
+                    yield index
+
+    def match(self, text) -> bool:
+        """Проверяет, встречается ли в тексте хотя бы одно ключевое слово"""
+        if not text:
+            return False
+        if self._any_boundary and any(map(_is_word_char, text)):
+            return True
+        return next(self._iter_matches(text), None) is not None
+
+    def count_matches(self, text) -> dict:
+        """Возвращает совпавшие ключевые слова и число их вхождений"""
+        counts = {}
+        if not text:
+            return counts
+        for index in self._iter_matches(text):
+            keyword = self.keywords[index]
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
 
-            # Создаем регулярное выражение для поиска целых слов
-            pattern = r"\b(?:{})\b".format("|".join(map(re.escape, filter_words)))
-            if re.search(pattern, requirements, flags=re.IGNORECASE):
-                filtered_vacancies.append(vacancy)
+    def match_vacancy(self, vacancy) -> bool:
+        """Проверяет требования вакансии"""
+        try:
+            return self.match(vacancy["snippet"]["requirement"])
         except (KeyError, TypeError):
-            continue
+            return False
+
+    def match_many(self, items: Iterable) -> list:
+        """Отбирает вакансии, в требованиях которых есть ключевые слова"""
+        return [vacancy for vacancy in items if self.match_vacancy(vacancy)]
+
+    def rank_many(self, items: Iterable) -> list:
+        """Возвращает пары (вакансия, совпадения), отсортированные по числу вхождений"""
+        ranked = []
+        for vacancy in items:
+            try:
+                counts = self.count_matches(vacancy["snippet"]["requirement"])
+            except (KeyError, TypeError):
+                continue
+            if counts:
+                ranked.append((vacancy, counts))
+        ranked.sort(key=lambda pair: sum(pair[1].values()), reverse=True)
+        return ranked
+
+
+# Ключи кэша равны, если слова совпадают после свертки регистра: такие наборы re находит в одних и тех же текстах
+@lru_cache(maxsize=128)
+def _cached_matcher(keywords: _Keywords) -> KeywordMatcher:
+    return KeywordMatcher(tuple(keywords), keywords.texts)
+
+
+@lru_cache(maxsize=32)
+def _cached_aho_corasick(keywords: _Keywords) -> AhoCorasickMatcher:
+    return AhoCorasickMatcher(tuple(keywords), keywords.texts)
+
+
+MATCH_ENGINES = {"regex": KeywordMatcher, "aho_corasick": AhoCorasickMatcher}
+
+
+def get_matcher(filter_words: Iterable, engine: str = "regex"):
+    """Возвращает закэшированный матчер выбранного движка"""
+    try:
+        matcher_class = MATCH_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Неизвестный движок поиска: {engine}")
+    return matcher_class.for_words(filter_words)
+
+
+# Ниже этого числа вакансий передача данных между процессами дороже самой фильтрации
+PARALLEL_THRESHOLD = 20000
+
+_worker_matcher = None
+
+
+def _init_worker(keywords: tuple, texts: tuple, engine: str):
+    """Компилирует матчер один раз при запуске процесса-обработчика"""
+    global _worker_matcher
+    _worker_matcher = MATCH_ENGINES[engine](keywords, texts)
+
+
+def _match_chunk(chunk: list) -> list:
+    match_vacancy = _worker_matcher.match_vacancy
+    return [index for index, vacancy in enumerate(chunk) if match_vacancy(vacancy)]
+
+
+class ParallelFilter:
+    """Фильтрация больших списков вакансий в пуле процессов с сохранением исходного порядка"""
+
+    def __init__(
+        self,
+        filter_words: Iterable,
+        workers: Optional[int] = None,
+        engine: str = "regex",
+        chunk_size: int = 5000,
+        threshold: int = PARALLEL_THRESHOLD,
+    ):
+        self.matcher = get_matcher(filter_words, engine)
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+        self.__executor = None
+
+    def __enter__(self) -> "ParallelFilter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __get_executor(self):
+        if self.__executor is None:
+            # Пул процессов тянет за собой multiprocessing: импорт только при первой параллельной фильтрации
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.matcher.keywords, self.matcher.texts, self.engine),
+            )
+        return self.__executor
+
+    def filter(self, items: list) -> list:
+        """Отбирает вакансии с ключевыми словами; небольшие списки обрабатываются в текущем процессе"""
+        if self.workers <= 1 or len(items) < self.threshold:
+            return self.matcher.match_many(items)
+
+        chunks = [items[start : start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+        matched = []
+        # Обработчики возвращают только индексы, чтобы не пересылать вакансии обратно
+        for start, indices in zip(
+            range(0, len(items), self.chunk_size), self.__get_executor().map(_match_chunk, chunks)
+        ):
+            matched.extend(items[start + index] for index in indices)
+        return matched
+
+
+def filter_vacancies(
+    vacancies_data: dict, filter_words: list, engine: str = "regex", workers: Optional[int] = None
+) -> Union[list, dict]:
+    """Фильтрует вакансии по ключевым словам в описании"""
+    if not filter_words:
+        return vacancies_data["items"]
+
+    items = vacancies_data["items"]
+    with metrics.timer("filter_vacancies"):
+        if workers and workers > 1 and len(items) >= PARALLEL_THRESHOLD:
+            with ParallelFilter(filter_words, workers=workers, engine=engine) as parallel:
+                result = parallel.filter(items)
+        else:
+            result = get_matcher(filter_words, engine).match_many(items)
+
+    metrics.inc("filter.items_in", len(items))
+    metrics.inc("filter.matches", len(result))
+    return result
+
 
-    return filtered_vacancies
+def rank_vacancies(vacancies_data: dict, filter_words: list) -> list:
+    """Ранжирует вакансии по числу вхождений ключевых слов в описании"""
+    return AhoCorasickMatcher.for_words(filter_words).rank_many(vacancies_data["items"])
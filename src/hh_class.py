@@ -1,34 +1,87 @@
 from functools import total_ordering
+from typing import Optional
+
+
+def validate_salary(salary_value) -> int:
+    """Приводит зарплату к неотрицательному целому; некорректное значение дает 0"""
+    try:
+        salary = int(salary_value)
+        return salary if salary > 0 else 0
+    except (ValueError, TypeError):
+        return 0
 
 
 @total_ordering
 class Vacancy:
     """Класс для представления вакансий"""
 
-    def __init__(self, name: str, alternate_url: str, salary_from: int, salary_to: int, requirement: str):
+    __slots__ = ("name", "alternate_url", "salary_from", "salary_to", "requirement", "employer")
+
+    def __init__(
+        self,
+        name: str,
+        alternate_url: str,
+        salary_from: int,
+        salary_to: int,
+        requirement: str,
+        employer: Optional[str] = None,
+    ):
         self.name = name
         self.alternate_url = alternate_url
         self.salary_from = self._validate_salary(salary_from)
         self.salary_to = self._validate_salary(salary_to)
         self.requirement = requirement
+        self.employer = employer
 
     def _validate_salary(self, salary_value) -> int:
         """Проверяет корректность значения зарплаты"""
-        try:
-            salary = int(salary_value)
-            return salary if salary > 0 else 0
-        except (ValueError, TypeError):
-            return 0
+        return validate_salary(salary_value)
+
+    @classmethod
+    def from_api_item(cls, item: dict, pool: Optional[dict] = None) -> "Vacancy":
+        """Создает вакансию из элемента ответа API или main_data
+
+        Целые неотрицательные зарплаты не проверяются повторно. Если передан pool (общий словарь строк),
+        одинаковые название и требования хранятся в одном экземпляре строки.
+        """
+        salary = item.get("salary") or {}
+        snippet = item.get("snippet") or {}
+        employer = item.get("employer")
+        name = item.get("name")
+        requirement = snippet.get("requirement")
+        employer = employer.get("name") if isinstance(employer, dict) else None
+        if pool is not None:
+            if name is not None:
+                name = pool.setdefault(name, name)
+            if requirement is not None:
+                requirement = pool.setdefault(requirement, requirement)
+            if employer is not None:
+                employer = pool.setdefault(employer, employer)
+
+        vacancy = cls.__new__(cls)
+        vacancy.name = name
+        vacancy.alternate_url = item.get("alternate_url")
+        vacancy.requirement = requirement
+        vacancy.employer = employer
+        for field, raw_field in (("salary_from", "from"), ("salary_to", "to")):
+            value = item[field] if field in item else salary.get(raw_field)
+            if type(value) is not int or value < 0:
+                value = vacancy._validate_salary(value)
+            setattr(vacancy, field, value)
+        return vacancy
 
     def main_data(self) -> dict:
-        """Возвращает основные данные вакансии"""
-        return {
+        """Возвращает основные данные вакансии; работодатель - в формате API, если известен"""
+        data = {
             "name": self.name,
             "alternate_url": self.alternate_url,
             "salary_from": self.salary_from,
             "salary_to": self.salary_to,
             "snippet": {"requirement": self.requirement},
         }
+        if self.employer is not None:
+            data["employer"] = {"name": self.employer}
+        return data
 
     def __str__(self) -> str:
         """Строковое представление вакансии"""
@@ -0,0 +1,157 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from src.metrics import registry as metrics
+
+
+def cache_key(url: str, params: dict) -> str:
+    """Ключ кэша: URL и нормализованные параметры запроса (включая номер страницы)"""
+    normalized = []
+    for key, value in params.items():
+        value = str(value).strip()
+        if key == "text":
+            value = " ".join(value.lower().split())
+        normalized.append((str(key), value))
+    return url + "?" + json.dumps(sorted(normalized), ensure_ascii=False)
+
+
+class ResponseCache:
+    """Дисковый кэш ответов API в SQLite с TTL, вытеснением LRU и условной перепроверкой"""
+
+    def __init__(self, filename: str = "http_cache", ttl: float = 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.__filename = f"{filename}.db" if not filename.endswith(".db") else filename
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.__lock = threading.Lock()
+        # Кэш используется из потоков клиента API
+        self.__connection = sqlite3.connect(self.__filename, check_same_thread=False)
+        with self.__connection:
+            self.__connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+                """
+            )
+
+    def stats(self) -> dict:
+        """Возвращает счетчики попаданий и промахов"""
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        self.__connection.close()
+
+    def clear(self):
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM responses")
+
+    def __lookup(self, key: str) -> Optional[tuple]:
+        with self.__lock:
+            return self.__connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def __touch(self, key: str, refreshed: bool):
+        """Обновляет время доступа и учитывает попадание (или перепроверку, если refreshed)"""
+        now = time.time()
+        with self.__lock, self.__connection:
+            # Счетчики меняются под той же блокировкой: get вызывается из потоков клиента API
+            if refreshed:
+                self.revalidations += 1
+                self.__connection.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+            else:
+                self.hits += 1
+                self.__connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+    def __store(self, key: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        now = time.time()
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now, now, len(body.encode("utf-8"))),
+            )
+            self.__evict()
+
+    def __evict(self):
+        """Удаляет давно не использованные ответы, пока кэш не уложится в max_bytes"""
+        (total,) = self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, size in self.__connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.__connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def get_fresh(self, url: str, params: dict) -> Optional[dict]:
+        """Возвращает ответ из кэша, если он еще не устарел, иначе None"""
+        key = cache_key(url, params)
+        entry = self.__lookup(key)
+        if entry is None or time.time() - entry[3] >= self.ttl:
+            return None
+        metrics.inc("cache.hits")
+        self.__touch(key, refreshed=False)
+        return json.loads(entry[0])
+
+    def get_or_fetch(self, url: str, params: dict, fetch: Callable) -> dict:
+        """Возвращает ответ из кэша или загружает его через fetch(headers) -> requests.Response"""
+        key = cache_key(url, params)
+        entry = self.__lookup(key)
+        headers = {}
+        if entry is not None:
+            body, etag, last_modified, stored_at = entry
+            if time.time() - stored_at < self.ttl:
+                metrics.inc("cache.hits")
+                self.__touch(key, refreshed=False)
+                return json.loads(body)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = fetch(headers)
+        if entry is not None and response.status_code == 304:
+            metrics.inc("cache.revalidations")
+            self.__touch(key, refreshed=True)
+            return json.loads(entry[0])
+
+        with self.__lock:
+            self.misses += 1
+        metrics.inc("cache.misses")
+        response.raise_for_status()
+        data = response.json()
+        self.__store(
+            key,
+            json.dumps(data, ensure_ascii=False),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return data
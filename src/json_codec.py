@@ -0,0 +1,164 @@
+"""Кодеки хранилища JSONSaver
+
+orjson и msgspec импортируются в конструкторах кодеков: команды, которые их не используют, не тратят
+время на загрузку этих пакетов.
+"""
+
+import json
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Optional
+
+from src.hh_class import Vacancy, validate_salary
+
+
+class JSONCodec:
+    """Кодек стандартной библиотеки json; indent=None дает компактную запись"""
+
+    name = "json"
+    decode_errors: tuple = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def __init__(self, indent: Optional[int] = 2):
+        self.indent = indent
+
+    def dumps(self, data: Any) -> bytes:
+        if self.indent is None:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, ensure_ascii=False, indent=self.indent).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def decode_vacancies(self, data: bytes) -> list:
+        """Разбирает хранилище {"vacancies": [...]} сразу в объекты Vacancy"""
+        document = self.loads(data)
+        items = document.get("vacancies", []) if isinstance(document, dict) else []
+        return [Vacancy.from_api_item(item) for item in items if isinstance(item, dict)]
+
+
+class OrjsonCodec(JSONCodec):
+    """Кодек на orjson (поддерживает только отступ 2 или компактную запись)"""
+
+    name = "orjson"
+
+    def __init__(self, indent: Optional[int] = 2):
+        try:
+            import orjson
+        except ImportError:
+            raise ValueError("Кодек orjson недоступен: пакет orjson не установлен")
+        super().__init__(indent)
+        self.decode_errors = (orjson.JSONDecodeError,)
+        self.__option = orjson.OPT_INDENT_2 if indent else 0
+        self.__orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self.__orjson.dumps(data, option=self.__option)
+
+    def loads(self, data: bytes) -> Any:
+        return self.__orjson.loads(data)
+
+
+@lru_cache(maxsize=None)
+def _store_type():
+    """Структуры msgspec для разбора хранилища; строятся при первом создании MsgspecCodec"""
+    import msgspec
+
+    class _Snippet(msgspec.Struct):
+        requirement: Optional[str] = None
+
+    class _Employer(msgspec.Struct):
+        name: Optional[str] = None
+
+    class _Salary(msgspec.Struct):
+        salary_from: Any = msgspec.field(default=None, name="from")
+        salary_to: Any = msgspec.field(default=None, name="to")
+
+    class _VacancyStruct(msgspec.Struct):
+        name: Optional[str] = None
+        alternate_url: Optional[str] = None
+        # UNSET отличает отсутствующее поле от null: как и в Vacancy.from_api_item, тогда берется salary
+        salary_from: Any = msgspec.UNSET
+        salary_to: Any = msgspec.UNSET
+        salary: Optional[_Salary] = None
+        snippet: Optional[_Snippet] = None
+        employer: Optional[_Employer] = None
+
+    class _Store(msgspec.Struct):
+        vacancies: list[_VacancyStruct] = []
+
+    return _Store
+
+
+class MsgspecCodec(JSONCodec):
+    """Кодек на msgspec: хранилище разбирается в типизированные структуры без промежуточных словарей"""
+
+    name = "msgspec"
+
+    def __init__(self, indent: Optional[int] = 2):
+        try:
+            import msgspec
+        except ImportError:
+            raise ValueError("Кодек msgspec недоступен: пакет msgspec не установлен")
+        super().__init__(indent)
+        self.decode_errors = (msgspec.DecodeError, UnicodeDecodeError)
+        self.__msgspec = msgspec
+        self.__encoder = msgspec.json.Encoder()
+        self.__decoder = msgspec.json.Decoder()
+        self.__store_decoder = msgspec.json.Decoder(_store_type())
+
+    def dumps(self, data: Any) -> bytes:
+        encoded = self.__encoder.encode(data)
+        if self.indent:
+            return self.__msgspec.json.format(encoded, indent=self.indent)
+        return encoded
+
+    def loads(self, data: bytes) -> Any:
+        return self.__decoder.decode(data)
+
+    def decode_vacancies(self, data: bytes) -> list:
+        unset = self.__msgspec.UNSET
+        vacancies = []
+        for struct in self.__store_decoder.decode(data).vacancies:
+            vacancy = Vacancy.__new__(Vacancy)
+            vacancy.name = struct.name
+            vacancy.alternate_url = struct.alternate_url
+            vacancy.requirement = struct.snippet.requirement if struct.snippet is not None else None
+            vacancy.employer = struct.employer.name if struct.employer is not None else None
+            for field in ("salary_from", "salary_to"):
+                value = getattr(struct, field)
+                if value is unset:
+                    value = getattr(struct.salary, field) if struct.salary is not None else None
+                setattr(vacancy, field, validate_salary(value))
+            vacancies.append(vacancy)
+        return vacancies
+
+
+CODECS = {
+    "json": lambda: JSONCodec(indent=2),
+    "json-compact": lambda: JSONCodec(indent=None),
+    "orjson": lambda: OrjsonCodec(indent=2),
+    "orjson-compact": lambda: OrjsonCodec(indent=None),
+    "msgspec": lambda: MsgspecCodec(indent=2),
+    "msgspec-compact": lambda: MsgspecCodec(indent=None),
+}
+
+
+def get_codec(codec="json") -> JSONCodec:
+    """Возвращает кодек по имени или сам объект кодека"""
+    if isinstance(codec, JSONCodec):
+        return codec
+    try:
+        factory = CODECS[codec]
+    except KeyError:
+        raise ValueError(f"Неизвестный кодек: {codec}")
+    return factory()
+
+
+def available_codecs() -> list:
+    """Имена кодеков, для которых установлены зависимости"""
+    names = ["json", "json-compact"]
+    if find_spec("orjson") is not None:
+        names += ["orjson", "orjson-compact"]
+    if find_spec("msgspec") is not None:
+        names += ["msgspec", "msgspec-compact"]
+    return names
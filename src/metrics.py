@@ -0,0 +1,179 @@
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# Переменные окружения: HH_METRICS=1 включает счетчики и таймеры,
+# HH_METRICS_FORMAT=json|prometheus и HH_METRICS_OUT=<файл> задают формат и место выгрузки,
+# HH_PROFILE=cprofile|tracemalloc|all включает профилирование, HH_PROFILE_OUT=<файл> - куда писать отчет.
+
+_DISABLED_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+
+
+class MetricsRegistry:
+    """Легковесный реестр счетчиков и таймеров этапов; в выключенном состоянии почти ничего не стоит"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters = {}
+        self.timers = {}
+        # Обновления из нескольких потоков не должны теряться; в выключенном состоянии блокировка не берется
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MetricsRegistry":
+        return cls(enabled=os.environ.get("HH_METRICS", "") not in ("", "0"))
+
+    def reset(self):
+        with self.__lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def inc(self, name: str, value: int = 1):
+        """Увеличивает счетчик"""
+        if self.enabled:
+            with self.__lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        """Добавляет замер длительности этапа"""
+        if not self.enabled:
+            return
+        with self.__lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def timer(self, name: str):
+        """Контекстный менеджер, замеряющий длительность этапа"""
+        if not self.enabled:
+            return _DISABLED_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: str):
+        """Декоратор, замеряющий длительность вызовов функции"""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> dict:
+        with self.__lock:
+            return {
+                "counters": dict(self.counters),
+                "timers": {
+                    name: {"count": count, "total_seconds": total, "max_seconds": maximum}
+                    for name, (count, total, maximum) in self.timers.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Текстовый формат Prometheus: счетчики, сводка по времени этапов и максимум отдельной метрикой gauge"""
+
+        def metric_name(name: str) -> str:
+            return "hh_" + "".join(char if char.isalnum() else "_" for char in name)
+
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {metric_name(name)}_total counter")
+            lines.append(f"{metric_name(name)}_total {value}")
+        for name, stats in sorted(snapshot["timers"].items()):
+            base = metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {base} summary")
+            lines.append(f"{base}_count {stats['count']}")
+            lines.append(f"{base}_sum {stats['total_seconds']:.6f}")
+            lines.append(f"# TYPE {base}_max gauge")
+            lines.append(f"{base}_max {stats['max_seconds']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, fmt: str = None, out: str = None):
+        """Выгружает метрики в файл или stdout (по умолчанию из HH_METRICS_FORMAT и HH_METRICS_OUT)"""
+        if not self.enabled:
+            return
+        fmt = fmt or os.environ.get("HH_METRICS_FORMAT", "json")
+        out = out or os.environ.get("HH_METRICS_OUT")
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json() + "\n"
+        if out:
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
+
+
+registry = MetricsRegistry.from_env()
+
+
+@contextmanager
+def profiling(mode: str = None, out: str = None):
+    """Профилирует блок через cProfile и/или tracemalloc (по умолчанию из HH_PROFILE и HH_PROFILE_OUT)"""
+    mode = mode if mode is not None else os.environ.get("HH_PROFILE", "")
+    out = out or os.environ.get("HH_PROFILE_OUT")
+    if not mode:
+        yield
+        return
+
+    # Профилировщики нужны редко и не должны замедлять запуск
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile() if mode in ("cprofile", "all") else None
+    trace_memory = mode in ("tracemalloc", "all")
+    if trace_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        report = io.StringIO()
+        if profiler is not None:
+            profiler.disable()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(30)
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.write(f"tracemalloc: текущая память {current} байт, пик {peak} байт\n")
+            for stat in snapshot.statistics("lineno")[:20]:
+                report.write(f"{stat}\n")
+        if out:
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(report.getvalue())
+        else:
+            sys.stderr.write(report.getvalue())
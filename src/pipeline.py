@@ -0,0 +1,175 @@
+import codecs
+import heapq
+import json
+from typing import IO, Callable, Iterable, Iterator, Optional, Union
+
+from src.filter import get_matcher
+
+ARRAY_KEYS = ("items", "vacancies")
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    """Буфер поверх файла, который подчитывает данные порциями"""
+
+    def __init__(self, file: IO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def fill(self) -> bool:
+        """Дочитывает следующую порцию, отбрасывая уже разобранную часть буфера"""
+        if self.eof:
+            return False
+        while True:
+            raw = self.file.read(self.chunk_size)
+            # Многобайтовый символ может разорваться между порциями
+            chunk = self.decoder.decode(raw, final=not raw) if isinstance(raw, bytes) else raw
+            if chunk or not raw:
+                break
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> Optional[str]:
+        """Возвращает следующий непробельный символ, не сдвигая позицию"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def decode_value(self):
+        """Разбирает одно JSON-значение, дочитывая файл, пока значение не станет полным"""
+        if self.next_char() is None:
+            raise json.JSONDecodeError("Неожиданный конец файла", self.buffer, self.pos)
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            if end == len(self.buffer) and not self.eof and self.fill():
+                # Число на границе порции могло оборваться, разбираем заново
+                continue
+            self.pos = end
+            return value
+
+    def expect(self, char: str):
+        if self.next_char() != char:
+            raise json.JSONDecodeError(f"Ожидался символ {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+
+def _iter_array(reader: _ChunkReader) -> Iterator:
+    reader.expect("[")
+    if reader.next_char() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode_value()
+        char = reader.next_char()
+        reader.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise json.JSONDecodeError("Ожидалась запятая", reader.buffer, reader.pos - 1)
+
+
+def _iter_document(reader: _ChunkReader) -> Iterator:
+    first = reader.next_char()
+    if first == "[":
+        yield from _iter_array(reader)
+        return
+
+    reader.expect("{")
+    if reader.next_char() == "}":
+        return
+    while True:
+        key = reader.decode_value()
+        reader.expect(":")
+        if key in ARRAY_KEYS and reader.next_char() == "[":
+            yield from _iter_array(reader)
+            return
+        # Прочие ключи верхнего уровня разбираем и отбрасываем
+        reader.decode_value()
+        char = reader.next_char()
+        reader.pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise json.JSONDecodeError("Ожидалась запятая", reader.buffer, reader.pos - 1)
+
+
+def iter_vacancies(source: Union[str, IO], chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Построчно отдает вакансии из массива items/vacancies, не загружая весь файл в память"""
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            yield from _iter_document(_ChunkReader(f, chunk_size))
+    else:
+        yield from _iter_document(_ChunkReader(source, chunk_size))
+
+
+def keyword_filter(vacancies: Iterable[dict], filter_words: list, engine: str = "regex") -> Iterator[dict]:
+    """Пропускает вакансии с ключевыми словами в требованиях"""
+    if not filter_words:
+        yield from vacancies
+        return
+    match_vacancy = get_matcher(filter_words, engine).match_vacancy
+    for vacancy in vacancies:
+        if match_vacancy(vacancy):
+            yield vacancy
+
+
+def salary_range(
+    vacancies: Iterable[dict],
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    field: str = "salary_from",
+) -> Iterator[dict]:
+    """Пропускает вакансии с зарплатой в диапазоне [salary_min, salary_max]"""
+    for vacancy in vacancies:
+        salary = vacancy.get(field) or 0
+        if salary_min is not None and salary < salary_min:
+            continue
+        if salary_max is not None and salary > salary_max:
+            continue
+        yield vacancy
+
+
+def dedup_by_url(vacancies: Iterable[dict]) -> Iterator[dict]:
+    """Пропускает только первую вакансию с каждым alternate_url"""
+    seen = set()
+    for vacancy in vacancies:
+        url = vacancy.get("alternate_url")
+        if url is not None:
+            if url in seen:
+                continue
+            seen.add(url)
+        yield vacancy
+
+
+def top_n(vacancies: Iterable[dict], n: int, field: str = "salary_from") -> list:
+    """Возвращает n вакансий с наибольшей зарплатой, храня в куче не более n элементов"""
+    return heapq.nlargest(n, vacancies, key=lambda vacancy: vacancy.get(field) or 0)
+
+
+def run_pipeline(source: Union[str, IO, Iterable[dict]], *stages: Callable):
+    """Последовательно применяет этапы к потоку вакансий"""
+    if isinstance(source, str) or hasattr(source, "read"):
+        source = iter_vacancies(source)
+    result = source
+    for stage in stages:
+        result = stage(result)
+    return result
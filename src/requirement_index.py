@@ -0,0 +1,243 @@
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterable, Optional, Sequence
+
+from src.filter import KeywordMatcher
+
+_MARKUP = re.compile(r"</?highlighttext>", flags=re.IGNORECASE)
+_TOKEN = re.compile(r"\w+")
+
+_MAGIC = b"RIDX0001"
+_HEADER = struct.Struct("<8sIIQ")
+_TERM = struct.Struct("<HII")
+
+
+def tokenize(text) -> list:
+    """Разбивает текст на слова по тем же правилам, что и \\b в filter_vacancies, без разметки hh.ru"""
+    if not text:
+        return []
+    return _TOKEN.findall(_MARKUP.sub(" ", text).lower())
+
+
+def _intersect(left, right) -> list:
+    """Пересечение отсортированных списков: проход по короткому с бинарным поиском в длинном"""
+    if len(left) > len(right):
+        left, right = right, left
+    result = []
+    position = 0
+    for value in left:
+        position = bisect_left(right, value, position)
+        if position == len(right):
+            break
+        if right[position] == value:
+            result.append(value)
+    return result
+
+
+def _requirement(vacancy: dict):
+    try:
+        return vacancy["snippet"]["requirement"]
+    except (KeyError, TypeError):
+        return None
+
+
+class RequirementIndex:
+    """Инвертированный индекс по snippet.requirement: слово -> отсортированный список номеров вакансий
+
+    Фразы и ключевые слова с символами вне \\w (например, "c++") индекс только сужает до кандидатов,
+    окончательная проверка - KeywordMatcher по тексту требований, как в filter_vacancies. Тексты индекс
+    не хранит: требования кандидатов читаются из источника - хранилища (saver.vacancies_at) или списка
+    вакансий, по которому построен индекс.
+    """
+
+    def __init__(self):
+        self.doc_count = 0
+        self.__postings = {}
+        self.__saver = None
+        self.__vacancies = None
+        self.__mapped = {}
+        self.__mmap = None
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[dict]) -> "RequirementIndex":
+        """Строит индекс по списку вакансий, номер вакансии - ее позиция в списке
+
+        Для поиска фраз индекс ссылается на переданный список (без копирования); по итератору вакансий
+        строится индекс только для поиска отдельных слов.
+        """
+        index = cls()
+        if isinstance(vacancies, Sequence):
+            index.__vacancies = vacancies
+        for position, vacancy in enumerate(vacancies):
+            index.vacancy_added(position, vacancy)
+        return index
+
+    @classmethod
+    def from_saver(cls, saver) -> "RequirementIndex":
+        """Строит индекс по содержимому хранилища и подписывает его на новые вакансии"""
+        index = cls()
+        for position, vacancy in enumerate(saver.read_file().get("vacancies", [])):
+            index.vacancy_added(position, vacancy)
+        index.__saver = saver
+        saver.add_listener(index)
+        return index
+
+    def vacancy_added(self, position: int, vacancy: dict):
+        """Добавляет вакансию в индекс (вызывается хранилищем при вставке)"""
+        self.add(position, _requirement(vacancy))
+
+    def store_cleared(self):
+        """Сбрасывает индекс при очистке хранилища"""
+        self.close()
+        self.doc_count = 0
+        self.__postings = {}
+
+    def add(self, doc_id: int, text):
+        """Добавляет текст документа с номером doc_id"""
+        for term in set(tokenize(text)):
+            postings = self.__postings.get(term)
+            if postings is None:
+                postings = self.__postings[term] = array("I")
+            if not postings or postings[-1] < doc_id:
+                postings.append(doc_id)
+            elif postings[bisect_left(postings, doc_id)] != doc_id:
+                insort(postings, doc_id)
+        self.doc_count = max(self.doc_count, doc_id + 1)
+
+    def postings(self, term: str):
+        """Отсортированный список номеров вакансий, содержащих слово"""
+        term = term.lower()
+        mapped = self.__mapped.get(term)
+        added = self.__postings.get(term)
+        if mapped is None:
+            return added if added is not None else array("I")
+        postings = self.__mmap_postings(*mapped)
+        if added is None:
+            return postings
+        # После загрузки индекса новые номера больше сохраненных
+        merged = array("I")
+        merged.frombytes(postings.cast("B"))
+        merged.extend(added)
+        return merged
+
+    def __mmap_postings(self, start: int, count: int) -> memoryview:
+        return memoryview(self.__mmap)[start : start + count * 4].cast("I")
+
+    def terms(self) -> set:
+        return set(self.__mapped) | set(self.__postings)
+
+    def __keyword_postings(self, keyword: str) -> list:
+        """Номера вакансий для ключевого слова с теми же границами слов, что и в filter_vacancies"""
+        tokens = tokenize(keyword)
+        if tokens == [str(keyword).lower()]:
+            return list(self.postings(tokens[0]))
+
+        # Фраза: пересечение списков ее слов - только кандидаты, порядок и соседство проверяются по тексту
+        if tokens:
+            candidates = list(self.postings(tokens[0]))
+            for token in tokens[1:]:
+                candidates = _intersect(candidates, self.postings(token))
+        else:
+            candidates = range(self.doc_count)
+        matcher = KeywordMatcher.for_words([keyword])
+        texts = self.__candidate_texts(candidates)
+        return [doc_id for doc_id in candidates if matcher.match(texts[doc_id])]
+
+    def __candidate_texts(self, doc_ids) -> dict:
+        """Требования кандидатов, прочитанные из источника вакансий: {номер: текст}"""
+        if self.__saver is not None:
+            texts = {position: vacancy.requirement for position, vacancy in self.__saver.vacancies_at(doc_ids).items()}
+        elif self.__vacancies is not None:
+            vacancies = self.__vacancies
+            texts = {doc_id: _requirement(vacancies[doc_id]) for doc_id in doc_ids if doc_id < len(vacancies)}
+        else:
+            texts = {}
+        if len(texts) < len(doc_ids):
+            raise ValueError(
+                "Для поиска фраз индексу нужны вакансии: RequirementIndex.load(filename, vacancies) или from_saver"
+            )
+        return texts
+
+    def query_any(self, keywords: Iterable[str]) -> list:
+        """Номера вакансий, содержащих хотя бы одно из ключевых слов"""
+        result = set()
+        for keyword in keywords:
+            result.update(self.__keyword_postings(keyword))
+        return sorted(result)
+
+    def query_all(self, keywords: Iterable[str]) -> list:
+        """Номера вакансий, содержащих все ключевые слова"""
+        lists = sorted((self.__keyword_postings(keyword) for keyword in keywords), key=len)
+        if not lists:
+            return []
+        result = lists[0]
+        for postings in lists[1:]:
+            if not result:
+                break
+            result = _intersect(result, postings)
+        return list(result)
+
+    def save(self, filename: str):
+        """Сохраняет индекс в двоичный файл: заголовок, словарь слов и блок списков"""
+        terms = sorted(self.terms())
+        postings = [self.postings(term) for term in terms]
+        encoded = [term.encode("utf-8") for term in terms]
+        dictionary_size = sum(_TERM.size + len(term) for term in encoded)
+        postings_offset = _HEADER.size + dictionary_size
+
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.doc_count, len(terms), postings_offset))
+            start = postings_offset
+            for term, term_postings in zip(encoded, postings):
+                f.write(_TERM.pack(len(term), start, len(term_postings)))
+                f.write(term)
+                start += len(term_postings) * 4
+            for term_postings in postings:
+                f.write(array("I", term_postings).tobytes())
+        os.replace(tmp_filename, filename)
+
+    @classmethod
+    def load(cls, filename: str, vacancies: Optional[Iterable[dict]] = None) -> "RequirementIndex":
+        """Открывает сохраненный индекс через mmap; списки читаются из файла без копирования
+
+        vacancies (те же, по которым строился индекс: список или хранилище) нужны только для поиска фраз.
+        """
+        index = cls()
+        if hasattr(vacancies, "vacancies_at"):
+            index.__saver = vacancies
+        elif vacancies is not None:
+            index.__vacancies = vacancies if isinstance(vacancies, Sequence) else list(vacancies)
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return index
+            index.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index.doc_count, term_count, _ = _HEADER.unpack_from(index.__mmap, 0)
+        if magic != _MAGIC:
+            index.close()
+            raise ValueError(f"Файл {filename} не является индексом требований")
+        position = _HEADER.size
+        for _ in range(term_count):
+            length, start, count = _TERM.unpack_from(index.__mmap, position)
+            position += _TERM.size
+            term = index.__mmap[position : position + length].decode("utf-8")
+            position += length
+            index.__mapped[term] = (start, count)
+        return index
+
+    def close(self):
+        """Освобождает отображение файла, сохраняя добавленные после загрузки данные в памяти"""
+        if self.__mmap is None:
+            return
+        for term, mapped in self.__mapped.items():
+            postings = array("I")
+            postings.frombytes(self.__mmap_postings(*mapped).cast("B"))
+            added = self.__postings.get(term)
+            self.__postings[term] = postings + added if added is not None else postings
+        self.__mapped = {}
+        self.__mmap.close()
+        self.__mmap = None
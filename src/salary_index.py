@@ -0,0 +1,70 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional
+
+SALARY_FIELDS = ("salary_from", "salary_to")
+
+
+class _SortedColumn:
+    """Отсортированный по зарплате массив с параллельным списком вакансий"""
+
+    __slots__ = ("keys", "items")
+
+    def __init__(self, field: str, vacancies: list):
+        ordered = sorted(vacancies, key=lambda vacancy: getattr(vacancy, field))
+        self.keys = array("q", (getattr(vacancy, field) for vacancy in ordered))
+        self.items = ordered
+
+    def insert(self, salary: int, vacancy):
+        # bisect_right сохраняет порядок добавления среди равных зарплат
+        position = bisect_right(self.keys, salary)
+        self.keys.insert(position, salary)
+        self.items.insert(position, vacancy)
+
+    def between(self, low: int, high: int) -> list:
+        return self.items[bisect_left(self.keys, low) : bisect_right(self.keys, high)]
+
+
+class SalaryIndex:
+    """Индекс вакансий по salary_from и salary_to: диапазоны, топ-N и вакансии без зарплаты за O(log n + k)"""
+
+    def __init__(self, vacancies: Iterable = ()):
+        vacancies = list(vacancies)
+        self.__columns = {field: _SortedColumn(field, vacancies) for field in SALARY_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.__columns["salary_from"].items)
+
+    def __column(self, field: str) -> _SortedColumn:
+        try:
+            return self.__columns[field]
+        except KeyError:
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+
+    def add(self, vacancy):
+        """Добавляет вакансию (объект с salary_from и salary_to) в оба порядка"""
+        for field, column in self.__columns.items():
+            column.insert(getattr(vacancy, field), vacancy)
+
+    def add_many(self, vacancies: Iterable):
+        """Добавляет пакет вакансий"""
+        for vacancy in vacancies:
+            self.add(vacancy)
+
+    def between(self, salary_min: Optional[int] = None, salary_max: Optional[int] = None, field: str = "salary_from"):
+        """Вакансии с зарплатой в диапазоне [salary_min, salary_max] по возрастанию зарплаты"""
+        column = self.__column(field)
+        low = salary_min if salary_min is not None else 0
+        high = salary_max if salary_max is not None else column.keys[-1] if column.keys else 0
+        return column.between(low, high)
+
+    def top_n(self, n: int, field: str = "salary_from") -> list:
+        """n вакансий с наибольшей зарплатой по убыванию"""
+        items = self.__column(field).items
+        if n <= 0:
+            return []
+        return items[max(len(items) - n, 0) :][::-1]
+
+    def unspecified(self, field: str = "salary_from") -> list:
+        """Вакансии, в которых зарплата не указана (0)"""
+        return self.__column(field).between(0, 0)
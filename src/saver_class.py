@@ -1,7 +1,30 @@
+import hashlib
 import json
 import os
+import re
+import stat
+import struct
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from array import array
+from contextlib import contextmanager
+from functools import wraps
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from src.filter import filter_vacancies
+from src.hh_class import Vacancy, validate_salary
+from src.json_codec import get_codec
+from src.metrics import registry as metrics
+from src.pipeline import iter_vacancies
 
 
 class BaseSaver(ABC):
@@ -21,51 +44,1139 @@ class BaseSaver(ABC):
     def add_vacancy(self, vacancy_data):
         pass
 
+    def add_listener(self, listener):
+        """Подписывает объект на события хранилища: vacancy_added(position, vacancy) и store_cleared()"""
+        if not hasattr(self, "_listeners"):
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Отписывает объект от событий хранилища"""
+        listeners = getattr(self, "_listeners", [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def _notify_added(self, position: int, vacancy: dict):
+        for listener in getattr(self, "_listeners", ()):
+            listener.vacancy_added(position, vacancy)
+
+    def _notify_cleared(self):
+        for listener in getattr(self, "_listeners", ()):
+            listener.store_cleared()
+
+    def count(self) -> int:
+        """Число сохраненных вакансий"""
+        return len(self.read_file().get("vacancies", []))
+
+    def iter_vacancies(
+        self, offset: int = 0, limit: Optional[int] = None, predicate: Optional[Callable] = None
+    ) -> Iterator[Vacancy]:
+        """Страница вакансий: пропускает offset записей, отдает не больше limit объектов Vacancy
+
+        predicate получает словарь вакансии; offset и limit считаются по записям, прошедшим predicate.
+        """
+        vacancies = self.read_file().get("vacancies", [])
+        if predicate is not None:
+            vacancies = filter(predicate, vacancies)
+        stop = None if limit is None else offset + limit
+        for vacancy in islice(vacancies, offset, stop):
+            yield Vacancy.from_api_item(vacancy)
+
+    def vacancies_at(self, positions: Iterable[int]) -> dict:
+        """Вакансии с указанными номерами за один проход по хранилищу: {номер: Vacancy}"""
+        wanted = set(positions)
+        if not wanted:
+            return {}
+        return {
+            position: vacancy
+            for position, vacancy in enumerate(self.iter_vacancies(0, max(wanted) + 1))
+            if position in wanted
+        }
+
+    def revision(self):
+        """Отметка состояния хранилища: меняется при любой записи, в том числе из другого процесса
+
+        None - хранилище не создано или изменения не отслеживаются.
+        """
+        return None
+
 
 class JSONSaver(BaseSaver):
-    def __init__(self, vacancies_data: dict, filename: str = "vacancies"):
+    def __init__(self, vacancies_data: dict, filename: str = "vacancies", codec="json", near_duplicates=None):
         self.vacancies_data = vacancies_data
         self.__filename = f"{filename}.json" if not filename.endswith(".json") else filename
-        self.__ensure_directory_exists()
+        self.codec = get_codec(codec)
+        # NearDuplicateDetector: save_to_file пропускает почти одинаковые вакансии с другими URL
+        self.near_duplicates = near_duplicates
+        if near_duplicates is not None:
+            self.add_listener(near_duplicates)
 
-    def __ensure_directory_exists(self):
-        """Создает директорию, если она не существует"""
-        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+    def __lock(self):
+        """Блокировка файла; директория создается при первой записи, а не в конструкторе"""
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return file_lock(self.__filename)
 
     def read_file(self) -> dict:
         try:
-            with open(self.__filename, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(self.__filename, "rb") as f:
+                raw = f.read()
+            metrics.inc("saver.bytes_read", len(raw))
+            return self.codec.loads(raw)
+        except FileNotFoundError:
+            return {"vacancies": []}
+        except self.codec.decode_errors:
             return {"vacancies": []}
 
-    def save_to_file(self):
+    def read_vacancies(self) -> list:
+        """Читает хранилище сразу в объекты Vacancy"""
+        try:
+            with open(self.__filename, "rb") as f:
+                return self.codec.decode_vacancies(f.read())
+        except FileNotFoundError:
+            return []
+        except self.codec.decode_errors:
+            return []
+
+    def iter_file(self):
+        """Потоково отдает сохраненные вакансии, не загружая файл целиком"""
+        try:
+            yield from iter_vacancies(self.__filename)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+    def __encode(self, data: dict) -> tuple:
+        """Кодирует хранилище по одной вакансии, запоминая байтовые границы каждой записи"""
+        vacancies = data.get("vacancies")
+        if list(data) != ["vacancies"] or not isinstance(vacancies, list):
+            return self.codec.dumps(data), None
+
+        if self.codec.indent:
+            head, separator, tail = b'{\n  "vacancies": [\n', b",\n", b"\n  ]\n}"
+            if not vacancies:
+                return b'{\n  "vacancies": []\n}', array("Q")
+        else:
+            head, separator, tail = b'{"vacancies":[', b",", b"]}"
+
+        parts = [head]
+        offsets = array("Q")
+        position = len(head)
+        for index, vacancy in enumerate(vacancies):
+            encoded = self.codec.dumps(vacancy)
+            if self.codec.indent:
+                encoded = b"    " + encoded.replace(b"\n", b"\n    ")
+            if index:
+                parts.append(separator)
+                position += len(separator)
+            parts.append(encoded)
+            offsets.append(position)
+            position += len(encoded)
+            offsets.append(position)
+        parts.append(tail)
+        return b"".join(parts), offsets
+
+    def __write(self, data: dict):
+        """Атомарно записывает данные: временный файл, fsync и os.replace"""
+        directory = os.path.dirname(os.path.abspath(self.__filename))
+        content, offsets = self.__encode(data)
+        fd, tmp_filename = tempfile.mkstemp(prefix=".vacancies-", suffix=".tmp", dir=directory)
+        try:
+            # mkstemp создает файл с правами 0600; сохраняем права хранилища для других пользователей и групп
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, _file_mode(self.__filename))
+            with os.fdopen(fd, "wb") as f:
+                metrics.inc("saver.bytes_written", f.write(content))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, self.__filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+        _fsync_directory(directory)
+        self.__write_offsets(offsets)
+
+    def __write_offsets(self, offsets: Optional[array]):
+        """Сохраняет индекс смещений записей рядом с файлом; без смещений удаляет устаревший индекс"""
+        index_filename = f"{self.__filename}.idx"
+        if offsets is None:
+            if os.path.exists(index_filename):
+                os.remove(index_filename)
+            return
+        file_stat = os.stat(self.__filename)
+        tmp_filename = f"{index_filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            f.write(_OFFSETS_HEADER.pack(_OFFSETS_MAGIC, file_stat.st_size, file_stat.st_mtime_ns, len(offsets) // 2))
+            f.write(offsets.tobytes())
+        os.replace(tmp_filename, index_filename)
+
+    def __read_offsets(self, store, offset: int = 0, limit: Optional[int] = 0) -> Optional[tuple]:
+        """Число записей и смещения записей [offset, offset + limit) из индекса, если он соответствует store
+
+        store - открытый файл хранилища: проверка по os.fstat относится к тому же файлу, из которого потом
+        читаются записи, даже если его параллельно заменили через os.replace. Читается только нужная часть индекса.
+        """
+        try:
+            with open(f"{self.__filename}.idx", "rb") as f:
+                header = f.read(_OFFSETS_HEADER.size)
+                if len(header) != _OFFSETS_HEADER.size:
+                    return None
+                magic, size, mtime_ns, count = _OFFSETS_HEADER.unpack(header)
+                file_stat = os.fstat(store.fileno())
+                if magic != _OFFSETS_MAGIC or size != file_stat.st_size or mtime_ns != file_stat.st_mtime_ns:
+                    return None
+                stop = count if limit is None else min(count, offset + limit)
+                offsets = array("Q")
+                if offset < stop:
+                    f.seek(_OFFSETS_HEADER.size + offset * 2 * offsets.itemsize)
+                    offsets.frombytes(f.read((stop - offset) * 2 * offsets.itemsize))
+                    if len(offsets) != (stop - offset) * 2:
+                        return None
+        except (FileNotFoundError, ValueError):
+            return None
+        return count, offsets
+
+    def count(self) -> int:
+        """Число сохраненных вакансий; при актуальном индексе смещений берется из его заголовка"""
+        try:
+            with open(self.__filename, "rb") as store:
+                indexed = self.__read_offsets(store)
+        except FileNotFoundError:
+            return 0
+        if indexed is not None:
+            return indexed[0]
+        return sum(1 for _ in self.iter_file())
+
+    def iter_vacancies(
+        self, offset: int = 0, limit: Optional[int] = None, predicate: Optional[Callable] = None
+    ) -> Iterator[Vacancy]:
+        """Страница вакансий: без predicate читает только нужные записи и нужную часть индекса смещений"""
+        page = None
+        if predicate is None:
+            try:
+                with open(self.__filename, "rb") as store:
+                    indexed = self.__read_offsets(store, offset, limit)
+                    if indexed is not None:
+                        offsets = indexed[1]
+                        if not offsets:
+                            return
+                        start_byte = offsets[0]
+                        store.seek(start_byte)
+                        page = store.read(offsets[-1] - start_byte)
+            except FileNotFoundError:
+                return
+
+        if page is None:
+            # Индекс устарел (файл изменен не через JSONSaver) или нужен predicate: потоковый проход
+            vacancies = self.iter_file()
+            if predicate is not None:
+                vacancies = filter(predicate, vacancies)
+            stop = None if limit is None else offset + limit
+            for vacancy in islice(vacancies, offset, stop):
+                yield Vacancy.from_api_item(vacancy)
+            return
+
+        metrics.inc("saver.bytes_read", len(page))
+        for index in range(0, len(offsets), 2):
+            begin = offsets[index] - start_byte
+            end = offsets[index + 1] - start_byte
+            yield Vacancy.from_api_item(self.codec.loads(page[begin:end]))
+
+    def vacancies_at(self, positions: Iterable[int]) -> dict:
+        """Вакансии с указанными номерами: по индексу смещений читаются только их записи"""
+        wanted = sorted(set(positions))
+        if not wanted:
+            return {}
+        found = {}
+        try:
+            with open(self.__filename, "rb") as store:
+                for position in wanted:
+                    indexed = self.__read_offsets(store, position, 1)
+                    if indexed is None:
+                        break
+                    offsets = indexed[1]
+                    if not offsets:
+                        return found
+                    store.seek(offsets[0])
+                    raw = store.read(offsets[1] - offsets[0])
+                    metrics.inc("saver.bytes_read", len(raw))
+                    found[position] = Vacancy.from_api_item(self.codec.loads(raw))
+                else:
+                    return found
+        except FileNotFoundError:
+            return {}
+        # Индекс устарел (файл изменен не через JSONSaver): один потоковый проход
+        return super().vacancies_at(wanted)
+
+    def revision(self):
+        try:
+            file_stat = os.stat(self.__filename)
+        except FileNotFoundError:
+            return None
+        return file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns
+
+    def __read_for_update(self) -> dict:
         data = self.read_file()
         if not isinstance(data, dict):
             data = {"vacancies": []}
+        data.setdefault("vacancies", [])
+        return data
+
+    @metrics.timed("saver.save_to_file")
+    def save_to_file(self):
+        with self.__lock():
+            data = self.__read_for_update()
+
+            # Добавляем новые вакансии
+            urls = {v.get("alternate_url") for v in data["vacancies"]}
+            position = len(data["vacancies"])
+            detector = self.near_duplicates
+            if detector is not None and not len(detector):
+                for stored_position, stored in enumerate(data["vacancies"]):
+                    detector.vacancy_added(stored_position, stored)
 
-        # Добавляем новые вакансии
-        new_vacancies = []
-        for vacancy in self.vacancies_data.get("items", []):
-            if not any(v.get("alternate_url") == vacancy.get("alternate_url") for v in data.get("vacancies", [])):
+            items = self.vacancies_data.get("items", [])
+            new_vacancies = []
+            near_duplicates = 0
+            # Подписи новых вакансий попадают в детектор только после успешной записи файла
+            staged = detector.staging() if detector is not None else None
+            for vacancy in items:
+                if vacancy.get("alternate_url") in urls:
+                    continue
+                if detector is not None:
+                    signature = detector.signature(vacancy)
+                    if signature is not None:
+                        if detector.find(signature) is not None or staged.find(signature) is not None:
+                            near_duplicates += 1
+                            continue
+                        staged.add(position + len(new_vacancies), signature)
+                urls.add(vacancy.get("alternate_url"))
                 new_vacancies.append(vacancy)
 
-        data["vacancies"].extend(new_vacancies)
+            metrics.inc("saver.items_in", len(items))
+            metrics.inc("saver.items_out", len(new_vacancies))
+            metrics.inc("saver.dedup_hits", len(items) - len(new_vacancies) - near_duplicates)
+            metrics.inc("saver.near_duplicate_hits", near_duplicates)
+
+            data["vacancies"].extend(new_vacancies)
+            self.__write(data)
+            if detector is not None:
+                detector.commit(staged)
 
-        with open(self.__filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        for offset, vacancy in enumerate(new_vacancies):
+            self._notify_added(position + offset, vacancy)
 
     def clear_file(self):
-        with open(self.__filename, "w", encoding="utf-8") as f:
-            json.dump({"vacancies": []}, f)
+        with self.__lock():
+            self.__write({"vacancies": []})
+        self._notify_cleared()
 
     def add_vacancy(self, vacancy_data: dict):
         if not isinstance(vacancy_data, dict):
             print("Можно добавлять только main_data из класса Vacancy")
             return
 
-        data = self.read_file()
-        if not any(v == vacancy_data for v in data.get("vacancies", [])):
-            data["vacancies"].append(vacancy_data)
-            with open(self.__filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        self.add_vacancies([vacancy_data])
+
+    @metrics.timed("saver.add_vacancies")
+    def add_vacancies(self, vacancies):
+        """Добавляет несколько вакансий за одну блокировку и одну запись файла"""
+        with self.__lock():
+            data = self.__read_for_update()
+            seen = {_canonical(v) for v in data["vacancies"]}
+            position = len(data["vacancies"])
+            for vacancy_data in vacancies:
+                if not isinstance(vacancy_data, dict):
+                    print("Можно добавлять только main_data из класса Vacancy")
+                    continue
+                key = _canonical(vacancy_data)
+                if key not in seen:
+                    seen.add(key)
+                    data["vacancies"].append(vacancy_data)
+            added = data["vacancies"][position:]
+            if added:
+                self.__write(data)
+
+        for offset, vacancy in enumerate(added):
+            self._notify_added(position + offset, vacancy)
+
+
+# Первая строка снимка JSON Lines и журнала после сжатия: номер сжатия, к которому относятся записи
+_COMPACTION_KEY = "__compaction__"
+
+_OFFSETS_MAGIC = b"JSIDX001"
+_OFFSETS_HEADER = struct.Struct("<8sQQQ")
+
+
+def _canonical(vacancy: dict) -> str:
+    """Ключ для сравнения вакансий на полное равенство"""
+    return json.dumps(vacancy, ensure_ascii=False, sort_keys=True)
+
+
+def _file_mode(filename: str) -> int:
+    """Права существующего файла или, для нового файла, права по умолчанию с учетом umask"""
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+def _umask() -> int:
+    return _UMASK
+
+
+def _read_umask() -> int:
+    """umask процесса: из /proc/self/status, где он есть, иначе через os.umask один раз при импорте модуля
+
+    os.umask меняет umask всего процесса, поэтому во время работы (когда файлы создают потоки AsyncSaver,
+    HHApiClient и ResponseCache) он не вызывается.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _fsync_directory(directory: str):
+    """Сбрасывает на диск запись каталога после os.replace (где это поддерживается)"""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(filename: str):
+    """Рекомендательная блокировка файла через соседний .lock, общая для процессов"""
+    with open(f"{filename}.lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JSONLinesSaver(BaseSaver):
+    """Хранилище вакансий в формате JSON Lines: журнал дозаписи и периодический снимок
+
+    Снимок начинается со строки {"__compaction__": N} - номера сжатия. Журнал, начатый после сжатия N,
+    открывается такой же строкой. Журнал с меньшим номером (или без него при N > 0) уже перенесен в снимок:
+    compact() прервался до очистки журнала, и при открытии хранилища журнал очищается.
+    """
+
+    def __init__(self, vacancies_data: dict, filename: str = "vacancies", compact_every: int = 10000):
+        self.vacancies_data = vacancies_data
+        base = filename[: -len(".jsonl")] if filename.endswith(".jsonl") else filename
+        self.__log_filename = f"{base}.jsonl"
+        self.__snapshot_filename = f"{base}.snapshot.jsonl"
+        self.compact_every = compact_every
+        self.__ensure_directory_exists()
+        self.__urls: set = set()
+        self.__count = 0
+        self.__log_size = 0
+        self.__broken_tail = False
+        self.__generation = 0
+        self.__log_empty = True
+        self.__load_index()
+
+    def __ensure_directory_exists(self):
+        """Создает директорию, если она не существует"""
+        directory = os.path.dirname(self.__log_filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def __iter_lines(filename: str):
+        """Построчно читает записи JSON Lines, пропуская поврежденные строки"""
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописанная строка после аварийного завершения
+                        continue
+                    if isinstance(record, dict) and _COMPACTION_KEY in record:
+                        continue
+                    yield record
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def __read_generation(filename: str) -> int:
+        """Номер сжатия из первой строки файла; 0, если строки с номером нет"""
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                record = json.loads(f.readline())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        if isinstance(record, dict) and isinstance(record.get(_COMPACTION_KEY), int):
+            return record[_COMPACTION_KEY]
+        return 0
+
+    def __log_is_stale(self) -> bool:
+        """Журнал уже перенесен в снимок, но не очищен из-за сбоя в compact()"""
+        return self.__read_generation(self.__log_filename) < self.__read_generation(self.__snapshot_filename)
+
+    def __iter_records(self):
+        """Записи снимка и журнала без повторов по alternate_url
+
+        Журнал, уже перенесенный в снимок, пропускается по номеру сжатия. Для хранилищ без номеров повторы
+        после прерванного compact() пропускаются по alternate_url.
+        """
+        urls = set()
+        filenames = [self.__snapshot_filename]
+        if not self.__log_is_stale():
+            filenames.append(self.__log_filename)
+        for filename in filenames:
+            for vacancy in self.__iter_lines(filename):
+                url = vacancy.get("alternate_url")
+                if url is not None:
+                    if url in urls:
+                        continue
+                    urls.add(url)
+                yield filename, vacancy
+
+    def __load_index(self):
+        """Восстанавливает индекс alternate_url из снимка и журнала; завершает прерванное сжатие"""
+        self.__generation = self.__read_generation(self.__snapshot_filename)
+        if self.__log_is_stale():
+            self.__truncate_log()
+
+        for filename, vacancy in self.__iter_records():
+            self.__index(vacancy)
+            if filename == self.__log_filename:
+                self.__log_size += 1
+
+        # Журнал мог оборваться посреди строки, новую запись начинаем с новой строки
+        try:
+            with open(self.__log_filename, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    self.__log_empty = False
+                    f.seek(-1, os.SEEK_END)
+                    self.__broken_tail = f.read(1) != b"\n"
+        except FileNotFoundError:
+            pass
+
+    def __truncate_log(self):
+        with open(self.__log_filename, "w", encoding="utf-8") as log:
+            log.flush()
+            os.fsync(log.fileno())
+        self.__log_size = 0
+        self.__broken_tail = False
+        self.__log_empty = True
+
+    def __index(self, vacancy: dict):
+        self.__count += 1
+        url = vacancy.get("alternate_url")
+        if url is not None:
+            self.__urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.__urls
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def count(self) -> int:
+        """Число записей, включая записи без alternate_url; берется из индекса, построенного при открытии"""
+        return self.__count
+
+    def __append(self, vacancies: list):
+        """Дописывает новые вакансии в журнал, пропуская дубликаты по alternate_url"""
+        lines = []
+        added = []
+        for vacancy in vacancies:
+            url = vacancy.get("alternate_url")
+            if url is not None:
+                if url in self.__urls:
+                    continue
+                self.__urls.add(url)
+            lines.append(json.dumps(vacancy, ensure_ascii=False))
+            added.append(vacancy)
+
+        if not lines:
+            return
+
+        if self.__log_empty and self.__generation:
+            # Журнал после сжатия N начинается с номера N, иначе после сбоя его нельзя отличить от перенесенного
+            lines.insert(0, json.dumps({_COMPACTION_KEY: self.__generation}))
+        with open(self.__log_filename, "a", encoding="utf-8") as f:
+            if self.__broken_tail:
+                f.write("\n")
+                self.__broken_tail = False
+            f.write("\n".join(lines) + "\n")
+        self.__log_size += len(added)
+        self.__log_empty = False
+
+        for vacancy in added:
+            self._notify_added(self.__count, vacancy)
+            self.__count += 1
+
+        if self.compact_every and self.__log_size >= self.compact_every:
+            self.compact()
+
+    def read_file(self) -> dict:
+        return {"vacancies": [vacancy for _, vacancy in self.__iter_records()]}
+
+    def iter_vacancies(
+        self, offset: int = 0, limit: Optional[int] = None, predicate: Optional[Callable] = None
+    ) -> Iterator[Vacancy]:
+        """Страница вакансий: записи снимка и журнала читаются потоково до конца страницы"""
+        vacancies = (vacancy for _, vacancy in self.__iter_records())
+        if predicate is not None:
+            vacancies = filter(predicate, vacancies)
+        stop = None if limit is None else offset + limit
+        for vacancy in islice(vacancies, offset, stop):
+            yield Vacancy.from_api_item(vacancy)
+
+    def vacancies_at(self, positions: Iterable[int]) -> dict:
+        """Вакансии с указанными номерами: записи читаются потоково до наибольшего номера"""
+        wanted = set(positions)
+        if not wanted:
+            return {}
+        last = max(wanted)
+        found = {}
+        for position, (_, vacancy) in enumerate(self.__iter_records()):
+            if position in wanted:
+                found[position] = Vacancy.from_api_item(vacancy)
+            if position >= last:
+                break
+        return found
+
+    def revision(self):
+        signature = []
+        for filename in (self.__snapshot_filename, self.__log_filename):
+            try:
+                file_stat = os.stat(filename)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns))
+        return tuple(signature)
+
+    def save_to_file(self):
+        self.__append(self.vacancies_data.get("items", []))
+
+    def clear_file(self):
+        for filename in (self.__snapshot_filename, self.__log_filename):
+            with open(filename, "w", encoding="utf-8"):
+                pass
+        self.__urls.clear()
+        self.__count = 0
+        self.__log_size = 0
+        self.__broken_tail = False
+        self.__generation = 0
+        self.__log_empty = True
+        self._notify_cleared()
+
+    def add_vacancy(self, vacancy_data: dict):
+        if not isinstance(vacancy_data, dict):
+            print("Можно добавлять только main_data из класса Vacancy")
+            return
+
+        self.__append([vacancy_data])
+
+    def add_vacancies(self, vacancies):
+        """Добавляет несколько вакансий одной записью в журнал"""
+        valid = []
+        for vacancy_data in vacancies:
+            if not isinstance(vacancy_data, dict):
+                print("Можно добавлять только main_data из класса Vacancy")
+                continue
+            valid.append(vacancy_data)
+        self.__append(valid)
+
+    def compact(self):
+        """Переносит журнал в снимок и очищает журнал"""
+        generation = self.__generation + 1
+        tmp_filename = f"{self.__snapshot_filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as out:
+            out.write(json.dumps({_COMPACTION_KEY: generation}) + "\n")
+            for _, vacancy in self.__iter_records():
+                out.write(json.dumps(vacancy, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_filename, self.__snapshot_filename)
+        _fsync_directory(os.path.dirname(os.path.abspath(self.__snapshot_filename)))
+        self.__generation = generation
+        # Сбой до очистки журнала безопасен: номер журнала меньше номера снимка, и журнал не читается
+        self.__truncate_log()
+
+
+def _synchronized(method):
+    """Выполняет метод SQLiteSaver под блокировкой соединения"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class SQLiteSaver(BaseSaver):
+    """Хранилище вакансий в SQLite с индексами по зарплате и полнотекстовым поиском по требованиям
+
+    Соединение можно использовать из любого потока (например, из потока AsyncSaver): обращения к нему
+    выполняются под общей блокировкой, поэтому транзакции разных потоков не перемешиваются.
+    """
+
+    def __init__(self, vacancies_data: dict, filename: str = "vacancies"):
+        self.vacancies_data = vacancies_data
+        self.__filename = f"{filename}.db" if not filename.endswith(".db") else filename
+        self.__ensure_directory_exists()
+        self._lock = threading.RLock()
+        # sqlite3 нужен только этому хранилищу; импорт здесь не замедляет команды на JSONSaver
+        import sqlite3
+
+        self.__connection = sqlite3.connect(self.__filename, check_same_thread=False)
+        self.__create_schema()
+
+    def __ensure_directory_exists(self):
+        """Создает директорию, если она не существует"""
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __create_schema(self):
+        legacy = not self.__connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_members'"
+        ).fetchone()
+        with self.__connection:
+            self.__connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS vacancies (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    alternate_url TEXT,
+                    salary_from INTEGER NOT NULL DEFAULT 0,
+                    salary_to INTEGER NOT NULL DEFAULT 0,
+                    requirement TEXT,
+                    data TEXT NOT NULL,
+                    fingerprint TEXT
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS vacancies_url ON vacancies (alternate_url);
+                CREATE INDEX IF NOT EXISTS vacancies_salary_from ON vacancies (salary_from);
+                CREATE INDEX IF NOT EXISTS vacancies_salary_to ON vacancies (salary_to);
+                CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5 (
+                    requirement, content='vacancies', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+                    INSERT INTO vacancies_fts (rowid, requirement) VALUES (new.id, new.requirement);
+                END;
+                CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+                    INSERT INTO vacancies_fts (vacancies_fts, rowid, requirement)
+                    VALUES ('delete', old.id, old.requirement);
+                END;
+                CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE OF requirement ON vacancies BEGIN
+                    INSERT INTO vacancies_fts (vacancies_fts, rowid, requirement)
+                    VALUES ('delete', old.id, old.requirement);
+                    INSERT INTO vacancies_fts (rowid, requirement) VALUES (new.id, new.requirement);
+                END;
+                CREATE TABLE IF NOT EXISTS tombstones (
+                    alternate_url TEXT PRIMARY KEY,
+                    deleted_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sync_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS sync_members (
+                    sync_key TEXT NOT NULL,
+                    alternate_url TEXT NOT NULL,
+                    PRIMARY KEY (sync_key, alternate_url)
+                );
+                """
+            )
+            if legacy:
+                # Вакансии из хранилища прежнего формата относятся к синхронизации без ключа
+                self.__connection.execute(
+                    "INSERT OR IGNORE INTO sync_members (sync_key, alternate_url) "
+                    "SELECT '', alternate_url FROM vacancies WHERE alternate_url IS NOT NULL"
+                )
+
+    def __row(self, vacancy: dict) -> tuple:
+        snippet = vacancy.get("snippet") or {}
+        employer = vacancy.get("employer")
+        fields = (
+            vacancy.get("name"),
+            vacancy.get("alternate_url"),
+            validate_salary(vacancy.get("salary_from")),
+            validate_salary(vacancy.get("salary_to")),
+            snippet.get("requirement") if isinstance(snippet, dict) else None,
+        )
+        employer = employer.get("name") if isinstance(employer, dict) else None
+        return fields + (json.dumps(vacancy, ensure_ascii=False), vacancy_fingerprint(fields + (employer,)))
+
+    def __insert(self, vacancies):
+        """Вставляет вакансии одной транзакцией, пропуская дубликаты по alternate_url"""
+        position = self.count()
+        (last_id,) = self.__connection.execute("SELECT COALESCE(MAX(id), 0) FROM vacancies").fetchone()
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO vacancies "
+                "(name, alternate_url, salary_from, salary_to, requirement, data, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.__row(vacancy) for vacancy in vacancies if isinstance(vacancy, dict)),
+            )
+            # Добавленные напрямую вакансии относятся к синхронизации без ключа
+            self.__connection.execute(
+                "INSERT OR IGNORE INTO sync_members (sync_key, alternate_url) "
+                "SELECT '', alternate_url FROM vacancies WHERE id > ? AND alternate_url IS NOT NULL",
+                (last_id,),
+            )
+        self.__notify_appended(position)
+
+    def __notify_appended(self, position: int):
+        """Сообщает подписчикам о вакансиях, добавленных в конец (номер - порядок по id, как в read_file)"""
+        if not getattr(self, "_listeners", None):
+            return
+        added = self.__fetch("SELECT data FROM vacancies ORDER BY id LIMIT -1 OFFSET ?", (position,))
+        for offset, vacancy in enumerate(added):
+            self._notify_added(position + offset, vacancy)
+
+    def __notify_reloaded(self):
+        """Обновления и удаления меняют номера вакансий: подписчики перестраиваются по всему хранилищу"""
+        if not getattr(self, "_listeners", None):
+            return
+        self._notify_cleared()
+        self.__notify_appended(0)
+
+    def __fetch(self, query: str, params: tuple = ()) -> list:
+        return [json.loads(data) for (data,) in self.__connection.execute(query, params)]
+
+    @_synchronized
+    def read_file(self) -> dict:
+        return {"vacancies": self.__fetch("SELECT data FROM vacancies ORDER BY id")}
+
+    @_synchronized
+    def save_to_file(self):
+        self.__insert(self.vacancies_data.get("items", []))
+
+    @_synchronized
+    def clear_file(self):
+        with self.__connection:
+            self.__connection.execute("DELETE FROM vacancies")
+            self.__connection.execute("DELETE FROM tombstones")
+            self.__connection.execute("DELETE FROM sync_meta")
+            self.__connection.execute("DELETE FROM sync_members")
+        self._notify_cleared()
+
+    @_synchronized
+    def add_vacancy(self, vacancy_data: dict):
+        if not isinstance(vacancy_data, dict):
+            print("Можно добавлять только main_data из класса Vacancy")
+            return
+
+        self.__insert([vacancy_data])
+
+    @_synchronized
+    def add_vacancies(self, vacancies):
+        """Добавляет несколько вакансий одной транзакцией"""
+        valid = []
+        for vacancy_data in vacancies:
+            if not isinstance(vacancy_data, dict):
+                print("Можно добавлять только main_data из класса Vacancy")
+                continue
+            valid.append(vacancy_data)
+        self.__insert(valid)
+
+    @_synchronized
+    def close(self):
+        self.__connection.close()
+
+    @_synchronized
+    def count(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    def iter_vacancies(
+        self, offset: int = 0, limit: Optional[int] = None, predicate: Optional[Callable] = None
+    ) -> Iterator[Vacancy]:
+        if predicate is not None:
+            yield from super().iter_vacancies(offset, limit, predicate)
+            return
+        with self._lock:
+            cursor = self.__connection.execute(
+                "SELECT data FROM vacancies ORDER BY id LIMIT ? OFFSET ?", (-1 if limit is None else limit, offset)
+            )
+        while True:
+            # Блокировка берется на каждую порцию, а не на все время обхода генератора
+            with self._lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield Vacancy.from_api_item(json.loads(data))
+
+    @_synchronized
+    def vacancies_at(self, positions: Iterable[int]) -> dict:
+        """Вакансии с указанными номерами (порядок по id, как в read_file) одним запросом"""
+        wanted = sorted(set(positions))
+        if not wanted:
+            return {}
+        placeholders = ", ".join("?" * len(wanted))
+        rows = self.__connection.execute(
+            "SELECT numbered.position, vacancies.data FROM "
+            "(SELECT ROW_NUMBER() OVER (ORDER BY id) - 1 AS position, id FROM vacancies) AS numbered "
+            f"JOIN vacancies ON vacancies.id = numbered.id WHERE numbered.position IN ({placeholders})",
+            wanted,
+        )
+        return {position: Vacancy.from_api_item(json.loads(data)) for position, data in rows}
+
+    @_synchronized
+    def revision(self):
+        """Номер изменения базы: растет при записи через другие соединения; свои записи приходят событиями"""
+        return self.__connection.execute("PRAGMA data_version").fetchone()[0]
+
+    @_synchronized
+    def filter_vacancies(self, filter_words: list) -> list:
+        """Фильтрует вакансии по ключевым словам в требованиях с помощью индекса FTS5"""
+        if not filter_words:
+            return self.read_file()["vacancies"]
+
+        phrases = []
+        for word in filter_words:
+            tokens = re.findall(r"\w+", str(word))
+            if not tokens:
+                # Слово без буквенно-цифровых символов не выразить запросом FTS, проверяем все записи
+                phrases = []
+                break
+            phrases.append('"{}"'.format(" ".join(tokens)))
+
+        if phrases:
+            candidates = self.__fetch(
+                "SELECT v.data FROM vacancies_fts JOIN vacancies AS v ON v.id = vacancies_fts.rowid "
+                "WHERE vacancies_fts MATCH ? ORDER BY v.id",
+                (" OR ".join(phrases),),
+            )
+        else:
+            candidates = self.read_file()["vacancies"]
+
+        # Индекс дает надмножество, окончательная проверка совпадает с filter_vacancies
+        return filter_vacancies({"items": candidates}, filter_words)
+
+    @_synchronized
+    def top_by_salary(self, top_n: int, field: str = "salary_from") -> list:
+        """Возвращает top_n вакансий с наибольшей зарплатой по индексу"""
+        if field not in ("salary_from", "salary_to"):
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        return self.__fetch(f"SELECT data FROM vacancies ORDER BY {field} DESC, id LIMIT ?", (top_n,))
+
+    @_synchronized
+    def salary_between(self, salary_min: int, salary_max: int, field: str = "salary_from") -> list:
+        """Возвращает вакансии с зарплатой в диапазоне [salary_min, salary_max]"""
+        if field not in ("salary_from", "salary_to"):
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        return self.__fetch(
+            f"SELECT data FROM vacancies WHERE {field} BETWEEN ? AND ? ORDER BY {field}, id", (salary_min, salary_max)
+        )
+
+    @_synchronized
+    def high_water_mark(self, sync_key: Optional[str] = None):
+        """Отметка последней синхронизации по ключу sync_key (см. sync_key()); None - синхронизация без ключа"""
+        row = self.__connection.execute("SELECT value FROM sync_meta WHERE key = ?", (_mark_key(sync_key),)).fetchone()
+        return row[0] if row else None
+
+    @_synchronized
+    def tombstoned_urls(self) -> list:
+        """Возвращает alternate_url вакансий, удаленных при синхронизации"""
+        return [url for (url,) in self.__connection.execute("SELECT alternate_url FROM tombstones ORDER BY rowid")]
+
+    async def sync_from_api(self, client, search_query: str, tombstone: bool = False, **params) -> dict:
+        """Загружает вакансии через HHApiClient и синхронизирует их с хранилищем
+
+        Отметка и удаление отсутствующих вакансий относятся только к этому запросу (sync_key()), поэтому
+        разные поисковые запросы могут синхронизироваться в одно хранилище. Без tombstone загружается только
+        дельта: date_from берется из отметки прошлой синхронизации того же запроса. С tombstone загружается
+        полный список; если API вернул меньше вакансий, чем нашел (max_pages, предел глубины выдачи hh.ru),
+        удаление отсутствующих отклоняется.
+        """
+        if tombstone and "date_from" in params:
+            raise ValueError("tombstone=True требует полного списка вакансий, date_from недопустим")
+        key = sync_key(search_query, params)
+        high_water_mark = self.high_water_mark(key)
+        if not tombstone and high_water_mark is not None:
+            params.setdefault("date_from", high_water_mark)
+        # Отметка - время начала загрузки: вакансии, опубликованные во время загрузки, попадут в следующую дельту
+        started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        vacancies_data = await client.get_vacancies(search_query, **params)
+        items = vacancies_data.get("items", [])
+        found = vacancies_data.get("found")
+        if tombstone and (found is None or len(items) < found):
+            raise ValueError(
+                f"Загружено {len(items)} вакансий из {found}: по неполному списку нельзя удалять отсутствующие, "
+                "сузьте запрос"
+            )
+        return self.sync(items, tombstone=tombstone, high_water_mark=started, sync_key=key)
+
+    @_synchronized
+    def sync(
+        self,
+        vacancies,
+        tombstone: bool = False,
+        batch_size: int = 500,
+        high_water_mark: Optional[str] = None,
+        sync_key: Optional[str] = None,
+    ) -> dict:
+        """Добавляет новые и обновляет измененные вакансии, сравнивая отпечатки содержимого
+
+        Вакансии запоминаются как найденные синхронизацией sync_key. При tombstone=True вакансии этого ключа,
+        которых нет в переданном потоке, исключаются из него; вакансия, которую больше не находит ни один
+        ключ, удаляется и попадает в tombstones. Поэтому поток должен быть полным списком, а не дельтой
+        (см. sync_from_api). Отметка синхронизации ключа - переданная high_water_mark (sync_from_api передает
+        время начала загрузки), иначе наибольшая published_at, иначе время запуска.
+        """
+        report = {"inserted": 0, "updated": 0, "unchanged": 0, "tombstoned": 0}
+        position = self.count()
+        started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        member_key = "" if sync_key is None else sync_key
+        max_published = None
+        connection = self.__connection
+
+        with connection:
+            if tombstone:
+                connection.execute("CREATE TEMP TABLE IF NOT EXISTS sync_seen (alternate_url TEXT PRIMARY KEY)")
+                connection.execute("DELETE FROM sync_seen")
+
+            batch = {}
+            for vacancy in vacancies:
+                if hasattr(vacancy, "main_data"):
+                    vacancy = vacancy.main_data()
+                if not isinstance(vacancy, dict) or vacancy.get("alternate_url") is None:
+                    continue
+                published = vacancy.get("published_at")
+                if published and (max_published is None or published > max_published):
+                    max_published = published
+                row = self.__row(vacancy)
+                batch[row[1]] = row
+                if len(batch) >= batch_size:
+                    self.__sync_batch(batch, member_key, tombstone, report)
+                    batch = {}
+            if batch:
+                self.__sync_batch(batch, member_key, tombstone, report)
+
+            if tombstone:
+                connection.execute("CREATE TEMP TABLE IF NOT EXISTS sync_gone (alternate_url TEXT PRIMARY KEY)")
+                connection.execute("DELETE FROM sync_gone")
+                connection.execute(
+                    "INSERT INTO sync_gone (alternate_url) SELECT alternate_url FROM sync_members "
+                    "WHERE sync_key = ? AND alternate_url NOT IN (SELECT alternate_url FROM sync_seen)",
+                    (member_key,),
+                )
+                connection.execute(
+                    "DELETE FROM sync_members "
+                    "WHERE sync_key = ? AND alternate_url IN (SELECT alternate_url FROM sync_gone)",
+                    (member_key,),
+                )
+                # Удаляются только вакансии, которые больше не находит ни одна синхронизация
+                orphaned = (
+                    "alternate_url IN (SELECT alternate_url FROM sync_gone) "
+                    "AND alternate_url NOT IN (SELECT alternate_url FROM sync_members)"
+                )
+                report["tombstoned"] = connection.execute(
+                    "INSERT OR REPLACE INTO tombstones (alternate_url, deleted_at) "
+                    f"SELECT alternate_url, ? FROM vacancies WHERE {orphaned}",
+                    (time.time(),),
+                ).rowcount
+                connection.execute(f"DELETE FROM vacancies WHERE {orphaned}")
+
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)",
+                (_mark_key(sync_key), high_water_mark or max_published or started),
+            )
+
+        if report["updated"] or report["tombstoned"]:
+            self.__notify_reloaded()
+        elif report["inserted"]:
+            self.__notify_appended(position)
+        return report
+
+    def __sync_batch(self, batch: dict, member_key: str, tombstone: bool, report: dict):
+        connection = self.__connection
+        urls = list(batch)
+        placeholders = ", ".join("?" * len(urls))
+        existing = dict(
+            connection.execute(
+                f"SELECT alternate_url, fingerprint FROM vacancies WHERE alternate_url IN ({placeholders})", urls
+            )
+        )
+
+        new_rows = [row for url, row in batch.items() if url not in existing]
+        changed_rows = [
+            (row[0], row[2], row[3], row[4], row[5], row[6], url)
+            for url, row in batch.items()
+            if url in existing and existing[url] != row[6]
+        ]
+
+        connection.executemany(
+            "INSERT INTO vacancies (name, alternate_url, salary_from, salary_to, requirement, data, fingerprint) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            new_rows,
+        )
+        connection.executemany(
+            "UPDATE vacancies SET name = ?, salary_from = ?, salary_to = ?, requirement = ?, data = ?, "
+            "fingerprint = ? WHERE alternate_url = ?",
+            changed_rows,
+        )
+        if new_rows:
+            connection.execute(f"DELETE FROM tombstones WHERE alternate_url IN ({placeholders})", urls)
+        connection.executemany(
+            "INSERT OR IGNORE INTO sync_members (sync_key, alternate_url) VALUES (?, ?)",
+            ((member_key, url) for url in urls),
+        )
+        if tombstone:
+            connection.executemany(
+                "INSERT OR IGNORE INTO sync_seen (alternate_url) VALUES (?)", ((url,) for url in urls)
+            )
+
+        report["inserted"] += len(new_rows)
+        report["updated"] += len(changed_rows)
+        report["unchanged"] += len(batch) - len(new_rows) - len(changed_rows)
+
+
+_SYNC_PAGING_PARAMS = ("date_from", "page", "per_page")
+
+
+def sync_key(search_query: str, params: Optional[dict] = None) -> str:
+    """Ключ синхронизации: нормализованный поисковый запрос и параметры, влияющие на состав выдачи"""
+    normalized = {"text": " ".join(str(search_query).lower().split())}
+    for key, value in (params or {}).items():
+        if key not in _SYNC_PAGING_PARAMS:
+            normalized[str(key)] = str(value).strip()
+    return json.dumps(sorted(normalized.items()), ensure_ascii=False)
+
+
+def _mark_key(sync_key: Optional[str]) -> str:
+    # Отметка синхронизации без ключа хранится под прежним именем
+    return "high_water_mark" if sync_key is None else f"high_water_mark:{sync_key}"
+
+
+def vacancy_fingerprint(fields: tuple) -> str:
+    """Отпечаток содержимого вакансии: название, ссылка, зарплаты, требования и работодатель"""
+    return hashlib.sha1(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
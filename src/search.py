@@ -0,0 +1,276 @@
+import heapq
+import math
+import weakref
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from src.requirement_index import tokenize
+
+# Поля вакансии и их веса в общей частоте слова (BM25F)
+FIELDS = ("name", "requirement")
+FIELD_WEIGHTS = {"name": 2.0, "requirement": 1.0}
+
+
+def _field_text(vacancy: dict, field: str):
+    if field == "name":
+        return vacancy.get("name")
+    try:
+        return vacancy["snippet"]["requirement"]
+    except (KeyError, TypeError):
+        return None
+
+
+def _salary(vacancy: dict) -> int:
+    """Максимальная указанная зарплата вакансии (main_data или элемент ответа API), 0 если не указана"""
+    salary = vacancy.get("salary") or {}
+    best = 0
+    for field, raw_field in (("salary_from", "from"), ("salary_to", "to")):
+        value = vacancy[field] if field in vacancy else salary.get(raw_field)
+        if type(value) is int and value > best:
+            best = value
+    return best
+
+
+class _Postings:
+    """Номера вакансий со словом и частоты слова в каждом поле"""
+
+    __slots__ = ("docs", "name_tf", "requirement_tf")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.name_tf = array("H")
+        self.requirement_tf = array("H")
+
+    def add(self, doc_id: int, name_tf: int, requirement_tf: int):
+        if not self.docs or self.docs[-1] < doc_id:
+            position = len(self.docs)
+        else:
+            position = bisect_left(self.docs, doc_id)
+            if position < len(self.docs) and self.docs[position] == doc_id:
+                return
+        self.docs.insert(position, doc_id)
+        self.name_tf.insert(position, min(name_tf, 0xFFFF))
+        self.requirement_tf.insert(position, min(requirement_tf, 0xFFFF))
+
+
+class SearchIndex:
+    """Ранжированный поиск по name и snippet.requirement: BM25F-вес слов, топ-K через кучу
+
+    Вклад слова в оценку каждой вакансии (idf и нормализация по длине полей) считается один раз
+    и кэшируется до следующего изменения хранилища.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_count = 0
+        self.version = 0
+        self.__postings = {}
+        self.__lengths = {field: array("I") for field in FIELDS}
+        self.__totals = dict.fromkeys(FIELDS, 0)
+        self.__salaries = array("q")
+        self.__max_salary = 0
+        self.__impacts = {}
+        self.__impacts_version = 0
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[dict], **options) -> "SearchIndex":
+        """Строит индекс по списку вакансий, номер вакансии - ее позиция в списке"""
+        index = cls(**options)
+        for position, vacancy in enumerate(vacancies):
+            index.vacancy_added(position, vacancy)
+        return index
+
+    @classmethod
+    def from_saver(cls, saver, **options) -> "SearchIndex":
+        """Строит индекс по содержимому хранилища и подписывает его на новые вакансии"""
+        index = cls.from_vacancies(saver.read_file().get("vacancies", []), **options)
+        saver.add_listener(index)
+        return index
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def vacancy_added(self, position: int, vacancy: dict):
+        """Добавляет вакансию в индекс (вызывается хранилищем при вставке)"""
+        self.add(position, vacancy)
+
+    def store_cleared(self):
+        """Сбрасывает индекс при очистке хранилища"""
+        self.__init__(self.k1, self.b)
+
+    def add(self, doc_id: int, vacancy: dict):
+        """Добавляет вакансию с номером doc_id"""
+        counts = {}
+        for field_number, field in enumerate(FIELDS):
+            tokens = tokenize(_field_text(vacancy, field))
+            lengths = self.__lengths[field]
+            if len(lengths) <= doc_id:
+                lengths.extend([0] * (doc_id + 1 - len(lengths)))
+            self.__totals[field] += len(tokens) - lengths[doc_id]
+            lengths[doc_id] = len(tokens)
+            for term in tokens:
+                term_counts = counts.setdefault(term, [0, 0])
+                term_counts[field_number] += 1
+        for term, (name_tf, requirement_tf) in counts.items():
+            postings = self.__postings.get(term)
+            if postings is None:
+                postings = self.__postings[term] = _Postings()
+            postings.add(doc_id, name_tf, requirement_tf)
+
+        if len(self.__salaries) <= doc_id:
+            self.__salaries.extend([0] * (doc_id + 1 - len(self.__salaries)))
+        salary = self.__salaries[doc_id] = _salary(vacancy)
+        self.__max_salary = max(self.__max_salary, salary)
+        self.doc_count = max(self.doc_count, doc_id + 1)
+        self.version += 1
+
+    def __term_impacts(self, term: str) -> Optional[tuple]:
+        """Номера вакансий со словом и вклад слова в их оценку по текущей статистике индекса"""
+        if self.__impacts_version != self.version:
+            self.__impacts = {}
+            self.__impacts_version = self.version
+        cached = self.__impacts.get(term)
+        if cached is not None:
+            return cached
+        postings = self.__postings.get(term)
+        if postings is None:
+            return None
+
+        count = self.doc_count
+        frequency = len(postings.docs)
+        idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+        k1, b = self.k1, self.b
+        name_lengths = self.__lengths["name"]
+        requirement_lengths = self.__lengths["requirement"]
+        name_average = self.__totals["name"] / count or 1.0
+        requirement_average = self.__totals["requirement"] / count or 1.0
+        name_weight = FIELD_WEIGHTS["name"]
+        requirement_weight = FIELD_WEIGHTS["requirement"]
+
+        impacts = array("d")
+        for doc_id, name_tf, requirement_tf in zip(postings.docs, postings.name_tf, postings.requirement_tf):
+            tf = 0.0
+            if name_tf:
+                tf += name_weight * name_tf / (1 - b + b * name_lengths[doc_id] / name_average)
+            if requirement_tf:
+                tf += (
+                    requirement_weight
+                    * requirement_tf
+                    / (1 - b + b * requirement_lengths[doc_id] / requirement_average)
+                )
+            impacts.append(idf * tf * (k1 + 1) / (tf + k1))
+        # Порядок по убыванию вклада нужен для досрочной остановки поиска
+        order = array("I", sorted(range(len(impacts)), key=impacts.__getitem__, reverse=True))
+        cached = self.__impacts[term] = (postings.docs, impacts, order)
+        return cached
+
+    @staticmethod
+    def __score(doc_id: int, lists: list) -> float:
+        score = 0.0
+        for docs, impacts, _ in lists:
+            position = bisect_left(docs, doc_id)
+            if position < len(docs) and docs[position] == doc_id:
+                score += impacts[position]
+        return score
+
+    def search(self, keywords: Iterable[str], top_k: int = 20, salary_boost: float = 0.0) -> list:
+        """Пары (номер вакансии, оценка) для top_k лучших вакансий по убыванию оценки
+
+        Ключевые слова разбиваются на слова так же, как текст вакансий. salary_boost > 0 умножает оценку
+        на (1 + salary_boost * зарплата / максимальная зарплата).
+        """
+        terms = {term for keyword in keywords for term in tokenize(keyword)}
+        lists = [impacts for impacts in map(self.__term_impacts, terms) if impacts is not None]
+        if not lists or top_k <= 0:
+            return []
+
+        factor = salary_boost / self.__max_salary if salary_boost and self.__max_salary > 0 else 0.0
+        bound = 1 + salary_boost if factor else 1.0
+        salaries = self.__salaries
+
+        # Алгоритм порогов: списки читаются по убыванию вклада, пока худшая из top_k оценок
+        # не превысит верхнюю границу оценки еще не просмотренных вакансий
+        heap = []
+        seen = set()
+        longest = max(len(order) for _, _, order in lists)
+        for depth in range(longest):
+            threshold = 0.0
+            for docs, impacts, order in lists:
+                if depth >= len(order):
+                    continue
+                position = order[depth]
+                threshold += impacts[position]
+                doc_id = docs[position]
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = self.__score(doc_id, lists) if len(lists) > 1 else impacts[position]
+                if factor:
+                    score *= 1 + factor * salaries[doc_id]
+                if len(heap) < top_k:
+                    heapq.heappush(heap, (score, -doc_id))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, -doc_id))
+            if len(heap) == top_k and heap[0][0] >= threshold * bound:
+                break
+        return [(-doc_id, score) for score, doc_id in sorted(heap, reverse=True)]
+
+
+class _StoreIndex:
+    """Индекс хранилища и отметка revision(), с которой он согласован"""
+
+    __slots__ = ("index", "revision", "written")
+
+    def __init__(self, saver):
+        # Отметка берется до чтения: запись другим процессом во время построения приведет к перестройке
+        self.revision = saver.revision()
+        self.index = SearchIndex.from_saver(saver)
+        self.written = False
+        saver.add_listener(self)
+
+    def vacancy_added(self, position: int, vacancy: dict):
+        self.written = True
+
+    def store_cleared(self):
+        self.written = True
+
+    def is_current(self, saver) -> bool:
+        """Индекс актуален, если отметка хранилища не менялась или изменилась только его собственной записью"""
+        revision = saver.revision()
+        if not self.written:
+            return revision == self.revision
+        # Свои записи уже пришли событиями; число вакансий отсекает чужую запись, совпавшую с ними по времени
+        self.written = False
+        self.revision = revision
+        return self.index.doc_count == saver.count()
+
+    def detach(self, saver):
+        saver.remove_listener(self.index)
+        saver.remove_listener(self)
+
+
+_saver_indexes = weakref.WeakKeyDictionary()
+
+
+def get_search_index(saver) -> SearchIndex:
+    """Индекс поиска для хранилища: строится один раз и обновляется через события хранилища
+
+    Если хранилище изменили без событий (запись другим процессом), что видно по saver.revision(),
+    индекс перестраивается. Содержимое хранилища при проверке не читается.
+    """
+    entry = _saver_indexes.get(saver)
+    if entry is not None and entry.is_current(saver):
+        return entry.index
+    if entry is not None:
+        entry.detach(saver)
+    entry = _saver_indexes[saver] = _StoreIndex(saver)
+    return entry.index
+
+
+def search_vacancies(saver, keywords: Iterable[str], top_k: int = 20, salary_boost: float = 0.0) -> list:
+    """Пары (Vacancy, оценка) для top_k наиболее релевантных вакансий хранилища"""
+    ranked = get_search_index(saver).search(keywords, top_k, salary_boost)
+    found = saver.vacancies_at(doc_id for doc_id, _ in ranked)
+    return [(found[doc_id], score) for doc_id, score in ranked if doc_id in found]
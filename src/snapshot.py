@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, Optional
+
+from src.hh_class import Vacancy, validate_salary
+
+_MAGIC = b"VSNAP002"
+STRING_FIELDS = ("name", "alternate_url", "requirement", "employer")
+# magic, число вакансий, смещения колонок: salary_from, salary_to, флаги и строковые (offsets + heap)
+_HEADER = struct.Struct("<8sQ" + "Q" * (3 + len(STRING_FIELDS)))
+SALARY_FIELDS = ("salary_from", "salary_to")
+
+
+def _align(f) -> int:
+    """Дополняет файл нулями до границы 8 байт и возвращает текущее смещение"""
+    padding = -f.tell() % 8
+    f.write(b"\0" * padding)
+    return f.tell()
+
+
+def write_snapshot(vacancies: Iterable[dict], filename: str) -> int:
+    """Записывает вакансии в колоночный снимок; возвращает число записанных вакансий"""
+    salary_from = array("q")
+    salary_to = array("q")
+    flags = bytearray()
+    offsets = {field: array("Q", [0]) for field in STRING_FIELDS}
+    heaps = {field: bytearray() for field in STRING_FIELDS}
+
+    for vacancy in vacancies:
+        snippet = vacancy.get("snippet") or {}
+        employer = vacancy.get("employer")
+        values = (
+            vacancy.get("name"),
+            vacancy.get("alternate_url"),
+            snippet.get("requirement") if isinstance(snippet, dict) else None,
+            employer.get("name") if isinstance(employer, dict) else None,
+        )
+        row_flags = 0
+        for bit, (field, value) in enumerate(zip(STRING_FIELDS, values)):
+            if value is None:
+                row_flags |= 1 << bit
+            else:
+                heaps[field] += str(value).encode("utf-8")
+            offsets[field].append(len(heaps[field]))
+        flags.append(row_flags)
+        salary_from.append(validate_salary(vacancy.get("salary_from")))
+        salary_to.append(validate_salary(vacancy.get("salary_to")))
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        sections = []
+        for column in (salary_from, salary_to, flags):
+            sections.append(_align(f))
+            f.write(column)
+        for field in STRING_FIELDS:
+            sections.append(_align(f))
+            f.write(offsets[field])
+            f.write(heaps[field])
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, len(flags), *sections))
+    os.replace(tmp_filename, filename)
+    return len(flags)
+
+
+def snapshot_from_saver(saver, filename: str) -> int:
+    """Переводит содержимое хранилища в снимок (потоково, если хранилище это умеет)"""
+    vacancies = saver.iter_file() if hasattr(saver, "iter_file") else saver.read_file().get("vacancies", [])
+    return write_snapshot(vacancies, filename)
+
+
+class Snapshot:
+    """Снимок вакансий, открытый через mmap: колонки читаются без разбора всего файла"""
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Файл {filename} не является снимком вакансий")
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, *sections = _HEADER.unpack_from(self.__mmap, 0)
+        if magic != _MAGIC:
+            self.__mmap.close()
+            raise ValueError(f"Файл {filename} не является снимком вакансий")
+        self.__count = count
+        view = memoryview(self.__mmap)
+        self.salary_from = view[sections[0] : sections[0] + count * 8].cast("q")
+        self.salary_to = view[sections[1] : sections[1] + count * 8].cast("q")
+        self.__flags = view[sections[2] : sections[2] + count]
+        self.__strings = {}
+        for field, start in zip(STRING_FIELDS, sections[3:]):
+            offsets = view[start : start + (count + 1) * 8].cast("Q")
+            self.__strings[field] = (offsets, start + (count + 1) * 8)
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.__mmap is None:
+            return
+        self.salary_from.release()
+        self.salary_to.release()
+        self.__flags.release()
+        for offsets, _ in self.__strings.values():
+            offsets.release()
+        self.__mmap.close()
+        self.__mmap = None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def string(self, field: str, index: int) -> Optional[str]:
+        """Строковое поле вакансии: декодируется только нужный фрагмент"""
+        bit = STRING_FIELDS.index(field)
+        if self.__flags[index] & (1 << bit):
+            return None
+        offsets, heap = self.__strings[field]
+        return self.__mmap[heap + offsets[index] : heap + offsets[index + 1]].decode("utf-8")
+
+    def vacancy(self, index: int) -> Vacancy:
+        """Вакансия с номером index; зарплаты в снимке уже проверены"""
+        vacancy = Vacancy.__new__(Vacancy)
+        vacancy.name = self.string("name", index)
+        vacancy.alternate_url = self.string("alternate_url", index)
+        vacancy.requirement = self.string("requirement", index)
+        vacancy.employer = self.string("employer", index)
+        vacancy.salary_from = self.salary_from[index]
+        vacancy.salary_to = self.salary_to[index]
+        return vacancy
+
+    def __iter__(self):
+        for index in range(self.__count):
+            yield self.vacancy(index)
+
+    def filter_salary(
+        self, salary_min: Optional[int] = None, salary_max: Optional[int] = None, field: str = "salary_from"
+    ) -> list:
+        """Номера вакансий с зарплатой в диапазоне [salary_min, salary_max]; строки не читаются"""
+        if field not in SALARY_FIELDS:
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        column = getattr(self, field)
+        low = salary_min if salary_min is not None else 0
+        high = salary_max if salary_max is not None else 2**63 - 1
+        return [index for index, salary in enumerate(column) if low <= salary <= high]
@@ -0,0 +1,223 @@
+import math
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+from src.filter import get_matcher, normalize_keywords
+from src.hh_class import Vacancy
+
+SALARY_FIELDS = ("salary_from", "salary_to")
+
+
+class TDigest:
+    """Сжатое представление распределения (t-digest): процентили с точностью ~1% за O(compression) памяти"""
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.__means = []
+        self.__weights = []
+        self.__buffer = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float):
+        """Добавляет значение; буфер сливается с центроидами, когда заполнится"""
+        self.__buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.__buffer) >= self.compression * 5:
+            self.__compress()
+
+    def __k_limit(self, q: float) -> float:
+        """Правая граница доли для центроида, начинающегося с доли q (масштаб k1: мелкие центроиды на краях)"""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def __compress(self):
+        if not self.__buffer:
+            return
+        points = sorted(zip(self.__means + self.__buffer, self.__weights + [1] * len(self.__buffer)))
+        self.__buffer = []
+        means, weights = [], []
+        total = self.count
+        done = 0
+        limit = self.__k_limit(0.0)
+        mean, weight = points[0]
+        for point_mean, point_weight in points[1:]:
+            if (done + weight + point_weight) / total <= limit:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self.__k_limit(done / total)
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+        self.__means, self.__weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Значение на доле q (0..1) с линейной интерполяцией между центрами центроидов"""
+        self.__compress()
+        if not self.count:
+            return None
+        means, weights = self.__means, self.__weights
+        if len(means) == 1:
+            return means[0]
+        target = q * self.count
+        # Центр первого центроида: значения левее интерполируются от минимума
+        if target < weights[0] / 2:
+            return self.min + (means[0] - self.min) * target / (weights[0] / 2)
+        cumulative = weights[0] / 2
+        for index in range(1, len(means)):
+            center = cumulative + (weights[index - 1] + weights[index]) / 2
+            if target <= center:
+                share = (target - cumulative) / (center - cumulative)
+                return means[index - 1] + (means[index] - means[index - 1]) * share
+            cumulative = center
+        tail = self.count - cumulative
+        return means[-1] + (self.max - means[-1]) * (target - cumulative) / tail if tail else means[-1]
+
+
+class VacancyStats:
+    """Агрегаты по хранилищу, обновляемые при каждой вставке: ответы за O(1) без чтения файла
+
+    Ответы запоминаются и сбрасываются только для затронутых вставкой агрегатов.
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), compression: int = 100):
+        self.keywords = normalize_keywords(keywords)
+        self.compression = compression
+        self.__matcher = get_matcher(self.keywords, "aho_corasick") if self.keywords else None
+        self.count = 0
+        self.unspecified_salary = 0
+        self.__digests = {field: TDigest(compression) for field in SALARY_FIELDS}
+        self.__keyword_counts = Counter()
+        # (название вакансии, работодатель) -> число вакансий; по нему строятся счетчики новых шаблонов
+        self.__name_employers = Counter()
+        self.__employer_counts = Counter()
+        self.__pattern_employers = {}
+        self.__cache = {}
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[dict], **options) -> "VacancyStats":
+        stats = cls(**options)
+        for position, vacancy in enumerate(vacancies):
+            stats.vacancy_added(position, vacancy)
+        return stats
+
+    @classmethod
+    def from_saver(cls, saver, **options) -> "VacancyStats":
+        """Считает агрегаты по содержимому хранилища и подписывается на его изменения"""
+        stats = cls.from_vacancies(saver.read_file().get("vacancies", []), **options)
+        saver.add_listener(stats)
+        return stats
+
+    def vacancy_added(self, position: int, vacancy: dict):
+        """Учитывает новую вакансию (вызывается хранилищем при вставке)"""
+        changed = set()
+        parsed = Vacancy.from_api_item(vacancy)
+        self.count += 1
+        if not parsed.salary_from:
+            self.unspecified_salary += 1
+        for field in SALARY_FIELDS:
+            salary = getattr(parsed, field)
+            if salary:
+                self.__digests[field].add(salary)
+                changed.add(field)
+
+        if self.__matcher is not None:
+            matched = self.__matcher.count_matches(parsed.requirement)
+            if matched:
+                self.__keyword_counts.update(matched.keys())
+                changed.add("keywords")
+
+        employer = parsed.employer
+        if employer is not None:
+            name = parsed.name or ""
+            self.__name_employers[(name, employer)] += 1
+            self.__employer_counts[employer] += 1
+            changed.add(("employers", None))
+            for pattern, (regex, counts) in self.__pattern_employers.items():
+                if regex.search(name):
+                    counts[employer] += 1
+                    changed.add(("employers", pattern))
+
+        for key in changed:
+            self.__cache.pop(key, None)
+
+    def store_cleared(self):
+        """Сбрасывает агрегаты при очистке хранилища"""
+        self.__init__(self.keywords, self.compression)
+
+    def __cached(self, key, argument, compute):
+        answers = self.__cache.setdefault(key, {})
+        if argument not in answers:
+            answers[argument] = compute()
+        return answers[argument]
+
+    def unspecified_salary_share(self) -> float:
+        """Доля вакансий без зарплаты (salary_from == 0)"""
+        return self.unspecified_salary / self.count if self.count else 0.0
+
+    def percentile(self, q: float, field: str = "salary_from") -> Optional[float]:
+        """Приблизительный процентиль указанной зарплаты; нулевая зарплата (не указана) не учитывается"""
+        if not 0 <= q <= 100:
+            raise ValueError("Процентиль должен быть в диапазоне от 0 до 100")
+        if field not in self.__digests:
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        return self.__cached(field, q, lambda: self.__digests[field].quantile(q / 100))
+
+    def median(self, field: str = "salary_from") -> Optional[float]:
+        return self.percentile(50, field)
+
+    def keyword_count(self, keyword: str) -> int:
+        """Число вакансий, в требованиях которых есть ключевое слово (из переданных при создании)"""
+        keyword = keyword.lower()
+        if keyword not in self.keywords:
+            raise ValueError(f"Ключевое слово не отслеживается: {keyword}")
+        return self.__keyword_counts[keyword]
+
+    def keyword_counts(self) -> dict:
+        """Число вакансий по каждому отслеживаемому ключевому слову"""
+        return self.__cached(
+            "keywords", None, lambda: {keyword: self.__keyword_counts[keyword] for keyword in self.keywords}
+        )
+
+    def __employers(self, pattern: Optional[str]) -> Counter:
+        if pattern is None:
+            return self.__employer_counts
+        if pattern not in self.__pattern_employers:
+            # Новый шаблон считается один раз по парам (название, работодатель), дальше обновляется при вставке
+            regex = re.compile(pattern, flags=re.IGNORECASE)
+            counts = Counter()
+            for (name, employer), count in self.__name_employers.items():
+                if regex.search(name):
+                    counts[employer] += count
+            self.__pattern_employers[pattern] = (regex, counts)
+        return self.__pattern_employers[pattern][1]
+
+    def top_employers(self, n: int = 10, name_pattern: Optional[str] = None) -> list:
+        """Работодатели с наибольшим числом вакансий, название которых подходит под регулярное выражение"""
+        return self.__cached(("employers", name_pattern), n, lambda: self.__employers(name_pattern).most_common(n))
+
+    def summary(self) -> dict:
+        """Основные агрегаты одним словарем"""
+        return {
+            "count": self.count,
+            "unspecified_salary_share": round(self.unspecified_salary_share(), 4),
+            "median_salary_from": self.median("salary_from"),
+            "median_salary_to": self.median("salary_to"),
+            "keyword_counts": self.keyword_counts(),
+            "top_employers": self.top_employers(),
+        }
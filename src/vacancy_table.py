@@ -0,0 +1,254 @@
+import heapq
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Optional
+
+from src.hh_class import Vacancy, validate_salary
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SALARY_FIELDS = ("salary_from", "salary_to")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class VacancyTable:
+    """Колоночное хранение вакансий: зарплаты в массивах array, строки интернированы
+
+    Если установлен NumPy, операции над зарплатами выполняются над буферами колонок без копирования
+    (numpy.frombuffer); иначе - циклом на Python с тем же результатом.
+    """
+
+    __slots__ = (
+        "__name",
+        "__alternate_url",
+        "__requirement",
+        "__employer",
+        "__salary_from",
+        "__salary_to",
+        "__sorted",
+    )
+
+    def __init__(self):
+        self.__name = []
+        self.__alternate_url = []
+        self.__requirement = []
+        self.__employer = []
+        self.__salary_from = array("q")
+        self.__salary_to = array("q")
+        # Отсортированные колонки для процентилей по ключу (field, skip_zero); сбрасываются в append
+        self.__sorted = {}
+
+    # Колонки доступны только для чтения: изменение в обход append не сбросило бы кэш отсортированных колонок.
+    # Зарплаты отдаются копией: живой memoryview над колонкой запретил бы append (BufferError).
+    @property
+    def salary_from(self):
+        return self._salary_copy("salary_from")
+
+    @property
+    def salary_to(self):
+        return self._salary_copy("salary_to")
+
+    @property
+    def name(self) -> tuple:
+        return tuple(self.__name)
+
+    @property
+    def alternate_url(self) -> tuple:
+        return tuple(self.__alternate_url)
+
+    @property
+    def requirement(self) -> tuple:
+        return tuple(self.__requirement)
+
+    @property
+    def employer(self) -> tuple:
+        return tuple(self.__employer)
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]) -> "VacancyTable":
+        """Строит таблицу из словарей формата main_data"""
+        table = cls()
+        for item in items:
+            table.append(item)
+        return table
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyTable":
+        """Строит таблицу из объектов Vacancy"""
+        table = cls()
+        for vacancy in vacancies:
+            table.__name.append(_intern(vacancy.name))
+            table.__alternate_url.append(_intern(vacancy.alternate_url))
+            table.__requirement.append(_intern(vacancy.requirement))
+            table.__employer.append(_intern(vacancy.employer))
+            table.__salary_from.append(vacancy.salary_from)
+            table.__salary_to.append(vacancy.salary_to)
+        return table
+
+    def append(self, item: dict):
+        """Добавляет вакансию в формате main_data"""
+        snippet = item.get("snippet") or {}
+        employer = item.get("employer")
+        self.__name.append(_intern(item.get("name")))
+        self.__alternate_url.append(_intern(item.get("alternate_url")))
+        self.__requirement.append(_intern(snippet.get("requirement") if isinstance(snippet, dict) else None))
+        self.__employer.append(_intern(employer.get("name") if isinstance(employer, dict) else None))
+        self.__salary_from.append(validate_salary(item.get("salary_from")))
+        self.__salary_to.append(validate_salary(item.get("salary_to")))
+        self.__sorted.clear()
+
+    def __len__(self) -> int:
+        return len(self.__salary_from)
+
+    def row(self, index: int) -> dict:
+        """Возвращает строку таблицы в формате main_data; работодатель - в формате API, если известен"""
+        data = {
+            "name": self.__name[index],
+            "alternate_url": self.__alternate_url[index],
+            "salary_from": self.__salary_from[index],
+            "salary_to": self.__salary_to[index],
+            "snippet": {"requirement": self.__requirement[index]},
+        }
+        if self.__employer[index] is not None:
+            data["employer"] = {"name": self.__employer[index]}
+        return data
+
+    def vacancy(self, index: int) -> Vacancy:
+        """Возвращает строку таблицы как объект Vacancy"""
+        return Vacancy(
+            self.__name[index],
+            self.__alternate_url[index],
+            self.__salary_from[index],
+            self.__salary_to[index],
+            self.__requirement[index],
+            self.__employer[index],
+        )
+
+    def to_dicts(self) -> list:
+        """Возвращает все строки в формате main_data"""
+        return [self.row(index) for index in range(len(self))]
+
+    def take(self, indices: Iterable[int]) -> "VacancyTable":
+        """Возвращает новую таблицу из строк с указанными индексами"""
+        indices = list(indices)
+        table = VacancyTable()
+        table.__name = [self.__name[i] for i in indices]
+        table.__alternate_url = [self.__alternate_url[i] for i in indices]
+        table.__requirement = [self.__requirement[i] for i in indices]
+        table.__employer = [self.__employer[i] for i in indices]
+        if numpy is not None and indices:
+            positions = numpy.asarray(indices, dtype=numpy.intp)
+            table.__salary_from.frombytes(self._numpy_column("salary_from")[positions].tobytes())
+            table.__salary_to.frombytes(self._numpy_column("salary_to")[positions].tobytes())
+        else:
+            table.__salary_from = array("q", [self.__salary_from[i] for i in indices])
+            table.__salary_to = array("q", [self.__salary_to[i] for i in indices])
+        return table
+
+    def _column(self, field: str) -> array:
+        if field not in SALARY_FIELDS:
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        return self.__salary_from if field == "salary_from" else self.__salary_to
+
+    def _salary_copy(self, field: str):
+        """Копия колонки только для чтения: массив NumPy с writeable=False или memoryview над копией array"""
+        if numpy is not None:
+            column = self._numpy_column(field).copy()
+            column.flags.writeable = False
+            return column
+        return memoryview(array("q", self._column(field))).toreadonly()
+
+    def _numpy_column(self, field: str):
+        """Колонка зарплаты как массив NumPy поверх того же буфера; ссылку нельзя хранить дольше вызова"""
+        column = self._column(field)
+        if not column:
+            return numpy.empty(0, dtype=numpy.int64)
+        return numpy.frombuffer(column, dtype=numpy.int64)
+
+    def salary_mask(
+        self, salary_min: Optional[int] = None, salary_max: Optional[int] = None, field: str = "salary_from"
+    ) -> list:
+        """Возвращает индексы строк с зарплатой в диапазоне [salary_min, salary_max]"""
+        low = salary_min if salary_min is not None else -sys.maxsize
+        high = salary_max if salary_max is not None else sys.maxsize
+        if numpy is not None:
+            column = self._numpy_column(field)
+            return numpy.flatnonzero((column >= low) & (column <= high)).tolist()
+        return [index for index, salary in enumerate(self._column(field)) if low <= salary <= high]
+
+    def filter_salary(
+        self, salary_min: Optional[int] = None, salary_max: Optional[int] = None, field: str = "salary_from"
+    ) -> "VacancyTable":
+        """Возвращает таблицу вакансий с зарплатой в диапазоне [salary_min, salary_max]"""
+        return self.take(self.salary_mask(salary_min, salary_max, field))
+
+    def argsort(self, field: str = "salary_from", reverse: bool = False) -> list:
+        """Возвращает индексы строк, упорядоченные по зарплате; равные зарплаты - в порядке добавления"""
+        if numpy is not None:
+            column = self._numpy_column(field)
+            # Зарплаты неотрицательны, поэтому убывающий порядок - устойчивая сортировка по -column
+            return numpy.argsort(-column if reverse else column, kind="stable").tolist()
+        column = self._column(field)
+        return sorted(range(len(column)), key=column.__getitem__, reverse=reverse)
+
+    def top_n(self, n: int, field: str = "salary_from") -> list:
+        """Возвращает индексы n строк с наибольшей зарплатой"""
+        if numpy is not None:
+            return self.argsort(field, reverse=True)[: max(n, 0)]
+        column = self._column(field)
+        return heapq.nlargest(n, range(len(column)), key=column.__getitem__)
+
+    def _sorted_salaries(self, field: str, skip_zero: bool):
+        values = self.__sorted.get((field, skip_zero))
+        if values is None:
+            if numpy is not None:
+                column = self._numpy_column(field)
+                # numpy.sort возвращает копию, так что буфер колонки не остается занятым
+                values = numpy.sort(column[column != 0] if skip_zero else column)
+            else:
+                column = self._column(field)
+                values = sorted(filter(None, column) if skip_zero else column)
+            self.__sorted[field, skip_zero] = values
+        return values
+
+    def percentile(self, q: float, field: str = "salary_from", skip_zero: bool = True) -> Optional[float]:
+        """Процентиль зарплаты с линейной интерполяцией; нулевая зарплата (не указана) по умолчанию не учитывается"""
+        if not 0 <= q <= 100:
+            raise ValueError("Процентиль должен быть в диапазоне от 0 до 100")
+        values = self._sorted_salaries(field, skip_zero)
+        if not len(values):
+            return None
+        position = (len(values) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        low_value, high_value = int(values[lower]), int(values[upper])
+        return low_value + (high_value - low_value) * (position - lower)
+
+    def median(self, field: str = "salary_from", skip_zero: bool = True) -> Optional[float]:
+        """Медиана зарплаты"""
+        return self.percentile(50, field, skip_zero)
+
+    def histogram(self, edges: list, field: str = "salary_from", skip_zero: bool = True) -> list:
+        """Число вакансий в интервалах [edges[i], edges[i + 1]), последний интервал включает правую границу"""
+        if numpy is not None and len(edges) > 1:
+            column = self._numpy_column(field)
+            counts, _ = numpy.histogram(column[column != 0] if skip_zero else column, bins=edges)
+            return counts.tolist()
+        counts = [0] * (len(edges) - 1)
+        last = len(edges) - 1
+        for salary in self._column(field):
+            if skip_zero and not salary:
+                continue
+            index = bisect_right(edges, salary) - 1
+            if index == last and salary == edges[-1]:
+                index -= 1
+            if 0 <= index < last:
+                counts[index] += 1
+        return counts
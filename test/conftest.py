@@ -7,8 +7,24 @@ import pytest
 @pytest.fixture
 def data():
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(base_dir, "..", "tests/data_test")
+    data_dir = os.path.join(base_dir, "datatest")
     file_path = os.path.join(data_dir, "test_vacancies.json")
     with open(file_path, encoding="utf-8") as r:
         file = json.load(r)
     return file
+
+
+@pytest.fixture
+def real_data_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vacancies.json")
+
+
+@pytest.fixture
+def real_data(real_data_path):
+    with open(real_data_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def real_items(real_data):
+    return real_data["items"]
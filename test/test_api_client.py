@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from src.api_client import HHApiClient, TokenBucket, item_to_vacancy
+from src.filter import filter_vacancies
+from src.hh_class import Vacancy
+
+
+@pytest.fixture
+def stub_server(real_items):
+    """Локальный сервер, отдающий data/vacancies.json постранично как API hh.ru"""
+    requests_log = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            requests_log.append(query)
+            per_page = int(query["per_page"][0])
+            page = int(query["page"][0])
+            pages = (len(real_items) + per_page - 1) // per_page
+            body = {
+                "items": real_items[page * per_page : (page + 1) * per_page],
+                "found": len(real_items),
+                "pages": pages,
+                "page": page,
+            }
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/vacancies", requests_log
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_all_pages(stub_server, real_items):
+    """Тест загрузки всех страниц поиска"""
+    url, requests_log = stub_server
+
+    async def run():
+        async with HHApiClient(base_url=url, concurrency=3, rate=100, per_page=20) as client:
+            return [vacancy async for vacancy in client.iter_vacancies("Java")]
+
+    vacancies = asyncio.run(run())
+    assert all(isinstance(vacancy, Vacancy) for vacancy in vacancies)
+    assert sorted(v.alternate_url for v in vacancies) == sorted(v["alternate_url"] for v in real_items)
+    assert sorted(int(q["page"][0]) for q in requests_log) == list(range(6))
+    assert all(q["text"] == ["Java"] for q in requests_log)
+
+
+def test_get_vacancies_feeds_filter(stub_server, real_items):
+    """Тест передачи результата в filter_vacancies"""
+    url, _ = stub_server
+
+    async def run():
+        async with HHApiClient(base_url=url, per_page=50, max_pages=2) as client:
+            return await client.get_vacancies("Java")
+
+    data = asyncio.run(run())
+    assert len(data["items"]) == 100
+    # found - полный размер выдачи, даже если загружены не все страницы
+    assert data["found"] == len(real_items)
+    assert filter_vacancies(data, ["SQL"]) == filter_vacancies({"items": data["items"]}, ["sql"])
+
+
+def test_item_to_vacancy_raw_api_shape():
+    """Тест разбора элемента в исходном формате API"""
+    vacancy = item_to_vacancy(
+        {"name": "QA", "alternate_url": "u", "salary": {"from": 1000, "to": None}, "snippet": {"requirement": "r"}}
+    )
+    assert (vacancy.salary_from, vacancy.salary_to, vacancy.requirement) == (1000, 0, "r")
+
+
+def test_employer_carried_to_main_data():
+    """Тест: работодатель из ответа API сохраняется в main_data"""
+    vacancy = item_to_vacancy({"name": "QA", "alternate_url": "u", "employer": {"id": "1", "name": "Яндекс"}})
+    assert vacancy.employer == "Яндекс"
+    assert vacancy.main_data()["employer"] == {"name": "Яндекс"}
+    assert item_to_vacancy(vacancy.main_data()).employer == "Яндекс"
+    assert "employer" not in item_to_vacancy({"name": "QA"}).main_data()
+
+
+def test_token_bucket_rate():
+    """Тест ограничения частоты запросов"""
+
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_concurrent_searches_share_rate(stub_server, real_items):
+    """Тест: одновременные поиски на одном клиенте делят общий лимит частоты"""
+    url, requests_log = stub_server
+    pages = (len(real_items) + 9) // 10
+
+    async def run():
+        async with HHApiClient(base_url=url, rate=pages, per_page=10) as client:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(client.get_vacancies("Java"), client.get_vacancies("Python"))
+            return loop.time() - start
+
+    # Емкость корзины равна числу страниц одного поиска: второму поиску токены достаются только через секунду
+    assert asyncio.run(run()) >= 0.9
+    assert len(requests_log) == 2 * pages
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+from src.async_saver import AsyncSaver
+from src.hh_class import Vacancy
+from src.saver_class import JSONLinesSaver, JSONSaver, SQLiteSaver
+
+
+def vacancy(number: int) -> dict:
+    return Vacancy(f"Vacancy {number}", f"url-{number}", number, 0, "Python").main_data()
+
+
+class CountingSaver(JSONSaver):
+    """JSONSaver, считающий число пакетных записей"""
+
+    writes = 0
+
+    def add_vacancies(self, vacancies):
+        CountingSaver.writes += 1
+        super().add_vacancies(vacancies)
+
+
+@pytest.fixture
+def counting_saver(tmp_path):
+    CountingSaver.writes = 0
+    return CountingSaver({"items": []}, str(tmp_path / "store.json"))
+
+
+def test_concurrent_adds_coalesced(counting_saver):
+    """Тест объединения параллельных add_vacancy в одну запись"""
+
+    async def run():
+        async with AsyncSaver(counting_saver, flush_interval=10) as saver:
+            await asyncio.gather(*(saver.add_vacancy(vacancy(i)) for i in range(50)))
+            assert saver.pending == 50
+            await saver.flush()
+            assert saver.pending == 0
+            return await saver.read_file()
+
+    data = asyncio.run(run())
+    assert [v["alternate_url"] for v in data["vacancies"]] == [f"url-{i}" for i in range(50)]
+    assert CountingSaver.writes == 1
+
+
+def test_batch_size_and_interval(counting_saver):
+    """Тест записи по размеру пакета и по таймеру"""
+
+    async def run():
+        saver = AsyncSaver(counting_saver, flush_interval=0.01, batch_size=10)
+        for i in range(25):
+            await saver.add_vacancy(vacancy(i))
+        assert CountingSaver.writes == 2
+        await asyncio.sleep(0.05)
+        assert saver.pending == 0
+        count = await saver.count()
+        await saver.close()
+        return count
+
+    assert asyncio.run(run()) == 25
+    assert CountingSaver.writes == 3
+
+
+def test_read_page_and_clear(counting_saver):
+    """Тест чтения страницы и очистки через асинхронный интерфейс"""
+
+    async def run():
+        async with AsyncSaver(counting_saver) as saver:
+            for i in range(5):
+                await saver.add_vacancy(vacancy(i))
+            page = await saver.read_page(1, 2)
+            await saver.clear_file()
+            return page, await saver.count()
+
+    page, count = asyncio.run(run())
+    assert [v.alternate_url for v in page] == ["url-1", "url-2"]
+    assert count == 0
+
+
+def test_background_error_reported_on_flush(counting_saver, monkeypatch):
+    """Тест передачи ошибки фоновой записи"""
+
+    def broken(vacancies):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(counting_saver, "add_vacancies", broken)
+
+    async def run():
+        saver = AsyncSaver(counting_saver, flush_interval=0.01)
+        await saver.add_vacancy(vacancy(1))
+        await asyncio.sleep(0.05)
+        with pytest.raises(OSError):
+            await saver.flush()
+        # Пакет не потерян: close() пытается записать его снова
+        assert saver.pending == 1
+        with pytest.raises(OSError):
+            await saver.close()
+
+    asyncio.run(run())
+
+
+def test_failed_flush_keeps_batch(counting_saver, monkeypatch):
+    """Тест: после ошибки записи вакансии остаются в очереди и записываются следующим flush()"""
+    write = counting_saver.add_vacancies
+    failures = [OSError("disk full")]
+
+    def flaky(vacancies):
+        if failures:
+            raise failures.pop()
+        write(vacancies)
+
+    monkeypatch.setattr(counting_saver, "add_vacancies", flaky)
+
+    async def run():
+        saver = AsyncSaver(counting_saver, flush_interval=0.01)
+        await saver.add_vacancy(vacancy(1))
+        await asyncio.sleep(0.05)
+        assert isinstance(saver.error, OSError)
+        assert saver.pending == 1
+        await saver.add_vacancy(vacancy(2))
+        await saver.flush()
+        assert saver.error is None
+        assert saver.pending == 0
+        data = await saver.read_file()
+        await saver.close()
+        return data
+
+    data = asyncio.run(run())
+    assert [v["alternate_url"] for v in data["vacancies"]] == ["url-1", "url-2"]
+
+
+def test_sqlite_saver_from_executor_thread(tmp_path):
+    """Тест: SQLiteSaver работает из потока AsyncSaver, хотя соединение открыто в основном потоке"""
+    store = SQLiteSaver({"items": []}, str(tmp_path / "store.db"))
+
+    async def run():
+        async with AsyncSaver(store) as saver:
+            for i in range(5):
+                await saver.add_vacancy(vacancy(i))
+            await saver.flush()
+            page = await saver.read_page(1, 2)
+            return await saver.read_file(), await saver.count(), page
+
+    data, count, page = asyncio.run(run())
+    assert [v["alternate_url"] for v in data["vacancies"]] == [f"url-{i}" for i in range(5)]
+    assert count == 5
+    assert [v.alternate_url for v in page] == ["url-1", "url-2"]
+
+
+def test_jsonlines_saver_batched_append(tmp_path, monkeypatch):
+    """Тест: пакет AsyncSaver дописывается в журнал JSONLinesSaver одной записью"""
+    store = JSONLinesSaver({"items": []}, str(tmp_path / "store"))
+    monkeypatch.setattr(store, "add_vacancy", lambda vacancy_data: pytest.fail("запись по одной вакансии"))
+
+    async def run():
+        async with AsyncSaver(store, flush_interval=10) as saver:
+            await asyncio.gather(*(saver.add_vacancy(vacancy(i)) for i in range(20)))
+            await saver.flush()
+            return await saver.count()
+
+    assert asyncio.run(run()) == 20
+    assert len(store) == 20
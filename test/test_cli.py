@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from src import cli
+from src.saver_class import JSONSaver
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые не должны загружаться при --help
+HEAVY_MODULES = {"requests", "sqlite3", "cProfile", "src.saver_class", "src.api_client", "src.search"}
+# Модули, которые не нужны команде filter с хранилищем JSON
+FILTER_HEAVY_MODULES = {
+    "requests",
+    "sqlite3",
+    "orjson",
+    "msgspec",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "src.api_client",
+    "src.search",
+}
+
+
+@pytest.fixture
+def store(tmp_path, data):
+    filename = str(tmp_path / "store.json")
+    JSONSaver(data, filename).save_to_file()
+    return filename
+
+
+def run(capsys, *argv) -> list:
+    assert cli.main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_search(store, capsys):
+    """Тест ранжированного поиска из командной строки"""
+    [result] = run(capsys, "--file", store, "search", "опыт", "--top", "3")
+    assert result["query"] == "опыт"
+    assert 0 < len(result["results"]) <= 3
+    scores = [item["score"] for item in result["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_filter_batch(store, capsys, monkeypatch):
+    """Тест пакетного режима: несколько запросов из stdin в одном процессе"""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("опыт\n\nнавыками коммуникации\n"))
+    results = run(capsys, "--file", store, "filter", "--batch")
+    assert [result["query"] for result in results] == ["опыт", "навыками коммуникации"]
+    assert all(result["count"] >= len(result["results"]) for result in results)
+
+
+def test_stats(store, capsys, data):
+    """Тест сводки по хранилищу"""
+    [stats] = run(capsys, "--file", store, "stats")
+    assert stats["count"] == len(data["items"])
+    assert 0 <= stats["unspecified_salary_share"] <= 1
+
+
+def test_save(tmp_path, capsys, monkeypatch, data):
+    """Тест загрузки из API (клиент подменен) и повторного сохранения без дублей"""
+
+    async def get_vacancies(self, search_query, **params):
+        return {"items": data["items"]}
+
+    monkeypatch.setattr("src.api_client.HHApiClient.get_vacancies", get_vacancies)
+    filename = str(tmp_path / "new" / "store.json")
+    [first] = run(capsys, "--file", filename, "save", "Python")
+    assert first == {"query": "Python", "fetched": len(data["items"]), "saved": len(data["items"])}
+    [second] = run(capsys, "--file", filename, "save", "Python")
+    assert second["saved"] == 0
+
+
+def test_missing_query():
+    """Тест ошибки при отсутствии слов запроса"""
+    with pytest.raises(SystemExit):
+        cli.main(["search"])
+
+
+def imported_modules(*argv) -> dict:
+    """Модули, загруженные командой hh-course, с накопленным временем импорта (по python -X importtime)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", *argv],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+    return imported
+
+
+def test_help_does_not_import_heavy_modules(store):
+    """Тест времени запуска: --help не загружает хранилище, API и sqlite3; filter - sqlite3, orjson, msgspec и пул"""
+    imported = imported_modules("--help")
+    assert "argparse" in imported
+    assert not HEAVY_MODULES & set(imported)
+
+    imported = imported_modules("--file", store, "filter", "python")
+    assert "src.filter" in imported
+    assert not FILTER_HEAVY_MODULES & set(imported)
+
+
+def test_default_store_is_not_sample_data():
+    """Тест: хранилище по умолчанию не совпадает с примером ответа API в data/"""
+    args = cli.build_parser().parse_args(["stats"])
+    assert args.file == "vacancies.json"
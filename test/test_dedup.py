@@ -0,0 +1,98 @@
+import pytest
+from src.dedup import NearDuplicateDetector, _choose_bands, drop_near_duplicates, find_near_duplicates, shingles
+from src.saver_class import JSONSaver
+
+
+def repost(vacancy: dict, number: int) -> dict:
+    """Та же вакансия, размещенная повторно под новым URL"""
+    return dict(vacancy, alternate_url=f"{vacancy['alternate_url']}-repost-{number}")
+
+
+def test_shingles():
+    """Тест шинглов без разметки и для коротких текстов"""
+    vacancy = {"name": "Java", "snippet": {"requirement": "<highlighttext>Java</highlighttext> и SQL"}}
+    assert shingles(vacancy) == {"java java и", "java и sql"}
+    assert shingles({"name": "QA", "snippet": None}) == {"qa"}
+    assert shingles({}) == set()
+
+
+def test_find_near_duplicates(real_items):
+    """Тест поиска повторно размещенных вакансий в пакете"""
+    items = real_items[:30] + [repost(real_items[3], 1), repost(real_items[7], 1)]
+    pairs = find_near_duplicates(items, threshold=0.9)
+    assert (30, 3) in pairs and (31, 7) in pairs
+    assert len(list(drop_near_duplicates(items, threshold=0.9))) == len(items) - len(pairs)
+
+
+def test_similarity_threshold():
+    """Тест порога сходства"""
+    base = {"name": "Python Developer", "snippet": {"requirement": " ".join(f"слово{i}" for i in range(40))}}
+    changed = {"name": "Python Developer", "snippet": {"requirement": " ".join(f"слово{i}" for i in range(30))}}
+    strict = NearDuplicateDetector(threshold=0.95)
+    loose = NearDuplicateDetector(threshold=0.5)
+    for detector in (strict, loose):
+        detector.check_and_add("base", base)
+    assert strict.query(changed) is None
+    assert loose.query(changed) == "base"
+
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold=0)
+
+
+def test_choose_bands_not_limited_to_divisors():
+    """Тест: полосы подбираются по всем b * r <= num_perm, а не только по делителям num_perm"""
+    assert _choose_bands(128, 0.8) == (9, 13)
+    for threshold in (0.5, 0.9, 0.95):
+        bands, rows = _choose_bands(128, threshold)
+        assert bands * rows <= 128
+
+
+def test_recall_just_above_threshold():
+    """Тест полноты для пар со сходством Жаккара чуть выше порога"""
+    detector = NearDuplicateDetector(threshold=0.8, shingle_size=1)
+    found = 0
+    for number in range(200):
+        shared = [f"общее{number}x{i}" for i in range(100)]
+        # Сходство пары 100 / 114 ~ 0.88
+        left = {"name": "", "snippet": {"requirement": " ".join(shared + [f"левое{number}x{i}" for i in range(7)])}}
+        right = {"name": "", "snippet": {"requirement": " ".join(shared + [f"правое{number}x{i}" for i in range(7)])}}
+        detector.check_and_add(number, left)
+        found += detector.query(right) == number
+    assert found / 200 >= 0.75
+
+
+def test_saver_skips_near_duplicates(tmp_path, real_items):
+    """Тест пропуска почти одинаковых вакансий при сохранении"""
+    path = str(tmp_path / "store.json")
+    JSONSaver({"items": real_items[:20]}, path).save_to_file()
+
+    detector = NearDuplicateDetector(threshold=0.9)
+    saver = JSONSaver({"items": [repost(real_items[5], 1), repost(real_items[25], 1)]}, path, near_duplicates=detector)
+    saver.save_to_file()
+    stored = saver.read_file()["vacancies"]
+    assert len(stored) == 21
+    assert stored[-1]["alternate_url"].endswith("repost-1")
+
+    saver.add_vacancy(real_items[30])
+    assert detector.query(repost(real_items[30], 2)) == 21
+
+
+def test_failed_write_keeps_detector_unchanged(tmp_path, real_items, monkeypatch):
+    """Тест: после неудачной записи подписи не остаются в детекторе и повтор сохраняет вакансии"""
+    path = str(tmp_path / "store.json")
+    detector = NearDuplicateDetector(threshold=0.9)
+    items = [real_items[0], real_items[1], repost(real_items[1], 1)]
+    saver = JSONSaver({"items": items}, path, near_duplicates=detector)
+
+    def broken_dumps(data):
+        raise OSError("No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(saver.codec, "dumps", broken_dumps)
+        with pytest.raises(OSError):
+            saver.save_to_file()
+    assert len(detector) == 0
+
+    saver.save_to_file()
+    assert saver.read_file()["vacancies"] == items[:2]
+    assert len(detector) == 2
@@ -1,5 +1,8 @@
+import random
+import re
+
 import pytest
-from src.filter import filter_vacancies
+from src.filter import AhoCorasickMatcher, KeywordMatcher, ParallelFilter, filter_vacancies, rank_vacancies
 
 
 @pytest.fixture
@@ -84,3 +87,94 @@ def test_filter_with_empty_requirements_string(sample_vacancies):
     )
     result = filter_vacancies(sample_vacancies, ["empty"])
     assert len(result) == 0
+
+
+def test_keyword_matcher_cached():
+    """Тест повторного использования скомпилированного матчера"""
+    matcher = KeywordMatcher.for_words(["Python", "SQL"])
+    assert KeywordMatcher.for_words(["sql", "python", "SQL"]) is matcher
+    assert matcher.keywords == ("python", "sql")
+
+
+def test_keyword_matcher_match_many(sample_vacancies):
+    """Тест пакетного применения матчера"""
+    matcher = KeywordMatcher.for_words(["spring", "react"])
+    result = matcher.match_many(sample_vacancies["items"])
+    assert [v["name"] for v in result] == ["Java Developer", "Frontend Developer"]
+    assert matcher.match("Python и Django") is False
+    assert matcher.match(None) is False
+
+
+@pytest.mark.parametrize("words", [["python", "django"], ["java"], ["JAVASCRIPT"], ["ruby"], ["java", "react", "c++"]])
+def test_aho_corasick_engine_same_as_regex(sample_vacancies, words):
+    """Тест совпадения результатов движка Ахо-Корасик с регулярным выражением"""
+    assert filter_vacancies(sample_vacancies, words, engine="aho_corasick") == filter_vacancies(
+        sample_vacancies, words
+    )
+
+
+def baseline_filter_vacancies(vacancies_data: dict, filter_words: list) -> list:
+    """Исходная реализация filter_vacancies: шаблон из слов как есть, re.IGNORECASE"""
+    filtered_vacancies = []
+    for vacancy in vacancies_data["items"]:
+        requirements = vacancy["snippet"]["requirement"]
+        if not requirements:
+            continue
+        pattern = r"\b(?:{})\b".format("|".join(map(re.escape, filter_words)))
+        if re.search(pattern, requirements, flags=re.IGNORECASE):
+            filtered_vacancies.append(vacancy)
+    return filtered_vacancies
+
+
+@pytest.mark.parametrize("engine", ["regex", "aho_corasick"])
+def test_engines_match_baseline_case_folding(engine):
+    """Дифференциальный тест с исходной реализацией на символах, у которых str.lower расходится с re"""
+    alphabet = "aAiIİısSſσςΣkKKµμΜßяЯвᲀ _-+."
+    generator = random.Random(3)
+    texts = ["İstanbul", "ISTANBUL", "ıstanbul", "ΟΔΟΣ", "οδος", "οδοσ", "ſtraße", "Kelvin", "µs"]
+    texts += ["".join(generator.choices(alphabet, k=generator.randint(1, 12))) for _ in range(300)]
+    vacancies = {"items": [{"snippet": {"requirement": text}} for text in texts]}
+    keyword_sets = [["İstanbul"], ["istanbul"], ["ΟΔΟΣ"], ["οδος"], ["οδοσ", "STRASSE"], ["kelvin"], ["µs"], ["МЅ"]]
+    keyword_sets += [
+        ["".join(generator.choices(alphabet, k=generator.randint(1, 3))) for _ in range(generator.randint(1, 3))]
+        for _ in range(200)
+    ]
+    for words in keyword_sets:
+        assert filter_vacancies(vacancies, words, engine=engine) == baseline_filter_vacancies(vacancies, words), words
+
+
+def test_aho_corasick_word_boundaries():
+    """Тест границ слов и регистра в автомате Ахо-Корасик"""
+    matcher = AhoCorasickMatcher.for_words(["Java", "SQL", "c++"])
+    assert matcher.match("Знание <highlighttext>Java</highlighttext> SE")
+    assert not matcher.match("JavaScript и PostgreSQL")
+    assert matcher.count_matches("Java, java и SQL; c++") == {"java": 2, "sql": 1}
+
+
+def test_rank_vacancies(sample_vacancies):
+    """Тест ранжирования по числу совпадений"""
+    ranked = rank_vacancies(sample_vacancies, ["java", "spring", "python"])
+    assert [vacancy["name"] for vacancy, _ in ranked] == ["Java Developer", "Python Developer"]
+    assert ranked[0][1] == {"java": 1, "spring": 1}
+
+
+def test_unknown_engine(sample_vacancies):
+    """Тест неизвестного движка поиска"""
+    with pytest.raises(ValueError):
+        filter_vacancies(sample_vacancies, ["java"], engine="unknown")
+
+
+@pytest.mark.parametrize("engine", ["regex", "aho_corasick"])
+def test_parallel_filter_keeps_order(sample_vacancies, engine):
+    """Тест параллельной фильтрации: результат и порядок как при последовательной"""
+    items = sample_vacancies["items"] * 50
+    with ParallelFilter(["java", "react"], workers=2, engine=engine, chunk_size=7, threshold=0) as parallel:
+        result = parallel.filter(items)
+    assert result == filter_vacancies({"items": items}, ["java", "react"])
+    assert result[0] is items[1]
+
+
+def test_parallel_filter_serial_fallback(sample_vacancies):
+    """Тест последовательной обработки небольших списков"""
+    result = filter_vacancies(sample_vacancies, ["python"], workers=4)
+    assert [v["name"] for v in result] == ["Python Developer"]
@@ -1,7 +1,7 @@
 import pytest
 import os
 from src.saver_class import JSONSaver
-from src.hh_class import Vacancy
+from src.hh_class import Vacancy, validate_salary
 
 
 @pytest.fixture
@@ -48,3 +48,112 @@ def test_invalid_vacancy(temp_file, capsys):
     saver = JSONSaver({"items": []}, str(temp_file))
     saver.add_vacancy("invalid")
     assert "можно добавлять только main_data" in capsys.readouterr().out.lower()
+
+
+def test_iter_file(temp_file, sample_vacancy):
+    saver = JSONSaver({"items": [sample_vacancy.main_data()]}, str(temp_file))
+    assert list(saver.iter_file()) == []
+
+    saver.save_to_file()
+    assert list(saver.iter_file()) == [sample_vacancy.main_data()]
+
+
+def _add_in_process(filename, worker):
+    saver = JSONSaver({"items": []}, filename)
+    for i in range(10):
+        saver.add_vacancy(Vacancy(f"Worker {worker}", f"url-{worker}-{i}", i, 0, "").main_data())
+
+
+def test_concurrent_add_vacancy(temp_file):
+    import multiprocessing
+
+    processes = [multiprocessing.Process(target=_add_in_process, args=(str(temp_file), w)) for w in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    data = JSONSaver({"items": []}, str(temp_file)).read_file()
+    assert len(data["vacancies"]) == 40
+
+
+def test_add_vacancies_batch(temp_file, sample_vacancy):
+    saver = JSONSaver({"items": []}, str(temp_file))
+    other = Vacancy("Java", "url2", 0, 0, "Java").main_data()
+    saver.add_vacancies([sample_vacancy.main_data(), other, sample_vacancy.main_data(), "invalid"])
+    saver.add_vacancies([other])
+
+    assert saver.read_file()["vacancies"] == [sample_vacancy.main_data(), other]
+
+
+def test_failed_write_keeps_store(temp_file, sample_vacancy, monkeypatch):
+    saver = JSONSaver({"items": [sample_vacancy.main_data()]}, str(temp_file))
+    saver.save_to_file()
+
+    def broken_dumps(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(saver.codec, "dumps", broken_dumps)
+    with pytest.raises(OSError):
+        saver.add_vacancy(Vacancy("Java", "url2", 0, 0, "Java").main_data())
+    monkeypatch.undo()
+
+    assert saver.read_file()["vacancies"] == [sample_vacancy.main_data()]
+    assert [p.name for p in temp_file.parent.iterdir() if p.suffix == ".tmp"] == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="права файлов POSIX")
+def test_write_keeps_file_mode(temp_file, sample_vacancy):
+    saver = JSONSaver({"items": [sample_vacancy.main_data()]}, str(temp_file))
+    saver.save_to_file()
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(temp_file).st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(temp_file, 0o644)
+    saver.add_vacancy(Vacancy("Java", "url2", 0, 0, "Java").main_data())
+    assert os.stat(temp_file).st_mode & 0o777 == 0o644
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="права файлов POSIX")
+def test_write_does_not_touch_umask(temp_file, sample_vacancy, monkeypatch):
+    """Тест: права нового файла считаются без os.umask, который меняет umask всего процесса"""
+    umask = os.umask(0)
+    os.umask(umask)
+
+    def forbidden(mask):
+        raise AssertionError("os.umask во время записи")
+
+    monkeypatch.setattr(os, "umask", forbidden)
+    JSONSaver({"items": [sample_vacancy.main_data()]}, str(temp_file)).save_to_file()
+    assert os.stat(temp_file).st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_vacancy_slots(sample_vacancy):
+    assert not hasattr(sample_vacancy, "__dict__")
+    with pytest.raises(AttributeError):
+        sample_vacancy.extra = 1
+
+
+def test_from_api_item_shapes():
+    flat = Vacancy.from_api_item(
+        {"name": "QA", "alternate_url": "u", "salary_from": 1000, "salary_to": "2000", "snippet": {"requirement": "r"}}
+    )
+    assert flat.main_data() == Vacancy("QA", "u", 1000, 2000, "r").main_data()
+
+    raw = Vacancy.from_api_item({"name": "QA", "salary": {"from": -5, "to": None}, "snippet": None})
+    assert (raw.salary_from, raw.salary_to, raw.requirement) == (0, 0, None)
+
+
+def test_from_api_item_string_pool():
+    pool = {}
+    item = {"name": "".join(["Python ", "Developer"]), "alternate_url": "u1", "snippet": {"requirement": "SQL"}}
+    first = Vacancy.from_api_item(item, pool)
+    second = Vacancy.from_api_item({**item, "name": "".join(["Python ", "Developer"]), "alternate_url": "u2"}, pool)
+    assert first.name is second.name
+    assert len(pool) == 2
+
+
+def test_validate_salary():
+    assert [validate_salary(v) for v in (150000, "15", -5, None, "abc", 2.5)] == [150000, 15, 0, 0, 0, 2]
+    assert Vacancy("QA", "u", "-1", "3000", "").salary_to == validate_salary("3000")
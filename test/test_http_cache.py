@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from src.api_client import HHApiClient
+from src.filter import filter_vacancies
+from src.http_cache import ResponseCache, cache_key
+
+PAGE = {
+    "items": [
+        {
+            "name": "Python Developer",
+            "alternate_url": "https://hh.ru/vacancy/1",
+            "salary_from": 100000,
+            "salary_to": 150000,
+            "snippet": {"requirement": "Знание <highlighttext>Python</highlighttext> и SQL"},
+        }
+    ],
+    "pages": 1,
+}
+
+
+@pytest.fixture
+def server():
+    """Сервер с поддержкой ETag и ответа 304"""
+    log = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            log.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            payload = json.dumps(PAGE).encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/vacancies", log
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetcher(url, params):
+    return lambda headers: requests.get(url, params=params, headers=headers, timeout=5)
+
+
+def test_cache_key_normalization():
+    """Тест нормализации параметров запроса"""
+    assert cache_key("u", {"text": " Data  Scientist", "page": 0}) == cache_key(
+        "u", {"page": "0", "text": "data scientist"}
+    )
+    assert cache_key("u", {"text": "java", "page": 0}) != cache_key("u", {"text": "java", "page": 1})
+
+
+def test_hit_and_miss(tmp_path, server):
+    """Тест попадания в кэш"""
+    url, log = server
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=60)
+    params = {"text": "python", "page": 0}
+    first = cache.get_or_fetch(url, params, fetcher(url, params))
+    second = cache.get_or_fetch(url, params, fetcher(url, params))
+
+    assert first == second == PAGE
+    assert filter_vacancies(second, ["sql"]) == PAGE["items"]
+    assert len(log) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "revalidations": 0, "evictions": 0}
+
+
+def test_concurrent_hits_are_counted(tmp_path, server):
+    """Тест счетчика попаданий при чтении кэша из нескольких потоков"""
+    import sys
+
+    url, _ = server
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=60)
+    params = {"text": "python", "page": 0}
+    cache.get_or_fetch(url, params, fetcher(url, params))
+
+    def work():
+        for _ in range(200):
+            assert cache.get_fresh(url, params) == PAGE
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert cache.stats()["hits"] == 800
+
+
+def test_revalidation_with_etag(tmp_path, server):
+    """Тест условной перепроверки устаревшего ответа"""
+    url, log = server
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=0)
+    params = {"text": "python", "page": 0}
+    cache.get_or_fetch(url, params, fetcher(url, params))
+    assert cache.get_or_fetch(url, params, fetcher(url, params)) == PAGE
+
+    assert log == [None, '"v1"']
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_lru_eviction(tmp_path, server):
+    """Тест вытеснения по размеру"""
+    url, _ = server
+    size = len(json.dumps(PAGE))
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=60, max_bytes=size * 2)
+    for page in range(3):
+        params = {"text": "python", "page": page}
+        cache.get_or_fetch(url, params, fetcher(url, params))
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_fresh(url, {"text": "python", "page": 0}) is None
+    assert cache.get_fresh(url, {"text": "python", "page": 2}) == PAGE
+
+
+def test_client_uses_cache(tmp_path, server):
+    """Тест повторного поиска клиентом без обращения к сети"""
+    url, log = server
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=60)
+
+    async def run():
+        async with HHApiClient(base_url=url, cache=cache) as client:
+            return await client.get_vacancies("Python")
+
+    assert asyncio.run(run()) == asyncio.run(run())
+    assert len(log) == 1
+    assert cache.hits == 1
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from src.hh_class import Vacancy
+from src.json_codec import available_codecs, get_codec
+from src.saver_class import JSONSaver
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_saver_roundtrip(tmp_path, real_items, codec):
+    """Тест сохранения и чтения с каждым доступным кодеком"""
+    saver = JSONSaver({"items": real_items}, str(tmp_path / "store.json"), codec=codec)
+    saver.save_to_file()
+
+    assert saver.read_file() == {"vacancies": real_items}
+    assert [v.main_data() for v in saver.read_vacancies()] == real_items
+    # Файл читается стандартным json независимо от кодека
+    with open(tmp_path / "store.json", encoding="utf-8") as f:
+        assert json.load(f) == {"vacancies": real_items}
+
+
+def test_compact_is_smaller(tmp_path, real_items):
+    """Тест компактной записи без отступов"""
+    sizes = {}
+    for codec in ("json", "json-compact"):
+        path = tmp_path / f"{codec}.json"
+        JSONSaver({"items": real_items}, str(path), codec=codec).save_to_file()
+        sizes[codec] = path.stat().st_size
+    assert sizes["json-compact"] < sizes["json"]
+
+
+def test_broken_file_reads_as_empty(tmp_path):
+    """Тест чтения поврежденного файла"""
+    path = tmp_path / "store.json"
+    path.write_text('{"vacancies": [', encoding="utf-8")
+    for codec in available_codecs():
+        saver = JSONSaver({"items": []}, str(path), codec=codec)
+        assert saver.read_file() == {"vacancies": []}
+        assert saver.read_vacancies() == []
+
+
+def test_msgspec_typed_decode(real_items):
+    """Тест разбора msgspec в объекты Vacancy без промежуточных словарей"""
+    pytest.importorskip("msgspec")
+    codec = get_codec("msgspec-compact")
+    extra = [{"name": "x", "salary_from": "15", "snippet": None, "employer": {"name": "Яндекс"}}]
+    data = json.dumps({"vacancies": real_items + extra}).encode()
+    vacancies = codec.decode_vacancies(data)
+    assert [v.main_data() for v in vacancies[:-1]] == real_items
+    assert (vacancies[-1].salary_from, vacancies[-1].requirement, vacancies[-1].employer) == (15, None, "Яндекс")
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_raw_api_item_parity(codec):
+    """Тест: элемент в формате API разбирается любым кодеком так же, как Vacancy.from_api_item"""
+    items = [
+        {"name": "A", "salary": {"from": 100000, "to": None}, "snippet": {"requirement": "SQL"}},
+        {"name": "B", "salary": None, "employer": {"name": "Яндекс"}},
+        {"name": "C", "salary_from": 5, "salary": {"from": 100, "to": 200}},
+    ]
+    data = json.dumps({"vacancies": items}).encode()
+    decoded = [v.main_data() for v in get_codec(codec).decode_vacancies(data)]
+    assert decoded == [Vacancy.from_api_item(item).main_data() for item in items]
+    assert [(v["salary_from"], v["salary_to"]) for v in decoded] == [(100000, 0), (0, 0), (5, 200)]
+
+
+def test_unknown_codec():
+    """Тест неизвестного кодека"""
+    with pytest.raises(ValueError):
+        get_codec("yaml")
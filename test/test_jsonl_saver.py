@@ -0,0 +1,141 @@
+import pytest
+from src.saver_class import JSONLinesSaver
+from src.hh_class import Vacancy
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    return str(tmp_path / "store" / "vacancies")
+
+
+@pytest.fixture
+def vacancies():
+    return [Vacancy(f"Python {i}", f"url{i}", 100000 + i, 150000, "Python experience").main_data() for i in range(5)]
+
+
+def test_save_and_read(base_path, vacancies):
+    """Тест сохранения и чтения журнала"""
+    saver = JSONLinesSaver({"items": vacancies}, base_path)
+    saver.save_to_file()
+
+    data = saver.read_file()
+    assert data["vacancies"] == vacancies
+    assert len(saver) == 5
+
+
+def test_duplicates_skipped_by_url(base_path, vacancies):
+    """Тест пропуска дубликатов по alternate_url"""
+    saver = JSONLinesSaver({"items": vacancies + vacancies[:2]}, base_path)
+    saver.save_to_file()
+    saver.add_vacancy(vacancies[0])
+
+    assert len(saver.read_file()["vacancies"]) == 5
+    assert "url0" in saver
+
+
+def test_index_restored_on_reopen(base_path, vacancies):
+    """Тест восстановления индекса при повторном открытии"""
+    JSONLinesSaver({"items": vacancies}, base_path).save_to_file()
+
+    saver = JSONLinesSaver({"items": vacancies}, base_path)
+    saver.save_to_file()
+    assert len(saver.read_file()["vacancies"]) == 5
+
+
+def test_compaction(base_path, vacancies):
+    """Тест переноса журнала в снимок"""
+    saver = JSONLinesSaver({"items": vacancies}, base_path, compact_every=3)
+    saver.save_to_file()
+
+    with open(f"{base_path}.jsonl", encoding="utf-8") as f:
+        assert f.read() == ""
+    assert saver.read_file()["vacancies"] == vacancies
+
+    saver.add_vacancy(Vacancy("Java", "url-java", 0, 0, "Java").main_data())
+    reopened = JSONLinesSaver({"items": []}, base_path)
+    assert len(reopened) == 6
+
+
+def test_compaction_interrupted_before_log_truncation(base_path, vacancies):
+    """Тест восстановления после сбоя между заменой снимка и очисткой журнала"""
+    JSONLinesSaver({"items": vacancies[:3]}, base_path).save_to_file()
+    with open(f"{base_path}.jsonl", encoding="utf-8") as f:
+        log = f.read()
+    # Снимок уже содержит записи журнала, а журнал не очищен
+    with open(f"{base_path}.snapshot.jsonl", "w", encoding="utf-8") as f:
+        f.write(log)
+
+    saver = JSONLinesSaver({"items": []}, base_path)
+    assert saver.read_file()["vacancies"] == vacancies[:3]
+    assert len(saver) == 3
+
+    saver.add_vacancy(vacancies[3])
+    saver.compact()
+    assert JSONLinesSaver({"items": []}, base_path).read_file()["vacancies"] == vacancies[:4]
+
+
+def test_broken_tail_line_ignored(base_path, vacancies):
+    """Тест пропуска недописанной строки журнала"""
+    JSONLinesSaver({"items": vacancies[:1]}, base_path).save_to_file()
+    with open(f"{base_path}.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"name": "broken"')
+
+    saver = JSONLinesSaver({"items": []}, base_path)
+    assert len(saver.read_file()["vacancies"]) == 1
+
+    saver.add_vacancy(vacancies[1])
+    assert len(saver.read_file()["vacancies"]) == 2
+
+
+def test_clear_and_invalid(base_path, vacancies, capsys):
+    """Тест очистки хранилища и добавления некорректных данных"""
+    saver = JSONLinesSaver({"items": vacancies}, base_path)
+    saver.save_to_file()
+    saver.clear_file()
+    assert saver.read_file() == {"vacancies": []}
+    assert len(saver) == 0
+
+    saver.add_vacancy("invalid")
+    assert "можно добавлять только main_data" in capsys.readouterr().out.lower()
+
+
+def test_len_counts_records_without_url(tmp_path):
+    """Тест: len() и count() считают и записи без alternate_url"""
+    items = [{"name": "A"}, {"name": "B"}, {"name": "C", "alternate_url": "url-c"}]
+    saver = JSONLinesSaver({"items": items}, str(tmp_path / "log"))
+    saver.save_to_file()
+    assert len(saver) == saver.count() == len(saver.read_file()["vacancies"]) == 3
+    assert len(JSONLinesSaver({"items": []}, str(tmp_path / "log"))) == 3
+
+
+def test_interrupted_compaction_keeps_records_without_url(base_path, monkeypatch):
+    """Тест: записи без alternate_url не повторяются после сбоя между заменой снимка и очисткой журнала"""
+    items = [{"name": "A"}, {"name": "B"}]
+    saver = JSONLinesSaver({"items": items}, base_path, compact_every=0)
+    saver.save_to_file()
+    saver.compact()
+    saver.add_vacancy({"name": "C"})
+
+    with monkeypatch.context() as patch:
+        patch.setattr(JSONLinesSaver, "_JSONLinesSaver__truncate_log", lambda self: None)
+        saver.compact()
+
+    reopened = JSONLinesSaver({"items": []}, base_path, compact_every=0)
+    assert reopened.read_file()["vacancies"] == items + [{"name": "C"}]
+    assert len(reopened) == 3
+
+    reopened.add_vacancy({"name": "D"})
+    assert [v["name"] for v in JSONLinesSaver({"items": []}, base_path).read_file()["vacancies"]] == list("ABCD")
+
+
+def test_iter_vacancies_page(base_path, vacancies):
+    """Тест постраничного чтения снимка и журнала"""
+    saver = JSONLinesSaver({"items": vacancies[:3]}, base_path, compact_every=0)
+    saver.save_to_file()
+    saver.compact()
+    saver.add_vacancies(vacancies[3:])
+
+    assert [v.alternate_url for v in saver.iter_vacancies(2, 2)] == ["url2", "url3"]
+    assert [v.alternate_url for v in saver.iter_vacancies(1, predicate=lambda v: v["salary_from"] > 100002)] == [
+        "url4"
+    ]
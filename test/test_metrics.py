@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from src.filter import filter_vacancies
+from src.metrics import MetricsRegistry, profiling
+from src.metrics import registry as global_registry
+from src.saver_class import JSONSaver
+
+
+@pytest.fixture
+def enabled_registry(monkeypatch):
+    monkeypatch.setattr(global_registry, "enabled", True)
+    global_registry.reset()
+    yield global_registry
+    global_registry.reset()
+
+
+def test_disabled_registry_collects_nothing():
+    """Тест выключенного реестра"""
+    registry = MetricsRegistry(enabled=False)
+    registry.inc("items")
+    with registry.timer("stage"):
+        pass
+    registry.timed("call")(lambda: None)()
+    assert registry.snapshot() == {"counters": {}, "timers": {}}
+
+
+def test_counters_timers_and_formats(capsys):
+    """Тест счетчиков, таймеров и форматов выгрузки"""
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("filter.items_in", 10)
+    registry.inc("filter.items_in", 5)
+    with registry.timer("filter"):
+        pass
+    registry.timed("filter")(lambda: None)()
+
+    snapshot = json.loads(registry.to_json())
+    assert snapshot["counters"] == {"filter.items_in": 15}
+    assert snapshot["timers"]["filter"]["count"] == 2
+
+    text = registry.to_prometheus()
+    assert "hh_filter_items_in_total 15" in text
+    assert "hh_filter_seconds_count 2" in text
+    # Максимум - отдельная метрика gauge, а не ряд сводки summary
+    types = dict(line.split()[2:4] for line in text.splitlines() if line.startswith("# TYPE"))
+    assert types == {
+        "hh_filter_items_in_total": "counter",
+        "hh_filter_seconds": "summary",
+        "hh_filter_seconds_max": "gauge",
+    }
+
+    registry.dump(fmt="prometheus")
+    assert capsys.readouterr().out == text
+
+
+def test_env_toggle(monkeypatch):
+    """Тест включения через переменную окружения"""
+    monkeypatch.setenv("HH_METRICS", "1")
+    assert MetricsRegistry.from_env().enabled
+    monkeypatch.setenv("HH_METRICS", "0")
+    assert not MetricsRegistry.from_env().enabled
+
+
+def test_concurrent_updates_are_not_lost():
+    """Тест обновления счетчиков и таймеров из нескольких потоков"""
+    import sys
+    import threading
+
+    # Частое переключение потоков делает гонку при обновлении вероятной
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    metrics = MetricsRegistry(enabled=True)
+
+    def work():
+        for _ in range(2000):
+            metrics.inc("items")
+            metrics.observe("stage", 0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert metrics.counters["items"] == 16000
+    assert metrics.timers["stage"][0] == 16000
+
+
+def test_pipeline_instrumentation(tmp_path, enabled_registry):
+    """Тест метрик фильтрации и сохранения"""
+    items = [
+        {"name": "Python", "alternate_url": "u1", "snippet": {"requirement": "Python и SQL"}},
+        {"name": "Java", "alternate_url": "u2", "snippet": {"requirement": "Java"}},
+    ]
+    filtered = filter_vacancies({"items": items}, ["python"])
+    saver = JSONSaver({"items": filtered + filtered}, str(tmp_path / "store.json"))
+    saver.save_to_file()
+
+    counters = enabled_registry.counters
+    assert counters["filter.items_in"] == 2
+    assert counters["filter.matches"] == 1
+    assert counters["saver.items_in"] == 2
+    assert counters["saver.items_out"] == 1
+    assert counters["saver.dedup_hits"] == 1
+    assert counters["saver.bytes_written"] == (tmp_path / "store.json").stat().st_size
+    assert enabled_registry.timers["saver.save_to_file"][0] == 1
+
+
+@pytest.mark.parametrize("mode, marker", [("cprofile", "function calls"), ("tracemalloc", "tracemalloc")])
+def test_profiling(tmp_path, mode, marker):
+    """Тест профилирования в файл"""
+    out = tmp_path / "profile.txt"
+    with profiling(mode, str(out)):
+        sorted(range(1000), reverse=True)
+    assert marker in out.read_text(encoding="utf-8")
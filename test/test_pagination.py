@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+from src.filter import KeywordMatcher
+from src.hh_class import Vacancy
+from src.json_codec import available_codecs
+from src.saver_class import JSONLinesSaver, JSONSaver, SQLiteSaver
+
+
+def page(saver, offset, limit, predicate=None):
+    return [vacancy.main_data() for vacancy in saver.iter_vacancies(offset, limit, predicate)]
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_json_saver_pages_via_offset_index(tmp_path, real_items, codec):
+    """Тест постраничного чтения по индексу смещений"""
+    path = tmp_path / "store.json"
+    saver = JSONSaver({"items": real_items}, str(path), codec=codec)
+    saver.save_to_file()
+
+    assert (tmp_path / "store.json.idx").exists()
+    assert saver.count() == len(real_items)
+    assert page(saver, 40, 20) == real_items[40:60]
+    assert page(saver, 100, 20) == real_items[100:]
+    assert page(saver, 500, 20) == []
+    assert all(isinstance(v, Vacancy) for v in saver.iter_vacancies(0, 3))
+
+    saver.add_vacancy(Vacancy("Go", "url-go", 1, 2, "Go").main_data())
+    assert saver.count() == len(real_items) + 1
+    assert page(saver, len(real_items), 5)[0]["name"] == "Go"
+
+
+def test_json_saver_reads_only_needed_part_of_index(tmp_path, real_items):
+    """Тест: count() берет число из заголовка индекса, страница читает только свои смещения"""
+    path = tmp_path / "store.json"
+    saver = JSONSaver({"items": real_items}, str(path))
+    saver.save_to_file()
+
+    # Обрезаем индекс после первых 10 записей: заголовок остается прежним
+    index_path = tmp_path / "store.json.idx"
+    with open(index_path, "r+b") as f:
+        f.truncate(32 + 10 * 16)
+
+    assert saver.count() == len(real_items)
+    assert page(saver, 5, 5) == real_items[5:10]
+    # Смещений страницы в индексе нет: потоковое чтение дает тот же результат
+    assert page(saver, 8, 5) == real_items[8:13]
+
+
+def test_json_saver_stale_index_falls_back(tmp_path, real_items):
+    """Тест чтения файла, измененного в обход JSONSaver"""
+    path = tmp_path / "store.json"
+    saver = JSONSaver({"items": real_items}, str(path))
+    saver.save_to_file()
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"vacancies": real_items[:30]}, f)
+    os.utime(path, ns=(0, 0))
+    assert saver.count() == 30
+    assert page(saver, 25, 10) == real_items[25:30]
+
+
+def test_predicate_pages(tmp_path, real_items):
+    """Тест постраничного чтения с условием отбора"""
+    saver = JSONSaver({"items": real_items}, str(tmp_path / "store.json"))
+    saver.save_to_file()
+    matcher = KeywordMatcher.for_words(["sql"])
+    matching = [v for v in real_items if matcher.match_vacancy(v)]
+
+    assert page(saver, 2, 3, matcher.match_vacancy) == matching[2:5]
+
+
+@pytest.mark.parametrize("saver_class", [JSONLinesSaver, SQLiteSaver])
+def test_other_savers(tmp_path, real_items, saver_class):
+    """Тест постраничного чтения в других хранилищах"""
+    saver = saver_class({"items": real_items}, str(tmp_path / "store"))
+    saver.save_to_file()
+    assert saver.count() == len(real_items)
+    assert page(saver, 10, 5) == real_items[10:15]
+    assert page(saver, 0, 2, lambda v: v["salary_from"] > 0) == [v for v in real_items if v["salary_from"] > 0][:2]
+
+
+@pytest.mark.parametrize("saver_class", [JSONSaver, JSONLinesSaver, SQLiteSaver])
+def test_vacancies_at(tmp_path, real_items, saver_class):
+    """Тест чтения вакансий по номерам за один проход"""
+    saver = saver_class({"items": real_items}, str(tmp_path / "store"))
+    saver.save_to_file()
+    found = saver.vacancies_at([30, 2, 30, len(real_items) + 5])
+    assert {position: vacancy.main_data() for position, vacancy in found.items()} == {
+        2: real_items[2],
+        30: real_items[30],
+    }
+    assert saver.vacancies_at([]) == {}
+
+
+def test_json_saver_vacancies_at_stale_index(tmp_path, real_items):
+    """Тест чтения по номерам из файла, измененного в обход JSONSaver"""
+    path = tmp_path / "store.json"
+    saver = JSONSaver({"items": real_items}, str(path))
+    saver.save_to_file()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"vacancies": real_items[10:20]}, f)
+    os.utime(path, ns=(0, 0))
+    assert {p: v.main_data() for p, v in saver.vacancies_at([0, 9, 10]).items()} == {
+        0: real_items[10],
+        9: real_items[19],
+    }
@@ -0,0 +1,64 @@
+import io
+import json
+from functools import partial
+
+import pytest
+from src.filter import filter_vacancies
+from src.pipeline import dedup_by_url, iter_vacancies, keyword_filter, run_pipeline, salary_range, top_n
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_vacancies_from_path(real_data_path, real_data, chunk_size):
+    """Тест потокового чтения при разных размерах порций"""
+    assert list(iter_vacancies(real_data_path, chunk_size=chunk_size)) == real_data["items"]
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"found": 2, "vacancies": [{"a": 1}, {"a": [1, 2.5, "x]"]}], "pages": 1},
+        [{"a": 1}, {"a": None}],
+        {"items": []},
+        {},
+    ],
+)
+def test_iter_vacancies_shapes(document):
+    """Тест разных форм документа"""
+    expected = document if isinstance(document, list) else document.get("items", document.get("vacancies", []))
+    stream = io.BytesIO(json.dumps(document).encode("utf-8"))
+    assert list(iter_vacancies(stream, chunk_size=3)) == expected
+
+
+def test_iter_vacancies_broken_document():
+    """Тест ошибки на поврежденном документе"""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_vacancies(io.StringIO('{"items": [{"a": 1} {"a": 2}]}')))
+
+
+def test_keyword_filter_same_as_filter_vacancies(real_data_path, real_data):
+    """Тест совпадения потокового фильтра с filter_vacancies"""
+    result = list(run_pipeline(real_data_path, partial(keyword_filter, filter_words=["java", "SQL"])))
+    assert result == filter_vacancies(real_data, ["java", "SQL"])
+
+
+def test_composed_pipeline(real_data):
+    """Тест цепочки этапов: дубликаты, диапазон зарплат, топ-N"""
+    items = real_data["items"] + real_data["items"][:10]
+    result = run_pipeline(
+        items,
+        dedup_by_url,
+        partial(salary_range, salary_min=1, salary_max=300000),
+        partial(top_n, n=3),
+    )
+    expected = sorted(
+        (v for v in real_data["items"] if 1 <= v["salary_from"] <= 300000),
+        key=lambda v: v["salary_from"],
+        reverse=True,
+    )[:3]
+    assert [v["salary_from"] for v in result] == [v["salary_from"] for v in expected]
+
+
+def test_iter_vacancies_binary_file(real_data_path, real_data):
+    """Тест чтения бинарного файла с разрывом многобайтовых символов между порциями"""
+    with open(real_data_path, "rb") as f:
+        assert list(iter_vacancies(f, chunk_size=5)) == real_data["items"]
@@ -0,0 +1,95 @@
+import pytest
+from src.filter import filter_vacancies
+from src.hh_class import Vacancy
+from src.requirement_index import RequirementIndex, tokenize
+from src.saver_class import JSONLinesSaver, JSONSaver
+
+
+def test_tokenize_strips_markup():
+    """Тест разбиения на слова без разметки hh.ru"""
+    assert tokenize("Знание <highlighttext>Java</highlighttext> SE, SQL.") == ["знание", "java", "se", "sql"]
+    assert tokenize(None) == []
+
+
+@pytest.mark.parametrize("words", [["java"], ["SQL", "Python"], ["spring", "docker", "linux"], ["kotlin"]])
+def test_query_any_same_as_filter(real_items, words):
+    """Тест совпадения поиска по индексу с filter_vacancies для отдельных слов"""
+    index = RequirementIndex.from_vacancies(real_items)
+    assert [real_items[i] for i in index.query_any(words)] == filter_vacancies({"items": real_items}, words)
+
+
+@pytest.mark.parametrize("words", [["знание java"], ["c++"], ["опыт работы"], ["опыт работы", "sql"], ["++"]])
+def test_phrase_query_same_as_filter(real_items, words):
+    """Тест фраз и слов с символами вне \\w: границы слов как в filter_vacancies"""
+    index = RequirementIndex.from_vacancies(real_items)
+    assert [real_items[i] for i in index.query_any(words)] == filter_vacancies({"items": real_items}, words)
+
+
+def test_query_all(real_items):
+    """Тест поиска вакансий со всеми словами"""
+    index = RequirementIndex.from_vacancies(real_items)
+    expected = [
+        i
+        for i, v in enumerate(real_items)
+        if filter_vacancies({"items": [v]}, ["java"]) and filter_vacancies({"items": [v]}, ["sql"])
+    ]
+    assert index.query_all(["java", "SQL"]) == expected
+    assert index.query_all([]) == []
+    assert index.query_any(["несуществующееслово"]) == []
+
+
+def test_save_and_load_with_mmap(tmp_path, real_items):
+    """Тест сохранения индекса и загрузки через mmap"""
+    index = RequirementIndex.from_vacancies(real_items)
+    path = str(tmp_path / "requirements.idx")
+    index.save(path)
+
+    loaded = RequirementIndex.load(path)
+    assert loaded.doc_count == len(real_items)
+    assert loaded.terms() == index.terms()
+    assert list(loaded.postings("java")) == list(index.postings("java"))
+
+    loaded.add(len(real_items), "Java и Scala")
+    assert loaded.query_any(["java"])[-1] == len(real_items)
+    loaded.close()
+    assert loaded.query_any(["scala"]) == [len(real_items)]
+    with pytest.raises(ValueError):
+        loaded.query_any(["опыт работы"])
+
+    with_texts = RequirementIndex.load(path, real_items)
+    expected = filter_vacancies({"items": real_items}, ["опыт работы"])
+    assert [real_items[i] for i in with_texts.query_any(["опыт работы"])] == expected
+    with_texts.close()
+
+
+def test_incremental_update_from_savers(tmp_path, real_items):
+    """Тест обновления индекса при добавлении вакансий в хранилища"""
+    for saver in (
+        JSONSaver({"items": real_items[:10]}, str(tmp_path / "store.json")),
+        JSONLinesSaver({"items": real_items[:10]}, str(tmp_path / "store")),
+    ):
+        saver.save_to_file()
+        index = RequirementIndex.from_saver(saver)
+        saver.add_vacancy(Vacancy("Go", "url-go", 0, 0, "Опыт <highlighttext>Go</highlighttext>").main_data())
+        assert index.query_any(["go"]) == [10]
+
+        saver.clear_file()
+        assert index.query_any(["go"]) == []
+
+
+def test_phrases_verified_from_source(tmp_path, real_items):
+    """Тест: тексты требований для проверки фраз читаются из хранилища или списка, а не из копии в индексе"""
+    saver = JSONLinesSaver({"items": real_items[:10]}, str(tmp_path / "store"))
+    saver.save_to_file()
+    index = RequirementIndex.from_saver(saver)
+    saver.add_vacancy(Vacancy("Go", "url-go", 0, 0, "Знание Go и Docker").main_data())
+    assert index.query_any(["знание go"]) == [10]
+
+    path = str(tmp_path / "requirements.idx")
+    index.save(path)
+    loaded = RequirementIndex.load(path, saver)
+    assert loaded.query_any(["знание go"]) == [10]
+    loaded.close()
+
+    with pytest.raises(ValueError):
+        RequirementIndex.from_vacancies(iter(real_items)).query_any(["опыт работы"])
@@ -0,0 +1,50 @@
+import pytest
+from src.hh_class import Vacancy
+from src.salary_index import SalaryIndex
+
+
+@pytest.fixture
+def vacancies(real_items):
+    return [Vacancy.from_api_item(item) for item in real_items]
+
+
+def test_between(vacancies):
+    """Тест выборки по диапазону зарплаты"""
+    index = SalaryIndex(vacancies)
+    result = index.between(100000, 200000)
+    assert result == sorted(v for v in vacancies if 100000 <= v.salary_from <= 200000)
+    assert [v.salary_from for v in result] == sorted(v.salary_from for v in result)
+
+    result_to = index.between(salary_min=150000, field="salary_to")
+    assert len(result_to) == sum(v.salary_to >= 150000 for v in vacancies)
+
+
+def test_top_n(vacancies):
+    """Тест топ-N по зарплате"""
+    index = SalaryIndex(vacancies)
+    assert [v.salary_from for v in index.top_n(5)] == sorted((v.salary_from for v in vacancies), reverse=True)[:5]
+    assert len(index.top_n(1000)) == len(vacancies)
+    assert index.top_n(0) == []
+
+
+def test_unspecified(vacancies):
+    """Тест вакансий без указанной зарплаты"""
+    index = SalaryIndex(vacancies)
+    assert len(index.unspecified()) == sum(v.salary_from == 0 for v in vacancies)
+    assert all(v.salary_to == 0 for v in index.unspecified("salary_to"))
+
+
+def test_incremental_insertion(vacancies):
+    """Тест добавления вакансий после построения индекса"""
+    index = SalaryIndex(vacancies[:50])
+    index.add_many(vacancies[50:])
+    top = Vacancy("Lead", "url-lead", 10**7, 2 * 10**7, "")
+    index.add(top)
+
+    assert len(index) == len(vacancies) + 1
+    assert index.top_n(1) == [top]
+    assert index.top_n(1, field="salary_to")[0] is top
+    assert index.between(0, 10**8) == sorted(vacancies + [top])
+
+    with pytest.raises(ValueError):
+        index.top_n(1, field="name")
@@ -0,0 +1,100 @@
+import pytest
+from src.saver_class import JSONLinesSaver, JSONSaver, SQLiteSaver
+from src.search import SearchIndex, get_search_index, search_vacancies
+
+
+def make(name: str, url: str, requirement, salary_from: int = 0, salary_to: int = 0) -> dict:
+    return {
+        "name": name,
+        "alternate_url": url,
+        "salary_from": salary_from,
+        "salary_to": salary_to,
+        "snippet": {"requirement": requirement},
+    }
+
+
+@pytest.fixture
+def vacancies():
+    return [
+        make("Python Developer", "url-0", "Python, Django, SQL", 100000, 150000),
+        make("Java Developer", "url-1", "Java, Spring", 120000, 0),
+        make("Аналитик", "url-2", "SQL, Excel, немного Python", 60000, 80000),
+        make("Python Team Lead", "url-3", "Опыт с <highlighttext>Python</highlighttext> от 5 лет", 300000, 0),
+        make("Тестировщик", "url-4", None),
+    ]
+
+
+def brute_force(index: SearchIndex, words: list, count: int) -> list:
+    """Сумма оценок по каждому слову отдельно и полная сортировка"""
+    scores = {}
+    for word in words:
+        for doc_id, score in index.search([word], top_k=len(index)):
+            scores[doc_id] = scores.get(doc_id, 0.0) + score
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)[:count]
+
+
+def test_search_ranks_by_relevance(vacancies):
+    """Тест: совпадение в названии и в требованиях весит больше, чем только в требованиях"""
+    index = SearchIndex.from_vacancies(vacancies)
+    ranked = index.search(["Python"])
+    assert {doc_id for doc_id, _ in ranked} == {0, 2, 3}
+    assert ranked[-1][0] == 2
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_search_top_k_and_unknown_words(vacancies):
+    """Тест ограничения top_k и поиска по отсутствующим словам"""
+    index = SearchIndex.from_vacancies(vacancies)
+    assert len(index.search(["python", "sql"], top_k=2)) == 2
+    assert index.search(["python", "sql"], top_k=2) == pytest.approx(brute_force(index, ["python", "sql"], 2))
+    assert index.search(["haskell"]) == []
+    assert index.search([]) == []
+
+
+def test_salary_boost(vacancies):
+    """Тест: надбавка за зарплату поднимает вакансию с большей зарплатой"""
+    index = SearchIndex.from_vacancies(vacancies)
+    plain = index.search(["sql"])
+    boosted = index.search(["sql"], salary_boost=10.0)
+    assert [doc_id for doc_id, _ in boosted][0] == 0
+    assert dict(boosted)[2] > dict(plain)[2]
+
+
+def test_saver_index_updates_on_add(tmp_path, vacancies):
+    """Тест кэша индекса хранилища и его обновления при добавлении вакансий"""
+    saver = JSONSaver({"items": vacancies[:2]}, str(tmp_path / "store.json"))
+    saver.save_to_file()
+    index = get_search_index(saver)
+    assert get_search_index(saver) is index
+    assert search_vacancies(saver, ["Excel"]) == []
+
+    saver.add_vacancy(vacancies[2])
+    assert get_search_index(saver) is index
+    [(vacancy, score)] = search_vacancies(saver, ["Excel"])
+    assert vacancy.alternate_url == "url-2"
+    assert score > 0
+
+    saver.clear_file()
+    assert search_vacancies(saver, ["Python"]) == []
+
+
+@pytest.mark.parametrize("saver_class", [JSONSaver, JSONLinesSaver, SQLiteSaver])
+def test_index_rebuilt_after_external_write(tmp_path, vacancies, saver_class, monkeypatch):
+    """Тест: запись другим объектом хранилища видна по revision(), без подсчета вакансий на каждом запросе"""
+    path = str(tmp_path / "store")
+    saver = saver_class({"items": vacancies[:2]}, path)
+    saver.save_to_file()
+    index = get_search_index(saver)
+
+    def count():
+        raise AssertionError("count() на запросе без изменений")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(saver, "count", count)
+        assert get_search_index(saver) is index
+        assert [v.alternate_url for v, _ in search_vacancies(saver, ["Python"])] == ["url-0"]
+
+    other = saver_class({"items": vacancies[2:4]}, path)
+    other.save_to_file()
+    assert get_search_index(saver) is not index
+    assert {v.alternate_url for v, _ in search_vacancies(saver, ["Python"])} == {"url-0", "url-2", "url-3"}
@@ -0,0 +1,66 @@
+import pytest
+from src.hh_class import Vacancy
+from src.saver_class import JSONSaver
+from src.snapshot import Snapshot, snapshot_from_saver, write_snapshot
+
+
+def test_roundtrip(tmp_path, real_items):
+    """Тест записи и чтения снимка без потерь"""
+    path = str(tmp_path / "vacancies.snap")
+    assert write_snapshot(real_items, path) == len(real_items)
+
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == len(real_items)
+        assert [vacancy.main_data() for vacancy in snapshot] == real_items
+        assert snapshot.string("requirement", 0) == real_items[0]["snippet"]["requirement"]
+
+
+def test_employer(tmp_path):
+    """Тест хранения работодателя в снимке"""
+    path = str(tmp_path / "vacancies.snap")
+    items = [
+        Vacancy("Python", "url-1", 100, 0, "SQL", "Yandex").main_data(),
+        Vacancy("Go", "url-2", 0, 0, None).main_data(),
+    ]
+    write_snapshot(items, path)
+    with Snapshot(path) as snapshot:
+        assert [vacancy.main_data() for vacancy in snapshot] == items
+        assert snapshot.string("employer", 1) is None
+
+
+def test_none_and_empty_strings(tmp_path):
+    """Тест различения None и пустой строки"""
+    path = str(tmp_path / "vacancies.snap")
+    write_snapshot([{"name": "", "salary_from": "100", "snippet": {"requirement": None}}], path)
+    with Snapshot(path) as snapshot:
+        assert snapshot.vacancy(0).main_data() == {
+            "name": "",
+            "alternate_url": None,
+            "salary_from": 100,
+            "salary_to": 0,
+            "snippet": {"requirement": None},
+        }
+
+
+def test_filter_salary(tmp_path, real_items):
+    """Тест фильтра по зарплате без чтения строк"""
+    path = str(tmp_path / "vacancies.snap")
+    write_snapshot(real_items, path)
+    with Snapshot(path) as snapshot:
+        indices = snapshot.filter_salary(100000, 200000, field="salary_to")
+        assert indices == [i for i, v in enumerate(real_items) if 100000 <= v["salary_to"] <= 200000]
+        with pytest.raises(ValueError):
+            snapshot.filter_salary(field="name")
+
+
+def test_from_saver_and_bad_file(tmp_path, real_items):
+    """Тест перевода хранилища JSONSaver в снимок и открытия чужого файла"""
+    saver = JSONSaver({"items": real_items}, str(tmp_path / "store.json"))
+    saver.save_to_file()
+    path = str(tmp_path / "vacancies.snap")
+    snapshot_from_saver(saver, path)
+    with Snapshot(path) as snapshot:
+        assert snapshot.vacancy(len(real_items) - 1).main_data() == real_items[-1]
+
+    with pytest.raises(ValueError):
+        Snapshot(str(tmp_path / "store.json"))
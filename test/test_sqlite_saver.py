@@ -0,0 +1,220 @@
+import pytest
+from src.filter import filter_vacancies
+from src.saver_class import SQLiteSaver, sync_key
+
+
+@pytest.fixture
+def saver(tmp_path, real_data):
+    saver = SQLiteSaver(real_data, str(tmp_path / "vacancies"))
+    saver.save_to_file()
+    yield saver
+    saver.close()
+
+
+def test_save_and_read(saver, real_data):
+    """Тест сохранения и чтения без потерь"""
+    assert saver.read_file()["vacancies"] == real_data["items"]
+
+
+def test_duplicates_ignored(saver, real_data):
+    """Тест пропуска дубликатов по alternate_url"""
+    saver.save_to_file()
+    saver.add_vacancy(real_data["items"][0])
+    assert len(saver.read_file()["vacancies"]) == len(real_data["items"])
+
+
+@pytest.mark.parametrize("words", [["java"], ["SQL", "Python"], ["spring boot"], ["c++"], []])
+def test_filter_matches_filter_vacancies(saver, real_data, words):
+    """Тест совпадения результатов с filter_vacancies"""
+    assert saver.filter_vacancies(words) == filter_vacancies(real_data, words)
+
+
+def test_top_by_salary(saver, real_data):
+    """Тест выборки топ-N по зарплате"""
+    expected = sorted(real_data["items"], key=lambda v: v["salary_from"], reverse=True)[:5]
+    result = saver.top_by_salary(5)
+    assert [v["salary_from"] for v in result] == [v["salary_from"] for v in expected]
+
+
+def test_salary_between(saver, real_data):
+    """Тест выборки по диапазону зарплаты"""
+    result = saver.salary_between(100000, 200000, field="salary_to")
+    assert all(100000 <= v["salary_to"] <= 200000 for v in result)
+    assert len(result) == sum(100000 <= v["salary_to"] <= 200000 for v in real_data["items"])
+
+    with pytest.raises(ValueError):
+        saver.top_by_salary(5, field="name")
+
+
+def test_clear_file(saver):
+    """Тест очистки хранилища"""
+    saver.clear_file()
+    assert saver.read_file() == {"vacancies": []}
+    assert saver.filter_vacancies(["java"]) == []
+
+
+def test_sync_inserts_updates_and_tombstones(tmp_path, real_data):
+    """Тест инкрементальной синхронизации"""
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "sync"))
+    items = real_data["items"]
+
+    assert saver.sync(items[:50]) == {"inserted": 50, "updated": 0, "unchanged": 0, "tombstoned": 0}
+    assert saver.high_water_mark() is not None
+
+    changed = dict(items[0], salary_from=999999, snippet={"requirement": "Опыт работы с Kotlin"})
+    report = saver.sync([changed] + items[1:40] + items[50:60], tombstone=True)
+    assert report == {"inserted": 10, "updated": 1, "unchanged": 39, "tombstoned": 10}
+
+    stored = saver.read_file()["vacancies"]
+    assert len(stored) == 50
+    assert stored[0] == changed
+    assert changed in saver.filter_vacancies(["kotlin"])
+    assert sorted(saver.tombstoned_urls()) == sorted(v["alternate_url"] for v in items[40:50])
+
+    assert saver.sync(items[40:41])["inserted"] == 1
+    assert items[40]["alternate_url"] not in saver.tombstoned_urls()
+    saver.close()
+
+
+def test_sync_high_water_mark_from_published_at(tmp_path):
+    """Тест отметки синхронизации по дате публикации"""
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "sync"))
+    saver.sync(
+        [
+            {"alternate_url": "a", "published_at": "2024-02-16T14:58:28+0300"},
+            {"alternate_url": "b", "published_at": "2024-02-17T09:00:00+0300"},
+        ]
+    )
+    assert saver.high_water_mark() == "2024-02-17T09:00:00+0300"
+
+    # Явно переданная отметка важнее дат публикации
+    saver.sync([{"alternate_url": "c", "published_at": "2030-01-01T00:00:00+0300"}], high_water_mark="mark")
+    assert saver.high_water_mark() == "mark"
+    saver.close()
+
+
+def test_sync_detects_employer_change(tmp_path):
+    """Тест: смена работодателя считается изменением вакансии"""
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "sync"))
+    vacancy = {"name": "Python", "alternate_url": "a", "employer": {"name": "A"}}
+    saver.sync([vacancy])
+    report = saver.sync([dict(vacancy, employer={"name": "B"})])
+    assert (report["updated"], report["unchanged"]) == (1, 0)
+    assert saver.read_file()["vacancies"][0]["employer"] == {"name": "B"}
+    saver.close()
+
+
+def test_listeners_follow_inserts_sync_and_clear(tmp_path, real_data):
+    """Тест событий хранилища: индексы, подписанные на SQLiteSaver, не устаревают"""
+    from src.requirement_index import RequirementIndex
+    from src.stats import VacancyStats
+
+    items = real_data["items"]
+    saver = SQLiteSaver({"items": items[:30]}, str(tmp_path / "events"))
+    saver.save_to_file()
+    index = RequirementIndex.from_saver(saver)
+    stats = VacancyStats.from_saver(saver)
+
+    saver.add_vacancy(items[30])
+    saver.add_vacancy(items[0])
+    assert stats.count == 31
+    assert index.doc_count == 31
+
+    saver.sync(items[31:35])
+    assert stats.count == 35
+
+    changed = dict(items[0], snippet={"requirement": "Опыт работы с Kotlin"})
+    saver.sync([changed] + items[1:10], tombstone=True)
+    assert stats.count == 10
+    assert 0 in index.query_any(["kotlin"])
+
+    saver.clear_file()
+    assert stats.count == 0
+    assert index.doc_count == 0
+    saver.close()
+
+
+class FakeClient:
+    """Клиент API, запоминающий параметры запросов"""
+
+    def __init__(self, items):
+        self.items = items
+        self.found = None
+        self.requests = []
+
+    async def get_vacancies(self, search_query, **params):
+        self.requests.append(params)
+        return {"items": self.items, "found": self.found if self.found is not None else len(self.items)}
+
+
+def test_sync_from_api_fetches_delta(tmp_path, real_data):
+    """Тест: повторная синхронизация запрашивает только вакансии после отметки"""
+    import asyncio
+
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "api"))
+    client = FakeClient(real_data["items"][:5])
+    assert asyncio.run(saver.sync_from_api(client, "Python"))["inserted"] == 5
+    assert "date_from" not in client.requests[0]
+
+    mark = saver.high_water_mark(sync_key("Python"))
+    # Отметка - время начала загрузки, даже если в ответе есть более поздние даты публикации
+    client.items = [dict(item, published_at="2100-01-01T00:00:00+0300") for item in real_data["items"][5:7]]
+    assert asyncio.run(saver.sync_from_api(client, "Python"))["inserted"] == 2
+    assert client.requests[1]["date_from"] == mark
+    assert saver.count() == 7
+    assert saver.high_water_mark(sync_key("Python")) < "2100"
+
+    # Удаление отсутствующих требует полного списка
+    asyncio.run(saver.sync_from_api(client, "Python", tombstone=True))
+    assert "date_from" not in client.requests[2]
+    with pytest.raises(ValueError):
+        asyncio.run(saver.sync_from_api(client, "Python", tombstone=True, date_from=mark))
+    saver.close()
+
+
+def test_sync_keys_keep_queries_apart(tmp_path, real_data):
+    """Тест: отметка и удаление отсутствующих относятся только к своему поисковому запросу"""
+    import asyncio
+
+    items = real_data["items"]
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "api"))
+    python = FakeClient(items[:5])
+    java = FakeClient(items[5:8])
+    asyncio.run(saver.sync_from_api(python, "Python"))
+    assert asyncio.run(saver.sync_from_api(java, "  JAVA "))["inserted"] == 3
+    # Первая синхронизация Java не получает отметку запроса Python
+    assert "date_from" not in java.requests[0]
+    assert saver.high_water_mark(sync_key("java")) is not None
+    assert saver.high_water_mark() is None
+
+    # Общая вакансия остается, пока ее находит хотя бы один запрос
+    java.items = [items[0]] + items[5:8]
+    asyncio.run(saver.sync_from_api(java, "Java", tombstone=True))
+    python.items = items[1:5]
+    assert asyncio.run(saver.sync_from_api(python, "Python", tombstone=True))["tombstoned"] == 0
+    assert saver.count() == 8
+
+    python.items = items[2:5]
+    assert asyncio.run(saver.sync_from_api(python, "Python", tombstone=True))["tombstoned"] == 1
+    assert saver.tombstoned_urls() == [items[1]["alternate_url"]]
+    assert {v["alternate_url"] for v in saver.read_file()["vacancies"]} == {
+        v["alternate_url"] for v in [items[0]] + items[2:8]
+    }
+    saver.close()
+
+
+def test_truncated_fetch_refuses_tombstone(tmp_path, real_data):
+    """Тест: по выдаче, обрезанной max_pages или пределом hh.ru, отсутствующие не удаляются"""
+    import asyncio
+
+    saver = SQLiteSaver({"items": []}, str(tmp_path / "api"))
+    client = FakeClient(real_data["items"][:10])
+    asyncio.run(saver.sync_from_api(client, "Python"))
+
+    client.items = real_data["items"][:3]
+    client.found = 2000
+    with pytest.raises(ValueError):
+        asyncio.run(saver.sync_from_api(client, "Python", tombstone=True))
+    assert saver.count() == 10
+    assert saver.tombstoned_urls() == []
+    saver.close()
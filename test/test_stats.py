@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from src.filter import filter_vacancies
+from src.hh_class import Vacancy
+from src.saver_class import JSONSaver
+from src.stats import TDigest, VacancyStats
+from src.vacancy_table import VacancyTable
+
+
+def test_tdigest_accuracy():
+    """Тест точности процентилей t-digest на равномерном распределении"""
+    generator = random.Random(1)
+    values = [generator.uniform(0, 1000) for _ in range(20000)]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+    values.sort()
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert digest.quantile(q) == pytest.approx(values[int(q * (len(values) - 1))], abs=10)
+    assert digest.quantile(0) == values[0]
+    assert digest.quantile(1) == values[-1]
+    assert TDigest().quantile(0.5) is None
+
+
+def test_stats_match_full_scan(data):
+    """Тест: агрегаты совпадают с полным перебором хранилища"""
+    stats = VacancyStats.from_vacancies(data["items"], keywords=["опыт", "Навыки"])
+    table = VacancyTable.from_vacancies(Vacancy.from_api_item(item) for item in data["items"])
+    assert stats.count == len(data["items"])
+    assert stats.unspecified_salary_share() == len(table.salary_mask(0, 0)) / len(table)
+    assert stats.median("salary_from") == pytest.approx(table.median("salary_from"))
+    for keyword in ("опыт", "навыки"):
+        assert stats.keyword_count(keyword) == len(filter_vacancies(data, [keyword], engine="aho_corasick"))
+    with pytest.raises(ValueError):
+        stats.keyword_count("python")
+    with pytest.raises(ValueError):
+        stats.percentile(150)
+
+
+def test_top_employers_by_name_pattern():
+    """Тест топа работодателей по шаблону названия вакансии, включая обновление после вставки"""
+
+    def vacancy(name, employer):
+        # Тот же формат, что HHApiClient.get_vacancies сохраняет в хранилище
+        return Vacancy(name, f"{name}-{employer}", 0, 0, None, employer).main_data()
+
+    stats = VacancyStats.from_vacancies(
+        [vacancy("Python Developer", "A"), vacancy("Python QA", "B"), vacancy("Java Developer", "B")]
+    )
+    assert stats.top_employers(1) == [("B", 2)]
+    assert sorted(stats.top_employers(5, "python")) == [("A", 1), ("B", 1)]
+
+    stats.vacancy_added(3, vacancy("Senior Python Developer", "A"))
+    assert stats.top_employers(1, "python") == [("A", 2)]
+    assert stats.top_employers(5, "java") == [("B", 1)]
+
+
+def test_stats_follow_saver(tmp_path):
+    """Тест инкрементального обновления агрегатов при записи и очистке хранилища"""
+    items = [
+        {"name": "A", "alternate_url": "url-a", "salary_from": 100, "salary_to": 0, "snippet": {"requirement": "SQL"}},
+        {"name": "B", "alternate_url": "url-b", "salary_from": 0, "salary_to": 0, "snippet": {"requirement": None}},
+    ]
+    saver = JSONSaver({"items": items[:1]}, str(tmp_path / "store.json"))
+    saver.save_to_file()
+    stats = VacancyStats.from_saver(saver, keywords=["sql"])
+    assert stats.median() == 100
+    assert stats.unspecified_salary_share() == 0
+
+    saver.add_vacancy(items[1])
+    assert stats.count == 2
+    assert stats.unspecified_salary_share() == 0.5
+    assert stats.keyword_counts() == {"sql": 1}
+
+    saver.add_vacancy({**items[0], "alternate_url": "url-c", "salary_from": 300})
+    assert stats.median() == 200
+    assert stats.keyword_counts() == {"sql": 2}
+
+    saver.clear_file()
+    assert stats.count == 0
+    assert stats.median() is None
@@ -0,0 +1,105 @@
+import statistics
+
+import pytest
+from src import vacancy_table
+from src.hh_class import Vacancy
+from src.vacancy_table import VacancyTable
+
+
+@pytest.fixture(autouse=True, params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Каждый тест выполняется и с NumPy, и на чистом Python"""
+    if request.param == "numpy" and vacancy_table.numpy is None:
+        pytest.skip("numpy не установлен")
+    if request.param == "python":
+        monkeypatch.setattr(vacancy_table, "numpy", None)
+    return request.param
+
+
+@pytest.fixture
+def table(real_items):
+    return VacancyTable.from_dicts(real_items)
+
+
+def test_lossless_conversion(table, real_items):
+    """Тест преобразования в main_data без потерь"""
+    assert table.to_dicts() == real_items
+    vacancies = [table.vacancy(i) for i in range(len(table))]
+    assert all(isinstance(vacancy, Vacancy) for vacancy in vacancies)
+    assert VacancyTable.from_vacancies(vacancies).to_dicts() == real_items
+
+
+def test_employer_roundtrip():
+    """Тест: работодатель хранится в таблице и переживает преобразования"""
+    vacancies = [Vacancy("Python", "url-1", 100, 200, "SQL", "Yandex"), Vacancy("Go", "url-2", 0, 0, None)]
+    table = VacancyTable.from_vacancies(vacancies)
+    assert table.to_dicts() == [vacancy.main_data() for vacancy in vacancies]
+    assert VacancyTable.from_dicts(table.to_dicts()).to_dicts() == table.to_dicts()
+    assert table.vacancy(0).employer == "Yandex"
+    assert table.take([0]).row(0)["employer"] == {"name": "Yandex"}
+
+
+def test_filter_salary(table, real_items):
+    """Тест фильтра по диапазону зарплаты"""
+    result = table.filter_salary(100000, 250000, field="salary_to")
+    assert result.to_dicts() == [v for v in real_items if 100000 <= v["salary_to"] <= 250000]
+
+
+def test_top_n_and_argsort(table, real_items):
+    """Тест топ-N и сортировки индексов"""
+    top = [table.salary_from[i] for i in table.top_n(5)]
+    assert top == sorted((v["salary_from"] for v in real_items), reverse=True)[:5]
+    order = table.argsort()
+    assert [table.salary_from[i] for i in order] == sorted(v["salary_from"] for v in real_items)
+
+
+def test_reverse_order_is_stable():
+    """Тест: при равных зарплатах порядок добавления сохраняется и в убывающей сортировке"""
+    salaries = [5, 7, 5, 7]
+    table = VacancyTable.from_vacancies(Vacancy(str(i), str(i), salary, 0, None) for i, salary in enumerate(salaries))
+    assert table.argsort(reverse=True) == [1, 3, 0, 2]
+    assert table.top_n(3) == [1, 3, 0]
+    assert table.salary_mask(6) == [1, 3]
+    assert list(table.filter_salary(6).salary_from) == [7, 7]
+
+
+def test_columns_are_read_only(table):
+    """Тест: колонки нельзя изменить в обход append"""
+    with pytest.raises((TypeError, ValueError)):
+        table.salary_from[0] = 10**9
+    with pytest.raises(AttributeError):
+        table.salary_to = []
+    assert isinstance(table.name, tuple)
+
+
+def test_salary_column_held_during_append(table):
+    """Тест: полученная колонка зарплат не мешает append и не меняется после него"""
+    salaries = table.salary_from
+    size = len(salaries)
+    table.append(Vacancy("Новая", "url-new", 123, 0, None).main_data())
+    assert len(salaries) == size
+    assert table.salary_from[-1] == 123
+
+
+def test_aggregations(table, real_items):
+    """Тест медианы, процентилей и гистограммы"""
+    salaries = [v["salary_from"] for v in real_items if v["salary_from"]]
+    assert table.median() == statistics.median(salaries)
+    assert table.percentile(0) == min(salaries)
+    assert table.percentile(100) == max(salaries)
+    assert sum(table.histogram([0, 100000, 200000, max(salaries)])) == len(salaries)
+
+    with pytest.raises(ValueError):
+        table.percentile(101)
+    assert VacancyTable().median() is None
+
+
+def test_sorted_column_cache(table, real_items):
+    """Тест: отсортированная колонка переиспользуется и сбрасывается при добавлении вакансии"""
+    salaries = [v["salary_from"] for v in real_items if v["salary_from"]]
+    assert table._sorted_salaries("salary_from", True) is table._sorted_salaries("salary_from", True)
+    assert table.median() == statistics.median(salaries)
+
+    table.append(Vacancy("Go", "url-go", 10**7, 0, "Go").main_data())
+    assert table.percentile(100) == 10**7
+    assert table.median() == statistics.median(salaries + [10**7])